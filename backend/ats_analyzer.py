@@ -1,70 +1,259 @@
 # ats_analyzer.py
+from typing import Optional, AsyncIterator, Tuple
 from llm_service import LLMService
-from config import ATS_SCORE_PROMPT, ATS_KEYWORDS
-from utils import validate_resume_content, calculate_keyword_density
+from cache import ResultCache, make_cache_key, normalize_text
+from config import (
+    ATS_SCORE_PROMPT, ATS_SCORE_STRUCTURED_PROMPT, ATS_KEYWORDS, ATS_SCORING_MODE,
+    HYBRID_AMBIGUOUS_BAND, LLM_STRUCTURED_OUTPUT, LLM_FALLBACK_TO_LOCAL
+)
+from utils import validate_resume_content
+from keyword_matcher import KeywordMatcher, KeywordScan, get_keyword_matcher
+from local_scorer import LocalATSScorer
+from resume_parser import ParsedResume, parse_resume
+from metrics import stage_timer
+from singleflight import SingleFlight
+from resilience import LLMAPIError, CircuitOpenError
+from schemas import ATSScoreResult, missing_fields
+
+SCORING_MODES = ("llm", "fast", "hybrid")
 
 
 class ATSAnalyzer:
     """Analyze resume for ATS (Applicant Tracking System) compatibility."""
-    
-    def __init__(self):
-        self.llm_service = LLMService()
+
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        cache: Optional[ResultCache] = None
+    ):
+        self.llm_service = llm_service or LLMService()
+        self.cache = cache
         self.ats_keywords = ATS_KEYWORDS
-    
-    def analyze(self, resume_text: str) -> dict:
+        self.keyword_matcher = KeywordMatcher(self.ats_keywords)
+        self.local_scorer = LocalATSScorer()
+        self.in_flight = SingleFlight()
+        self.structured_output = LLM_STRUCTURED_OUTPUT
+
+    def analyze(self, resume_text: str, mode: Optional[str] = None, tier: Optional[str] = None) -> dict:
         """
         Perform complete ATS analysis on resume.
         Returns detailed ATS score and recommendations.
+
+        mode: "llm" always asks the LLM, "fast" returns the local score,
+        "hybrid" asks the LLM only when the local score is ambiguous.
+        tier: model tier ("fast", "balanced", "accurate"); see model_router.
         """
         # Validate resume has sufficient content
-        if not validate_resume_content(resume_text):
-            return {
-                "status": "error",
-                "error": "Resume content is too short or missing key sections",
-                "ats_score": 0
-            }
-        
-        # Get LLM analysis
-        llm_result = self.llm_service.analyze_ats_score(
-            resume_text,
-            ATS_SCORE_PROMPT
+        parsed = parse_resume(resume_text)
+        if not validate_resume_content(parsed):
+            return self._invalid_result()
+
+        with stage_timer("keyword_scan"):
+            scan = self.keyword_matcher.scan(parsed)
+        local_result = self._local_result(parsed, scan, mode)
+        if local_result:
+            return self._add_keyword_metrics(scan, local_result)
+
+        cache_key = self._cache_key(resume_text, tier)
+        llm_result = self._cached(cache_key)
+
+        if llm_result is None:
+            # Get LLM analysis
+            if self.structured_output:
+                llm_result = self.llm_service.analyze_ats_score_structured(
+                    resume_text,
+                    ATS_SCORE_STRUCTURED_PROMPT,
+                    tier
+                )
+            else:
+                llm_result = self.llm_service.analyze_ats_score(
+                    resume_text,
+                    ATS_SCORE_PROMPT,
+                    tier
+                )
+            self._store(cache_key, llm_result)
+
+        llm_result["scoring_source"] = "llm"
+        return self._add_keyword_metrics(scan, llm_result)
+
+    async def analyze_async(self, resume_text: str, mode: Optional[str] = None, tier: Optional[str] = None) -> dict:
+        """
+        Awaitable variant of analyze() that does not block the event loop
+        while waiting on the LLM.
+        """
+        parsed = parse_resume(resume_text)
+        if not validate_resume_content(parsed):
+            return self._invalid_result()
+
+        with stage_timer("keyword_scan"):
+            scan = self.keyword_matcher.scan(parsed)
+        local_result = self._local_result(parsed, scan, mode)
+        if local_result:
+            return self._add_keyword_metrics(scan, local_result)
+
+        cache_key = self._cache_key(resume_text, tier)
+        llm_result = self._cached(cache_key)
+
+        if llm_result is None:
+            # Identical concurrent requests share one upstream call
+            try:
+                llm_result = await self.in_flight.do(
+                    cache_key,
+                    lambda: self._analyze_llm_async(resume_text, cache_key, tier)
+                )
+            except LLMAPIError as e:
+                return self._add_keyword_metrics(scan, self._fallback_result(parsed, scan, e))
+
+        llm_result["scoring_source"] = "llm"
+        return self._add_keyword_metrics(scan, llm_result)
+
+    async def _analyze_llm_async(self, resume_text: str, cache_key: str, tier: Optional[str]) -> dict:
+        if self.structured_output:
+            llm_result = await self.llm_service.analyze_ats_score_structured_async(
+                resume_text,
+                ATS_SCORE_STRUCTURED_PROMPT,
+                tier
+            )
+        else:
+            llm_result = await self.llm_service.analyze_ats_score_async(
+                resume_text,
+                ATS_SCORE_PROMPT,
+                tier
+            )
+        self._store(cache_key, llm_result)
+        return llm_result
+
+    async def analyze_stream(self, resume_text: str, mode: Optional[str] = None,
+                             tier: Optional[str] = None) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Streaming variant of analyze_async. Yields ("field", {"key", "value"})
+        events as LLM output fields complete, then ("result", full result).
+        Cached and local results are replayed as fields immediately.
+        Streaming always uses the free-form prompt, whose keys can be
+        forwarded as they arrive.
+        """
+        parsed = parse_resume(resume_text)
+        if not validate_resume_content(parsed):
+            yield "result", self._invalid_result()
+            return
+
+        with stage_timer("keyword_scan"):
+            scan = self.keyword_matcher.scan(parsed)
+        result = self._local_result(parsed, scan, mode)
+
+        if result is None:
+            # Keyed on the free-form prompt: streamed results are only checked
+            # for completeness, so they must not answer structured lookups
+            cache_key = self._cache_key(resume_text, tier, ATS_SCORE_PROMPT)
+            result = self._cached(cache_key)
+
+            if result is None:
+                result = {}
+                try:
+                    async for key, value in self.llm_service.stream_ats_score_async(
+                        resume_text,
+                        ATS_SCORE_PROMPT,
+                        tier
+                    ):
+                        result[key] = value
+                        yield "field", {"key": key, "value": value}
+                    missing = missing_fields(ATSScoreResult, result)
+                    if missing:
+                        # A truncated or off-format answer must not be cached
+                        raise ValueError(f"LLM response is missing fields: {', '.join(missing)}")
+                    self._store(cache_key, result)
+                    result["scoring_source"] = "llm"
+                except LLMAPIError as e:
+                    # Only fall back if no LLM fields have been sent yet
+                    if result:
+                        raise
+                    result = self._fallback_result(parsed, scan, e)
+                    for key, value in result.items():
+                        yield "field", {"key": key, "value": value}
+            else:
+                for key, value in result.items():
+                    yield "field", {"key": key, "value": value}
+                result["scoring_source"] = "llm"
+        else:
+            for key, value in result.items():
+                yield "field", {"key": key, "value": value}
+
+        yield "result", self._add_keyword_metrics(scan, result)
+
+    def _local_result(self, parsed: ParsedResume, scan: KeywordScan, mode: Optional[str]) -> Optional[dict]:
+        """
+        Return the local score when it should be used as the final answer,
+        or None when the LLM has to be consulted.
+        """
+        mode = mode or ATS_SCORING_MODE
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {mode}")
+        if mode == "llm":
+            return None
+
+        local_result = self.local_scorer.score(parsed, scan)
+        low, high = HYBRID_AMBIGUOUS_BAND
+        if mode == "hybrid" and low <= local_result["ats_score"] <= high:
+            return None
+
+        local_result["scoring_source"] = "local"
+        return local_result
+
+    def _fallback_result(self, parsed: ParsedResume, scan: KeywordScan, error: LLMAPIError) -> dict:
+        """
+        Local score served while the LLM is unavailable. Permanent errors
+        (bad request, auth) are re-raised rather than masked.
+        """
+        if not LLM_FALLBACK_TO_LOCAL or not (isinstance(error, CircuitOpenError) or error.retryable):
+            raise error
+
+        result = self.local_scorer.score(parsed, scan)
+        result["scoring_source"] = "local_fallback"
+        result["fallback_reason"] = str(error)
+        return result
+
+    def _cache_key(self, resume_text: str, tier: Optional[str] = None,
+                   prompt_template: Optional[str] = None) -> str:
+        if prompt_template is None:
+            prompt_template = ATS_SCORE_STRUCTURED_PROMPT if self.structured_output else ATS_SCORE_PROMPT
+        return make_cache_key(
+            "ats",
+            normalize_text(resume_text),
+            prompt_template,
+            self.llm_service.router.cache_scope("ats", tier)
         )
-        
-        # Calculate additional metrics
-        all_keywords = (
-            self.ats_keywords["technical_skills"] +
-            self.ats_keywords["soft_skills"] +
-            self.ats_keywords["certifications"]
+
+    def _cached(self, cache_key: str) -> Optional[dict]:
+        return self.cache.get(cache_key) if self.cache else None
+
+    def _store(self, cache_key: str, llm_result: dict):
+        # Cache the raw LLM result; keyword metrics are recomputed per call.
+        # Fallback-model answers are not cached under the routed chain's scope.
+        if self.cache and "fallback_model" not in llm_result:
+            self.cache.set(cache_key, llm_result)
+
+    @staticmethod
+    def _invalid_result() -> dict:
+        return {
+            "status": "error",
+            "error": "Resume content is too short or missing key sections",
+            "ats_score": 0
+        }
+
+    def _add_keyword_metrics(self, scan: KeywordScan, result: dict) -> dict:
+        """Attach deterministic keyword metrics to the analysis result."""
+        keyword_density = scan.density(
+            ["technical_skills", "soft_skills", "certifications"]
         )
-        
-        keyword_density = calculate_keyword_density(resume_text, all_keywords)
-        
+
         # Add keyword analysis to result
-        llm_result["keyword_density"] = round(keyword_density, 2)
-        llm_result["technical_skills_found"] = self._find_keywords(
-            resume_text,
-            self.ats_keywords["technical_skills"]
-        )
-        llm_result["soft_skills_found"] = self._find_keywords(
-            resume_text,
-            self.ats_keywords["soft_skills"]
-        )
-        llm_result["certifications_found"] = self._find_keywords(
-            resume_text,
-            self.ats_keywords["certifications"]
-        )
-        
-        return llm_result
-    
+        result["keyword_density"] = round(keyword_density, 2)
+        result["technical_skills_found"] = scan.found("technical_skills")
+        result["soft_skills_found"] = scan.found("soft_skills")
+        result["certifications_found"] = scan.found("certifications")
+
+        return result
+
     def _find_keywords(self, text: str, keywords: list) -> list:
         """Find which keywords are present in text."""
-        import re
-        text_lower = text.lower()
-        found = []
-        
-        for keyword in keywords:
-            pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-            if re.search(pattern, text_lower):
-                found.append(keyword)
-        
-        return list(set(found))  # Remove duplicates
\ No newline at end of file
+        return get_keyword_matcher(tuple(keywords)).scan(text).found("keywords")
@@ -0,0 +1,195 @@
+# batch_processor.py
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import zipfile
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from config import ALLOWED_EXTENSIONS, MAX_FILE_SIZE, BATCH_CONCURRENCY
+from ats_analyzer import ATSAnalyzer, SCORING_MODES
+from extraction_executor import ExtractionExecutor
+from utils import validate_resume_content
+
+# (display name, loader returning the file bytes)
+Document = Tuple[str, Callable[[], bytes]]
+
+
+def documents_from_zip(archive: zipfile.ZipFile) -> List[Document]:
+    """List supported resumes inside an open zip archive."""
+    documents = []
+
+    for info in archive.infolist():
+        if info.is_dir() or os.path.splitext(info.filename)[1].lower() not in ALLOWED_EXTENSIONS:
+            continue
+
+        def load(info=info) -> bytes:
+            # Check the declared size before inflating anything
+            if info.file_size > MAX_FILE_SIZE:
+                raise ValueError(f"File exceeds {MAX_FILE_SIZE // (1024 * 1024)}MB limit")
+            return archive.read(info)
+
+        documents.append((info.filename, load))
+
+    return documents
+
+
+def documents_from_directory(path: str) -> List[Document]:
+    """List supported resumes under a directory, recursively."""
+    documents = []
+
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() not in ALLOWED_EXTENSIONS:
+                continue
+
+            file_path = os.path.join(root, name)
+
+            def load(file_path=file_path) -> bytes:
+                if os.path.getsize(file_path) > MAX_FILE_SIZE:
+                    raise ValueError(f"File exceeds {MAX_FILE_SIZE // (1024 * 1024)}MB limit")
+                with open(file_path, "rb") as f:
+                    return f.read()
+
+            documents.append((os.path.relpath(file_path, path), load))
+
+    return documents
+
+
+class BatchProcessor:
+    """
+    Score many resumes with pipelined extraction and LLM analysis.
+    Up to `concurrency` documents are in flight: while some wait on the LLM,
+    others are being parsed in the extraction pool.
+    """
+
+    def __init__(
+        self,
+        ats_analyzer: ATSAnalyzer,
+        extraction_executor: ExtractionExecutor,
+        concurrency: int = BATCH_CONCURRENCY
+    ):
+        self.ats_analyzer = ats_analyzer
+        self.extraction_executor = extraction_executor
+        self.concurrency = concurrency
+
+    async def _score_document(self, name: str, load: Callable[[], bytes], mode: Optional[str]) -> dict:
+        try:
+            file_extension = os.path.splitext(name)[1].lower()
+            resume_text = await self.extraction_executor.extract(load(), file_extension)
+
+            if not validate_resume_content(resume_text):
+                raise ValueError("Resume is too short or missing key sections")
+
+            result = await self.ats_analyzer.analyze_async(resume_text, mode)
+            return {"file": name, "status": "success", "result": result}
+        except Exception as e:
+            return {"file": name, "status": "error", "error": str(e)}
+
+    async def process(self, documents: List[Document], mode: Optional[str] = None) -> AsyncIterator[dict]:
+        """
+        Yield one result per document in completion order, each tagged with
+        progress, followed by a final summary record.
+        """
+        total = len(documents)
+        started = time.perf_counter()
+        queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = set()
+
+        async def run(name: str, load: Callable[[], bytes]):
+            try:
+                await queue.put(await self._score_document(name, load, mode))
+            finally:
+                semaphore.release()
+
+        async def feed():
+            for name, load in documents:
+                await semaphore.acquire()
+                task = asyncio.create_task(run(name, load))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        producer = asyncio.create_task(feed())
+        succeeded = 0
+
+        try:
+            for completed in range(1, total + 1):
+                item = await queue.get()
+                if item["status"] == "success":
+                    succeeded += 1
+                item["progress"] = {"completed": completed, "total": total}
+                yield item
+        finally:
+            # Stop outstanding work if the consumer goes away early
+            producer.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+        yield {
+            "summary": {
+                "total": total,
+                "succeeded": succeeded,
+                "failed": total - succeeded,
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            }
+        }
+
+
+async def _run_cli(path: str, concurrency: int, output: Optional[str], mode: Optional[str]):
+    archive = None
+    if os.path.isdir(path):
+        documents = documents_from_directory(path)
+    elif zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        documents = documents_from_zip(archive)
+    else:
+        raise SystemExit(f"Not a directory or zip archive: {path}")
+
+    extraction_executor = ExtractionExecutor()
+    ats_analyzer = ATSAnalyzer()
+    processor = BatchProcessor(ats_analyzer, extraction_executor, concurrency)
+    out = open(output, "w") if output else sys.stdout
+
+    try:
+        async for item in processor.process(documents, mode):
+            out.write(json.dumps(item) + "\n")
+            out.flush()
+            if "progress" in item:
+                progress = item["progress"]
+                print(
+                    f"[{progress['completed']}/{progress['total']}] {item['file']}: {item['status']}",
+                    file=sys.stderr
+                )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if archive:
+            archive.close()
+        extraction_executor.shutdown()
+        await ats_analyzer.llm_service.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score a directory or zip archive of resumes and print NDJSON results."
+    )
+    parser.add_argument("path", help="Directory or .zip file containing PDF/DOCX resumes")
+    parser.add_argument(
+        "--concurrency", type=int, default=BATCH_CONCURRENCY,
+        help="Maximum resumes in flight at once"
+    )
+    parser.add_argument("--output", help="Write NDJSON to this file instead of stdout")
+    parser.add_argument(
+        "--mode", choices=SCORING_MODES,
+        help="Scoring mode (defaults to ATS_SCORING_MODE)"
+    )
+    args = parser.parse_args()
+
+    asyncio.run(_run_cli(args.path, args.concurrency, args.output, args.mode))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+# benchmark.py
+"""
+Micro-benchmarks for the CPU work done on every request, with a
+regression gate.
+
+    python benchmark.py --save benchmark_baseline.json     # record a baseline
+    python benchmark.py --compare benchmark_baseline.json  # exit 1 on regression
+
+Each case reports the median and best time per call over several rounds
+and the peak memory allocated during one call (tracemalloc). The gate uses
+the best round, which is the least disturbed by other load on the host: a
+case regresses when it is slower than its baseline by more than
+--max-slowdown (and by more than --min-delta-us, to ignore timer noise) or
+allocates more than --max-memory-growth over its baseline peak. Baselines are machine
+specific: record and compare on the same host.
+"""
+import argparse
+import io
+import json
+import math
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ats_analyzer import ATSAnalyzer
+from config import ATS_KEYWORDS
+from resume_extractor import ResumeExtractor
+from resume_parser import parse_resume
+from synthetic_corpus import LINES_PER_PDF_PAGE, docx_bytes, make_resume_lines, pdf_bytes
+from utils import calculate_keyword_density, extract_json_from_text, format_response, validate_resume_content
+
+# name -> zero-argument callable; built once, before any timing
+Case = Tuple[str, Callable[[], object]]
+
+MIN_ROUND_SECONDS = 0.05
+
+
+def _resume(rng: random.Random, jobs: int) -> List[str]:
+    return make_resume_lines(rng, jobs=jobs, bullets_per_job=4)
+
+
+def _keywords(count: int) -> List[str]:
+    """The configured keywords, padded with synthetic terms up to `count`."""
+    base = [keyword for group in ATS_KEYWORDS.values() for keyword in group]
+    return (base + [f"framework{i}" for i in range(count)])[:count]
+
+
+def build_cases() -> List[Case]:
+    rng = random.Random(0)
+    cases = []
+
+    # Extraction across document sizes (roughly 1, 4 and 15 pages)
+    for jobs in (3, 40, 160):
+        lines = _resume(rng, jobs)
+        pages = math.ceil(len(lines) / LINES_PER_PDF_PAGE)
+        pdf, docx = pdf_bytes(lines), docx_bytes(lines)
+        cases.append((f"extract_from_pdf[{pages}p]",
+                      lambda data=pdf: ResumeExtractor.extract_from_pdf(io.BytesIO(data))))
+        cases.append((f"extract_from_docx[{len(lines)}para]",
+                      lambda data=docx: ResumeExtractor.extract_from_docx(io.BytesIO(data))))
+
+    # Keyword matching as the keyword list grows (matchers are cached per list,
+    # so this measures the per-request scan, not compilation)
+    analyzer = ATSAnalyzer.__new__(ATSAnalyzer)
+    text = "\n".join(_resume(rng, 6))
+    for count in (25, 100, 400):
+        keywords = _keywords(count)
+        cases.append((f"find_keywords[{count}kw]",
+                      lambda keywords=keywords: analyzer._find_keywords(text, keywords)))
+        cases.append((f"calculate_keyword_density[{count}kw]",
+                      lambda keywords=keywords: calculate_keyword_density(text, keywords)))
+
+    # LLM output parsing
+    payload = json.dumps({
+        "overall_match_score": 72,
+        "match_breakdown": {"skills_match": 22, "experience_match": 18,
+                            "qualification_match": 14, "responsibility_alignment": 18},
+        "matched_skills": ["python", "sql", "docker"] * 5,
+        "missing_skills": ["kubernetes"] * 5,
+        "strengths": ["Relevant backend experience"] * 6,
+        "gaps": ["Limited cloud exposure"] * 6,
+        "recommendations": ["Highlight infrastructure work"] * 6,
+        "final_assessment": "A reasonable fit with some gaps in the required tooling."
+    }, indent=2)
+    malformed = "Here is the analysis: {score: 72, " + "{\"a\": [1, 2" * 50 + " and some closing prose."
+
+    def parse_malformed():
+        try:
+            extract_json_from_text(malformed)
+        except ValueError:
+            pass
+
+    cases += [
+        ("extract_json_from_text[clean]", lambda: extract_json_from_text(payload)),
+        ("extract_json_from_text[fenced]",
+         lambda: extract_json_from_text(f"Sure! Here is the result:\n```json\n{payload}\n```\nLet me know.")),
+        ("extract_json_from_text[malformed]", parse_malformed)
+    ]
+
+    # Validation parses the resume; parses are memoized per text, so measure
+    # both a first sight of the document and a repeat
+    resume = "\n".join(_resume(rng, 6))
+
+    def validate_cold():
+        parse_resume.cache_clear()
+        return validate_resume_content(resume)
+
+    cases += [
+        ("validate_resume_content[cold]", validate_cold),
+        ("validate_resume_content[cached]", lambda: validate_resume_content(resume)),
+        ("format_response[small]", lambda: format_response("success", {"ats_score": 70})),
+        ("format_response[large]",
+         lambda: format_response("success", {"results": [json.loads(payload)] * 20}))
+    ]
+    return cases
+
+
+def measure(func: Callable[[], object], rounds: int) -> dict:
+    """Median and best time per call, plus peak traced memory of one call."""
+    func()  # warm up caches and lazy imports
+
+    # Size rounds so each takes at least MIN_ROUND_SECONDS
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - started >= MIN_ROUND_SECONDS or number >= 1_000_000:
+            break
+        number *= 4
+
+    per_call = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call.append((time.perf_counter() - started) / number)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "min_us": round(min(per_call) * 1e6, 3),
+        "peak_kib": round(max(0, peak - baseline) / 1024, 1),
+        "calls_per_round": number
+    }
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], max_slowdown: float,
+            max_memory_growth: float, min_delta_us: float) -> List[str]:
+    """Return a description of every regression against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        delta = result["min_us"] - base["min_us"]
+        if delta > min_delta_us and result["min_us"] > base["min_us"] * (1 + max_slowdown):
+            regressions.append(
+                f"{name}: {base['min_us']:.1f}us -> {result['min_us']:.1f}us "
+                f"(+{delta / base['min_us'] * 100:.0f}%)"
+            )
+        # Ignore growth below one page of allocations
+        if (result["peak_kib"] > base["peak_kib"] * (1 + max_memory_growth)
+                and result["peak_kib"] - base["peak_kib"] > 4):
+            regressions.append(f"{name}: peak {base['peak_kib']:.1f}KiB -> {result['peak_kib']:.1f}KiB")
+    return regressions
+
+
+def _change(result: dict, base: Optional[dict]) -> str:
+    if not base or not base["min_us"]:
+        return ""
+    return f"{(result['min_us'] / base['min_us'] - 1) * 100:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-request CPU hot paths")
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", help="write results as a baseline JSON file")
+    parser.add_argument("--compare", help="baseline JSON file to check against")
+    parser.add_argument("--max-slowdown", type=float, default=0.25, help="allowed fractional slowdown")
+    parser.add_argument("--max-memory-growth", type=float, default=0.25, help="allowed fractional peak growth")
+    parser.add_argument("--min-delta-us", type=float, default=2.0, help="ignore slowdowns below this")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    results = {}
+    print(f"{'case':<40}{'median us':>12}{'min us':>12}{'peak KiB':>10}{'vs base':>10}")
+    for name, func in build_cases():
+        if args.filter not in name:
+            continue
+        result = results[name] = measure(func, args.rounds)
+        print(
+            f"{name:<40}{result['median_us']:>12.1f}{result['min_us']:>12.1f}"
+            f"{result['peak_kib']:>10.1f}{_change(result, baseline.get(name)):>10}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "results": results
+            }, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, baseline, args.max_slowdown, args.max_memory_growth, args.min_delta_us)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+# cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any
+
+from config import (
+    RESULT_CACHE_BACKEND, RESULT_CACHE_TTL_SECONDS,
+    RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_SQLITE_PATH
+)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different uploads share a key."""
+    return " ".join(text.split())
+
+
+def make_cache_key(*parts: str) -> str:
+    """Build a content-addressed key from the given parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        encoded = part.encode("utf-8")
+        # Length-prefix each part so ("ab", "c") and ("a", "bc") differ
+        digest.update(str(len(encoded)).encode("ascii") + b":")
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class LRUCacheBackend:
+    """In-process LRU store with per-entry TTL, optionally bounded in bytes."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self.size_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _drop(self, key: str):
+        value, _ = self._entries.pop(key)
+        self.size_bytes -= len(value)
+        self.evictions += 1
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._drop(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self.size_bytes -= len(previous[0])
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self.size_bytes += len(value)
+
+            # Sizes are in characters, a close enough proxy for memory use
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self.size_bytes > self.max_bytes
+                and len(self._entries) > 1
+            ):
+                self._drop(next(iter(self._entries)))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """On-disk store that survives restarts and is shared by workers on one host."""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.evictions += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl_seconds, now)
+            )
+
+            # Drop expired rows, then the least recently used overflow
+            removed = self._conn.execute(
+                "DELETE FROM cache WHERE expires_at < ?", (now,)
+            ).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM cache WHERE key IN ("
+                "SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+            self.evictions += max(removed, 0)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class TieredCacheBackend:
+    """Memory LRU in front of the SQLite store."""
+
+    def __init__(self, memory: LRUCacheBackend, disk: SQLiteCacheBackend):
+        self.memory = memory
+        self.disk = disk
+
+    @property
+    def evictions(self) -> int:
+        return self.memory.evictions + self.disk.evictions
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: str):
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    def __len__(self) -> int:
+        return len(self.disk)
+
+
+class ResultCache:
+    """JSON result cache with hit/miss/eviction counters."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        # Stored as JSON so callers always receive a fresh, mutable copy
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict[str, Any]):
+        self.backend.set(key, json.dumps(value))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.backend.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def create_result_cache() -> Optional[ResultCache]:
+    """Build the result cache selected by RESULT_CACHE_BACKEND."""
+    backend_name = RESULT_CACHE_BACKEND.lower()
+
+    if backend_name == "none":
+        return None
+    if backend_name == "memory":
+        backend = LRUCacheBackend(RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS)
+    elif backend_name == "sqlite":
+        backend = SQLiteCacheBackend(
+            RESULT_CACHE_SQLITE_PATH, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS
+        )
+    elif backend_name == "tiered":
+        backend = TieredCacheBackend(
+            LRUCacheBackend(RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS),
+            SQLiteCacheBackend(
+                RESULT_CACHE_SQLITE_PATH, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS
+            )
+        )
+    else:
+        raise ValueError(f"Unknown RESULT_CACHE_BACKEND: {RESULT_CACHE_BACKEND}")
+
+    return ResultCache(backend)
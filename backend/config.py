@@ -6,10 +6,102 @@ load_dotenv()
 
 # OpenRouter API Configuration
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
-OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+# Point at mock_openrouter.py (e.g. http://localhost:8001/api/v1) for offline runs
+OPENROUTER_BASE_URL = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
 
 LLM_MODEL = "openai/gpt-4o-mini"  # GPT-4o Mini model
 
+# Model routing: each tier is a fallback chain, tried in order. "balanced"
+# runs on the stronger model but may fall back to the small one;
+# "accurate" only ever falls back to another large model
+LLM_MODEL_TIERS = {
+    "fast": [LLM_MODEL, "google/gemini-flash-1.5"],
+    "balanced": ["openai/gpt-4o", LLM_MODEL],
+    "accurate": ["openai/gpt-4o", "google/gemini-pro-1.5"]
+}
+LLM_DEFAULT_TIERS = {"ats": "fast", "jd_match": "balanced"}
+# Prompts above this size are moved up one tier
+LLM_TIER_ESCALATION_TOKENS = int(os.getenv("LLM_TIER_ESCALATION_TOKENS", "6000"))
+# USD per million (input, output, cached input) tokens, for cost tracking
+LLM_MODEL_PRICING = {
+    "openai/gpt-4o-mini": (0.15, 0.60, 0.075),
+    "openai/gpt-4o": (2.50, 10.00, 1.25),
+    "google/gemini-flash-1.5": (0.075, 0.30, 0.01875),
+    "google/gemini-pro-1.5": (1.25, 5.00, 0.3125)
+}
+# Prompt caching: OpenAI models cache long shared prefixes automatically;
+# models matching these prefixes need explicit cache_control breakpoints
+LLM_CACHE_CONTROL_MODELS = tuple(
+    prefix.strip()
+    for prefix in os.getenv("LLM_CACHE_CONTROL_MODELS", "anthropic/,google/gemini").split(",")
+    if prefix.strip()
+)
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.7"))
+
+# Structured-output mode: JSON-schema constrained responses with short keys,
+# validated into typed models (see schemas.py)
+LLM_STRUCTURED_OUTPUT = os.getenv("LLM_STRUCTURED_OUTPUT", "true").lower() == "true"
+STRUCTURED_OUTPUT_TEMPERATURE = 0.2
+STRUCTURED_OUTPUT_RETRIES = 1  # Extra attempts when the response fails validation
+ATS_MAX_TOKENS = 600
+JD_MATCH_MAX_TOKENS = 900
+
+# LLM HTTP client (shared keep-alive pool used by the async code path)
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "30"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "100"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_MAX_CONCURRENCY_PER_HOST = int(os.getenv("LLM_MAX_CONCURRENCY_PER_HOST", "64"))
+# Global request budget across all callers (0 disables the limiter)
+LLM_RATE_LIMIT_PER_SECOND = float(os.getenv("LLM_RATE_LIMIT_PER_SECOND", "0"))
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", "10"))
+
+# Resilience: retries with backoff, hedged requests and a circuit breaker
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "8"))
+# A duplicate request is sent once the primary exceeds this latency percentile
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+LLM_HEDGE_PERCENTILE = 95
+LLM_HEDGE_MIN_SAMPLES = 20  # Latency samples needed before hedging starts
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+# Serve the local ATS score instead of an error while the LLM is unavailable
+LLM_FALLBACK_TO_LOCAL = os.getenv("LLM_FALLBACK_TO_LOCAL", "true").lower() == "true"
+
+# Multi-JD comparison fan-out
+COMPARE_JDS_MAX_PARALLEL = int(os.getenv("COMPARE_JDS_MAX_PARALLEL", "5"))
+COMPARE_JDS_TIMEOUT = float(os.getenv("COMPARE_JDS_TIMEOUT", "45"))
+# Only the top-k most similar JDs (TF-IDF) go to the LLM; 0 analyzes all
+COMPARE_JDS_PREFILTER_TOP_K = int(os.getenv("COMPARE_JDS_PREFILTER_TOP_K", "0"))
+# Batched comparison: the resume is sent once with a group of JDs. Groups
+# are filled up to the prompt token budget and the size cap.
+COMPARE_JDS_BATCHED = os.getenv("COMPARE_JDS_BATCHED", "true").lower() == "true"
+COMPARE_JDS_BATCH_TOKEN_BUDGET = int(os.getenv("COMPARE_JDS_BATCH_TOKEN_BUDGET", "6000"))
+COMPARE_JDS_MAX_BATCH_SIZE = int(os.getenv("COMPARE_JDS_MAX_BATCH_SIZE", "5"))
+
+# Prompt compaction: normalize/dedupe extracted text and cap its size
+PROMPT_COMPACTION_ENABLED = os.getenv("PROMPT_COMPACTION_ENABLED", "true").lower() == "true"
+RESUME_TOKEN_BUDGET = int(os.getenv("RESUME_TOKEN_BUDGET", "2500"))
+JD_TOKEN_BUDGET = int(os.getenv("JD_TOKEN_BUDGET", "1200"))
+
+# Analysis result cache: "memory", "sqlite", "tiered" (memory + sqlite) or "none"
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "5000"))
+RESULT_CACHE_SQLITE_PATH = os.getenv("RESULT_CACHE_SQLITE_PATH", "result_cache.sqlite3")
+
+# Extracted document text, keyed by file hash and addressable by resume_id.
+# Set DOCUMENT_CACHE_SQLITE_PATH to also persist it across restarts.
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+DOCUMENT_CACHE_MAX_ENTRIES = int(os.getenv("DOCUMENT_CACHE_MAX_ENTRIES", "5000"))
+DOCUMENT_CACHE_TTL_SECONDS = float(os.getenv("DOCUMENT_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+DOCUMENT_CACHE_SQLITE_PATH = os.getenv("DOCUMENT_CACHE_SQLITE_PATH", "")
+
+# ATS scoring mode: "llm" (always call the LLM), "fast" (local score only)
+# or "hybrid" (call the LLM only when the local score falls inside the band)
+ATS_SCORING_MODE = os.getenv("ATS_SCORING_MODE", "llm")
+HYBRID_AMBIGUOUS_BAND = (40, 75)
+
 # ATS Keywords
 ATS_KEYWORDS = {
     "technical_skills": [
@@ -35,10 +127,54 @@ ATS_KEYWORDS = {
 # File Configuration
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".doc"}
+UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB read size for streamed uploads
+
+# Persistent JD corpus and search index
+JD_INDEX_DIR = os.getenv("JD_INDEX_DIR", "jd_index")
+JD_SEARCH_MAX_RERANK = 10  # Upper bound on LLM re-ranked results per search
+# Postings changed since the last index build are searched from an in-memory
+# delta; past this many changes the index is rebuilt in the background
+JD_INDEX_MAX_DELTA = int(os.getenv("JD_INDEX_MAX_DELTA", "1000"))
+
+# Batch scoring
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+BATCH_MAX_ARCHIVE_SIZE = 200 * 1024 * 1024  # 200MB
 
-# Prompts
+# Background job queue (/api/jobs): SQLite-backed, run by in-process workers
+JOB_QUEUE_SQLITE_PATH = os.getenv("JOB_QUEUE_SQLITE_PATH", "jobs.sqlite3")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))  # Seconds between checks for new work
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "1000"))  # Queued jobs before submissions are refused
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "30"))  # Running jobs are reclaimed once unrenewed this long
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))  # Claims whose lease expired before a job is failed
+JOB_WEBHOOK_TIMEOUT = float(os.getenv("JOB_WEBHOOK_TIMEOUT", "10"))
+JOB_WEBHOOK_ATTEMPTS = int(os.getenv("JOB_WEBHOOK_ATTEMPTS", "3"))
+# Hosts webhooks may be sent to ("example.com" also allows its subdomains);
+# empty allows any host. Private, loopback and link-local addresses are
+# refused unless JOB_WEBHOOK_ALLOW_PRIVATE is set
+JOB_WEBHOOK_ALLOWED_HOSTS = tuple(
+    host.strip().lower()
+    for host in os.getenv("JOB_WEBHOOK_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+)
+JOB_WEBHOOK_ALLOW_PRIVATE = os.getenv("JOB_WEBHOOK_ALLOW_PRIVATE", "false").lower() == "true"
+
+# Document extraction process pool (0 workers runs extraction in a thread)
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "20"))
+EXTRACTION_MAX_PAGES = int(os.getenv("EXTRACTION_MAX_PAGES", "50"))
+# PDF text is read page by page until either cap is hit (0 disables a cap);
+# larger documents are split into page chunks extracted by several workers
+PDF_PAGE_LIMIT = int(os.getenv("PDF_PAGE_LIMIT", "15"))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", "30000"))
+PDF_PARALLEL_CHUNK_PAGES = int(os.getenv("PDF_PARALLEL_CHUNK_PAGES", "5"))
+
+# Prompts. These are the static instructions sent as the system message;
+# the resume and job descriptions follow in the user message (see
+# prompt_builder.py), so they are plain text rather than format strings.
 ATS_SCORE_PROMPT = """
-Analyze this resume and provide an ATS (Applicant Tracking System) compatibility score.
+Analyze the resume provided by the user and give an ATS (Applicant Tracking System) compatibility score.
 Consider the following factors:
 1. Format and structure (proper sections like Summary, Experience, Education, Skills)
 2. Keyword presence and density
@@ -48,39 +184,34 @@ Consider the following factors:
 6. Contact information presence
 
 Provide your response ONLY in this exact JSON format:
-{{
+{
     "ats_score": <number between 0-100>,
-    "score_breakdown": {{
+    "score_breakdown": {
         "format_structure": <0-25>,
         "keyword_optimization": <0-25>,
         "parseability": <0-20>,
         "clarity": <0-15>,
         "completeness": <0-15>
-    }},
+    },
     "strengths": [<list of strong points>],
     "weaknesses": [<list of improvement areas>],
     "suggestions": [<list of specific improvements>]
-}}
+}
 """
 
 JD_MATCH_PROMPT = """
-Analyze this resume against the provided job description. Provide a detailed match analysis.
-
-Resume:
-{resume_content}
-
-Job Description:
-{jd_content}
+Analyze the resume provided by the user against the job description that follows it.
+Provide a detailed match analysis.
 
 Provide your response ONLY in this exact JSON format:
-{{
+{
     "overall_match_score": <number between 0-100>,
-    "match_breakdown": {{
+    "match_breakdown": {
         "skills_match": <0-30>,
         "experience_match": <0-25>,
         "qualification_match": <0-20>,
         "responsibility_alignment": <0-25>
-    }},
+    },
     "matched_skills": [<skills present in both resume and JD>],
     "missing_skills": [<skills required by JD but missing from resume>],
     "matched_responsibilities": [<responsibilities the candidate has done>],
@@ -89,5 +220,76 @@ Provide your response ONLY in this exact JSON format:
     "gaps": [<areas where candidate is lacking>],
     "recommendations": [<specific improvements to resume for this JD>],
     "final_assessment": "<2-3 sentence summary of fit>"
-}}
-"""
\ No newline at end of file
+}
+"""
+
+# Structured-output prompts (key names are defined by the response schema)
+ATS_SCORE_STRUCTURED_PROMPT = """
+Score the resume provided by the user for ATS (Applicant Tracking System) compatibility.
+Judge section structure, keyword coverage, parseability (no tables/images/special
+characters), clear titles and dates, and contact details.
+
+Return JSON with these keys:
+s: overall score 0-100
+b: breakdown {fs: format/structure 0-25, ko: keywords 0-25, pa: parseability 0-20,
+   cl: clarity 0-15, co: completeness 0-15}
+st: strengths, wk: weaknesses, sg: specific suggestions (max 5 short items each)
+"""
+
+JD_MATCH_STRUCTURED_PROMPT = """
+Assess how well the resume provided by the user matches the job description that follows it.
+
+Return JSON with these keys:
+s: overall match 0-100
+b: breakdown {sk: skills 0-30, ex: experience 0-25, qu: qualifications 0-20,
+   re: responsibility alignment 0-25}
+ms: matched skills, xs: missing skills, mr: matched responsibilities,
+xr: missing responsibilities, st: strengths, gp: gaps, rc: resume recommendations
+(max 6 short items each)
+fa: 2-3 sentence summary of fit
+"""
+
+# Batched multi-JD prompts: one resume, several numbered job descriptions
+JD_BATCH_MATCH_PROMPT = """
+Analyze the resume provided by the user against each of the numbered job descriptions
+that follow it. Assess every job description independently.
+
+Provide your response ONLY in this exact JSON format, with one entry per job description:
+{
+    "results": [
+        {
+            "jd": <job description number>,
+            "overall_match_score": <number between 0-100>,
+            "match_breakdown": {
+                "skills_match": <0-30>,
+                "experience_match": <0-25>,
+                "qualification_match": <0-20>,
+                "responsibility_alignment": <0-25>
+            },
+            "matched_skills": [<skills present in both resume and JD>],
+            "missing_skills": [<skills required by JD but missing from resume>],
+            "matched_responsibilities": [<responsibilities the candidate has done>],
+            "missing_responsibilities": [<key responsibilities from JD not in resume>],
+            "strengths": [<why candidate is a good fit>],
+            "gaps": [<areas where candidate is lacking>],
+            "recommendations": [<specific improvements to resume for this JD>],
+            "final_assessment": "<2-3 sentence summary of fit>"
+        }
+    ]
+}
+"""
+
+JD_BATCH_MATCH_STRUCTURED_PROMPT = """
+Assess how well the resume provided by the user matches each of the numbered job
+descriptions that follow it. Judge every job description independently.
+
+Return JSON {r: [...]} with one entry per job description, each with these keys:
+j: job description number
+s: overall match 0-100
+b: breakdown {sk: skills 0-30, ex: experience 0-25, qu: qualifications 0-20,
+   re: responsibility alignment 0-25}
+ms: matched skills, xs: missing skills, mr: matched responsibilities,
+xr: missing responsibilities, st: strengths, gp: gaps, rc: resume recommendations
+(max 6 short items each)
+fa: 2-3 sentence summary of fit
+"""
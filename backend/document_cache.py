@@ -0,0 +1,73 @@
+# document_cache.py
+import hashlib
+import json
+from typing import Optional
+
+from cache import LRUCacheBackend, SQLiteCacheBackend, TieredCacheBackend
+from config import (
+    DOCUMENT_CACHE_MAX_BYTES, DOCUMENT_CACHE_MAX_ENTRIES,
+    DOCUMENT_CACHE_TTL_SECONDS, DOCUMENT_CACHE_SQLITE_PATH
+)
+from resume_parser import parse_resume
+
+
+class DocumentCache:
+    """
+    Extracted text and section structure, keyed by a hash of the uploaded
+    file. The hash doubles as a resume_id handle that clients can send
+    instead of re-uploading the same document.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def document_id(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def get(self, resume_id: str) -> Optional[dict]:
+        value = self.backend.get(resume_id)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(value)
+
+    def put(self, resume_id: str, text: str, file_extension: str) -> dict:
+        document = {
+            "text": text,
+            "file_extension": file_extension,
+            "sections": [section.as_dict() for section in parse_resume(text).sections]
+        }
+        self.backend.set(resume_id, json.dumps(document))
+        return document
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        memory = getattr(self.backend, "memory", self.backend)
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "size_bytes": memory.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.backend.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+def create_document_cache() -> DocumentCache:
+    """Memory LRU, tiered over SQLite when DOCUMENT_CACHE_SQLITE_PATH is set."""
+    memory = LRUCacheBackend(
+        DOCUMENT_CACHE_MAX_ENTRIES, DOCUMENT_CACHE_TTL_SECONDS, DOCUMENT_CACHE_MAX_BYTES
+    )
+    if not DOCUMENT_CACHE_SQLITE_PATH:
+        return DocumentCache(memory)
+
+    disk = SQLiteCacheBackend(
+        DOCUMENT_CACHE_SQLITE_PATH, DOCUMENT_CACHE_MAX_ENTRIES, DOCUMENT_CACHE_TTL_SECONDS
+    )
+    return DocumentCache(TieredCacheBackend(memory, disk))
@@ -0,0 +1,193 @@
+# extraction_executor.py
+import asyncio
+import io
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
+from config import (
+    EXTRACTION_WORKERS, EXTRACTION_TIMEOUT, EXTRACTION_MAX_PAGES,
+    PDF_PAGE_LIMIT, PDF_MAX_CHARS, PDF_PARALLEL_CHUNK_PAGES
+)
+from resume_extractor import ResumeExtractor
+from document_cache import DocumentCache
+from metrics import record_stage
+
+
+def _extract_in_worker(data: bytes, file_extension: str, max_pages: Optional[int]) -> Tuple[str, dict]:
+    """Entry point run inside a pool process (must be module-level to pickle)."""
+    timings = {}
+    text = ResumeExtractor.extract_from_bytes(
+        data, file_extension, max_pages, PDF_PAGE_LIMIT, PDF_MAX_CHARS, timings
+    )
+    return text, timings
+
+
+def _extract_pdf_range_in_worker(
+    data: bytes,
+    start: int,
+    stop: int,
+    max_pages: Optional[int]
+) -> Tuple[List[str], int, dict]:
+    """Extract one page range of a PDF inside a pool process."""
+    timings = {}
+    try:
+        pages, total_pages = ResumeExtractor.extract_pdf_pages(
+            io.BytesIO(data), start, stop, PDF_MAX_CHARS, max_pages, timings
+        )
+    except Exception as e:
+        raise ValueError(f"Error extracting PDF: {str(e)}")
+    return pages, total_pages, timings
+
+
+class ExtractionExecutor:
+    """Run CPU-bound PDF/DOCX extraction off the event loop."""
+
+    def __init__(
+        self,
+        max_workers: int = EXTRACTION_WORKERS,
+        timeout: float = EXTRACTION_TIMEOUT,
+        max_pages: Optional[int] = EXTRACTION_MAX_PAGES,
+        document_cache: Optional[DocumentCache] = None
+    ):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.document_cache = document_cache
+        self._pool = None
+        self.documents = 0
+        self.pages_read = 0
+        self.stage_seconds = {}
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.max_workers <= 0:
+            return None  # default thread pool
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _reset_pool(self, pool: Optional[ProcessPoolExecutor]):
+        """
+        Replace `pool` (if it is still the current one) and kill its worker
+        processes. A worker stuck on a pathological document cannot be
+        interrupted any other way. Other calls' work on the killed pool
+        fails with BrokenProcessPool, and _run resubmits it to the new pool.
+        """
+        if pool is None or pool is not self._pool:
+            return
+        self._pool = None
+        processes = list((pool._processes or {}).values())
+        pool.shutdown(wait=False)
+        for process in processes:
+            process.terminate()
+
+    async def extract(self, data: bytes, file_extension: str) -> str:
+        """
+        Extract text from in-memory file content in a worker process.
+        Raises ValueError on parse errors, timeouts and oversized documents.
+        """
+        _, text = await self.extract_document(data, file_extension)
+        return text
+
+    async def extract_document(self, data: bytes, file_extension: str) -> Tuple[str, str]:
+        """
+        Like extract(), but returns (resume_id, text). A document already
+        seen (same bytes) is served from the document cache without parsing.
+        """
+        if self.document_cache is None:
+            return DocumentCache.document_id(data), await self._extract(data, file_extension)
+
+        resume_id = DocumentCache.document_id(data)
+        document = self.document_cache.get(resume_id)
+        if document is None:
+            text = await self._extract(data, file_extension)
+            document = self.document_cache.put(resume_id, text, file_extension)
+        return resume_id, document["text"]
+
+    async def _extract(self, data: bytes, file_extension: str) -> str:
+        started = time.perf_counter()
+        try:
+            if file_extension.lower() == ".pdf" and self._parallel_pages():
+                text, timings = await asyncio.wait_for(self._extract_pdf_chunked(data), timeout=self.timeout)
+            else:
+                text, timings = await asyncio.wait_for(
+                    self._run(_extract_in_worker, data, file_extension, self.max_pages),
+                    timeout=self.timeout
+                )
+        except asyncio.TimeoutError:
+            self._reset_pool(self._pool)
+            raise ValueError(f"Document extraction timed out after {self.timeout:g} seconds")
+        except BrokenProcessPool:
+            raise ValueError("Document extraction worker crashed")
+
+        timings["total"] = time.perf_counter() - started
+        self._record(timings)
+        return text
+
+    def _parallel_pages(self) -> bool:
+        return PDF_PARALLEL_CHUNK_PAGES > 0 and self.max_workers > 1
+
+    async def _run(self, func, *args):
+        while True:
+            pool = self._get_pool()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+            except BrokenProcessPool:
+                if pool is self._pool:
+                    # Our pool broke first (a worker crashed): replace it and fail
+                    self._reset_pool(pool)
+                    raise
+                # Another call killed the pool under us; retry on the new one
+
+    async def _extract_pdf_chunked(self, data: bytes) -> Tuple[str, dict]:
+        """
+        Read the first chunk of pages; if the text budget is not met yet,
+        extract the remaining pages (up to PDF_PAGE_LIMIT) as page ranges
+        on several workers at once. Short resumes finish in one call.
+        """
+        chunk = PDF_PARALLEL_CHUNK_PAGES
+        pages, total_pages, timings = await self._run(
+            _extract_pdf_range_in_worker, data, 0, chunk, self.max_pages
+        )
+
+        limit = min(total_pages, PDF_PAGE_LIMIT or total_pages)
+        collected = sum(len(page) for page in pages)
+        if limit > chunk and not (PDF_MAX_CHARS and collected >= PDF_MAX_CHARS):
+            ranges = [(start, min(start + chunk, limit)) for start in range(chunk, limit, chunk)]
+            results = await asyncio.gather(*(
+                self._run(_extract_pdf_range_in_worker, data, start, stop, None)
+                for start, stop in ranges
+            ))
+            for range_pages, _, range_timings in results:
+                pages.extend(range_pages)
+                # Ranges run concurrently, so stage times are summed CPU time
+                for stage in ("open", "extract", "pages_read"):
+                    timings[stage] += range_timings[stage]
+
+        text = ResumeExtractor.assemble_pdf_text(pages, PDF_MAX_CHARS, timings)
+        return text, timings
+
+    def _record(self, timings: dict):
+        record_stage("extraction", timings["total"])
+        self.documents += 1
+        self.pages_read += timings.get("pages_read", 0)
+        for stage in ("open", "extract", "assemble", "total"):
+            if stage in timings:
+                self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + timings[stage]
+
+    def stats(self) -> dict:
+        return {
+            "documents": self.documents,
+            "pages_read": self.pages_read,
+            "avg_stage_seconds": {
+                stage: round(seconds / self.documents, 4)
+                for stage, seconds in self.stage_seconds.items()
+            }
+        }
+
+    def shutdown(self):
+        """Stop worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -1,20 +1,38 @@
 # jd_analyzer.py
+import asyncio
+from typing import Optional, List, Tuple, AsyncIterator, Dict, Callable
 from llm_service import LLMService
-from config import JD_MATCH_PROMPT
+from cache import ResultCache, make_cache_key, normalize_text
+from config import (
+    JD_MATCH_PROMPT, JD_MATCH_STRUCTURED_PROMPT, COMPARE_JDS_MAX_PARALLEL,
+    COMPARE_JDS_TIMEOUT, COMPARE_JDS_PREFILTER_TOP_K, LLM_STRUCTURED_OUTPUT,
+    COMPARE_JDS_BATCHED, COMPARE_JDS_BATCH_TOKEN_BUDGET, COMPARE_JDS_MAX_BATCH_SIZE,
+    JD_BATCH_MATCH_PROMPT, JD_BATCH_MATCH_STRUCTURED_PROMPT
+)
+from resilience import LLMAPIError
+from schemas import JDMatchResult, missing_fields
 from utils import validate_resume_content
+from similarity import rank_jds_by_similarity
+from singleflight import SingleFlight
 
 
 class JDAnalyzer:
     """Analyze resume against job description."""
     
-    def __init__(self):
-        self.llm_service = LLMService()
+    def __init__(
+        self,
+        llm_service: Optional[LLMService] = None,
+        cache: Optional[ResultCache] = None
+    ):
+        self.llm_service = llm_service or LLMService()
+        self.cache = cache
+        self.in_flight = SingleFlight()
+        self.structured_output = LLM_STRUCTURED_OUTPUT
+        self.batched = COMPARE_JDS_BATCHED
     
-    def analyze(self, resume_text: str, jd_text: str) -> dict:
-        """
-        Analyze resume against job description.
-        Returns match score, gaps, strengths, and recommendations.
-        """
+    @staticmethod
+    def _validate(resume_text: str, jd_text: str) -> Optional[dict]:
+        """Return an error result if either input is unusable, else None."""
         # Validate both resume and JD have sufficient content
         if not validate_resume_content(resume_text):
             return {
@@ -28,25 +46,156 @@ class JDAnalyzer:
                 "error": "Job description is too short (minimum 200 characters required)"
             }
         
-        # Get LLM analysis
-        llm_result = self.llm_service.analyze_jd_match(
-            resume_text,
-            jd_text,
-            JD_MATCH_PROMPT
-        )
+        return None
+    
+    def analyze(self, resume_text: str, jd_text: str, tier: Optional[str] = None) -> dict:
+        """
+        Analyze resume against job description.
+        Returns match score, gaps, strengths, and recommendations.
+        tier: model tier ("fast", "balanced", "accurate"); see model_router.
+        """
+        error = self._validate(resume_text, jd_text)
+        if error:
+            return error
+        
+        cache_key = self._cache_key(resume_text, jd_text, tier)
+        llm_result = self._cached(cache_key)
+        
+        if llm_result is None:
+            # Get LLM analysis
+            if self.structured_output:
+                llm_result = self.llm_service.analyze_jd_match_structured(
+                    resume_text,
+                    jd_text,
+                    JD_MATCH_STRUCTURED_PROMPT,
+                    tier
+                )
+            else:
+                llm_result = self.llm_service.analyze_jd_match(
+                    resume_text,
+                    jd_text,
+                    JD_MATCH_PROMPT,
+                    tier
+                )
+            self._store(cache_key, llm_result)
         
         return llm_result
     
-    def compare_multiple_jds(self, resume_text: str, jd_texts: list) -> dict:
+    async def analyze_async(self, resume_text: str, jd_text: str, tier: Optional[str] = None) -> dict:
+        """
+        Awaitable variant of analyze() that does not block the event loop
+        while waiting on the LLM.
+        """
+        error = self._validate(resume_text, jd_text)
+        if error:
+            return error
+        
+        cache_key = self._cache_key(resume_text, jd_text, tier)
+        llm_result = self._cached(cache_key)
+        
+        if llm_result is None:
+            # Identical concurrent requests share one upstream call
+            llm_result = await self.in_flight.do(
+                cache_key,
+                lambda: self._analyze_llm_async(resume_text, jd_text, cache_key, tier)
+            )
+        
+        return llm_result
+    
+    async def _analyze_llm_async(self, resume_text: str, jd_text: str, cache_key: str,
+                                 tier: Optional[str]) -> dict:
+        if self.structured_output:
+            llm_result = await self.llm_service.analyze_jd_match_structured_async(
+                resume_text,
+                jd_text,
+                JD_MATCH_STRUCTURED_PROMPT,
+                tier
+            )
+        else:
+            llm_result = await self.llm_service.analyze_jd_match_async(
+                resume_text,
+                jd_text,
+                JD_MATCH_PROMPT,
+                tier
+            )
+        self._store(cache_key, llm_result)
+        return llm_result
+    
+    async def analyze_stream(self, resume_text: str, jd_text: str,
+                             tier: Optional[str] = None) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Streaming variant of analyze_async. Yields ("field", {"key", "value"})
+        events as LLM output fields complete, then ("result", full result).
+        Streaming always uses the free-form prompt.
+        """
+        error = self._validate(resume_text, jd_text)
+        if error:
+            yield "result", error
+            return
+        
+        # Keyed on the free-form prompt: streamed results are only checked
+        # for completeness, so they must not answer structured lookups
+        cache_key = self._cache_key(resume_text, jd_text, tier, JD_MATCH_PROMPT)
+        llm_result = self._cached(cache_key)
+        
+        if llm_result is None:
+            llm_result = {}
+            async for key, value in self.llm_service.stream_jd_match_async(
+                resume_text,
+                jd_text,
+                JD_MATCH_PROMPT,
+                tier
+            ):
+                llm_result[key] = value
+                yield "field", {"key": key, "value": value}
+            missing = missing_fields(JDMatchResult, llm_result)
+            if missing:
+                # A truncated or off-format answer must not be cached
+                raise ValueError(f"LLM response is missing fields: {', '.join(missing)}")
+            self._store(cache_key, llm_result)
+        else:
+            for key, value in llm_result.items():
+                yield "field", {"key": key, "value": value}
+        
+        yield "result", llm_result
+    
+    def _cache_key(self, resume_text: str, jd_text: str, tier: Optional[str] = None,
+                   prompt_template: Optional[str] = None) -> str:
+        if prompt_template is None:
+            prompt_template = JD_MATCH_STRUCTURED_PROMPT if self.structured_output else JD_MATCH_PROMPT
+        return make_cache_key(
+            "jd_match",
+            normalize_text(resume_text),
+            normalize_text(jd_text),
+            prompt_template,
+            self.llm_service.router.cache_scope("jd_match", tier)
+        )
+    
+    def _cached(self, cache_key: str) -> Optional[dict]:
+        return self.cache.get(cache_key) if self.cache else None
+    
+    def _store(self, cache_key: str, llm_result: dict):
+        # Fallback-model answers are not cached under the routed chain's scope
+        if self.cache and "fallback_model" not in llm_result:
+            self.cache.set(cache_key, llm_result)
+    
+    def compare_multiple_jds(
+        self,
+        resume_text: str,
+        jd_texts: list,
+        top_k: Optional[int] = None,
+        tier: Optional[str] = None
+    ) -> dict:
         """
         Compare resume against multiple job descriptions.
         Useful for finding best-fit position.
         """
+        selected, prefiltered = self._prefilter(resume_text, jd_texts, top_k)
         results = []
         
-        for idx, jd_text in enumerate(jd_texts):
+        for idx in selected:
             try:
-                analysis = self.analyze(resume_text, jd_text)
+                analysis = self.analyze(resume_text, jd_texts[idx], tier)
                 analysis["jd_index"] = idx
                 results.append(analysis)
             except Exception as e:
@@ -56,15 +205,208 @@ class JDAnalyzer:
                     "error": str(e)
                 })
         
+        return self._rank_results(jd_texts, results, prefiltered)
+    
+    async def compare_multiple_jds_async(
+        self,
+        resume_text: str,
+        jd_texts: list,
+        max_parallel: Optional[int] = None,
+        jd_timeout: Optional[float] = None,
+        top_k: Optional[int] = None,
+        tier: Optional[str] = None,
+        on_result: Optional[Callable[[dict, int], None]] = None
+    ) -> dict:
+        """
+        Compare resume against multiple job descriptions concurrently.
+        At most `max_parallel` LLM calls are in flight for this request, and
+        each is bounded by `jd_timeout` seconds per JD it covers. A failed
+        or timed-out JD yields an error entry without cancelling the others.
+        
+        In batched mode, uncached JDs are packed into multi-JD prompts (see
+        _analyze_batches); JDs a batch response did not cover are retried
+        with single-JD calls.
+        
+        on_result, if given, is called with each JD's entry (analysis or
+        error) as it completes and the number of JDs being analyzed.
+        """
+        selected, prefiltered = self._prefilter(resume_text, jd_texts, top_k)
+        semaphore = asyncio.Semaphore(max_parallel or COMPARE_JDS_MAX_PARALLEL)
+        timeout = jd_timeout or COMPARE_JDS_TIMEOUT
+        
+        def report(entry: dict) -> dict:
+            if on_result:
+                on_result(entry, len(selected))
+            return entry
+        
+        batched, single, batches = {}, selected, 0
+        if self.batched and len(selected) > 1:
+            batched, single, batches = await self._analyze_batches(
+                resume_text, jd_texts, selected, semaphore, timeout, tier, report
+            )
+        
+        async def analyze_one(idx: int, jd_text: str) -> dict:
+            async with semaphore:
+                try:
+                    analysis = await asyncio.wait_for(
+                        self.analyze_async(resume_text, jd_text, tier),
+                        timeout=timeout
+                    )
+                    analysis["jd_index"] = idx
+                    return report(analysis)
+                except asyncio.TimeoutError:
+                    error = f"Timed out after {timeout:g} seconds"
+                except Exception as e:
+                    error = str(e)
+                
+                return report({
+                    "jd_index": idx,
+                    "status": "error",
+                    "error": error
+                })
+        
+        results = await asyncio.gather(
+            *(analyze_one(idx, jd_texts[idx]) for idx in single)
+        )
+        
+        comparison = self._rank_results(jd_texts, list(batched.values()) + list(results), prefiltered)
+        if self.batched:
+            comparison["batching"] = {
+                "batches": batches,
+                "batched_jds": len(batched),
+                "single_jds": len(single)
+            }
+        return comparison
+    
+    async def _analyze_batches(
+        self,
+        resume_text: str,
+        jd_texts: list,
+        indices: List[int],
+        semaphore: asyncio.Semaphore,
+        timeout: float,
+        tier: Optional[str],
+        report: Callable[[dict], dict]
+    ) -> Tuple[Dict[int, dict], List[int], int]:
+        """
+        Analyze uncached, valid JDs in multi-JD batches sized to
+        COMPARE_JDS_BATCH_TOKEN_BUDGET. Returns (results by JD index, JD
+        indices left for single-JD calls, number of batch calls). Cached or
+        invalid JDs, groups of one and JDs a batch response left out or got
+        wrong are left for single calls; an upstream error or timeout fails
+        the whole batch, and any other error sends its JDs to single calls.
+        
+        Batch analyses are cached under the batch prompt template, apart from
+        single-JD results, and reused by later batched comparisons.
+        """
+        prompt_template = JD_BATCH_MATCH_STRUCTURED_PROMPT if self.structured_output else JD_BATCH_MATCH_PROMPT
+        results, candidates, single = {}, [], []
+        for idx in indices:
+            jd_text = jd_texts[idx]
+            if self._validate(resume_text, jd_text) or self._cached(self._cache_key(resume_text, jd_text, tier)):
+                single.append(idx)
+                continue
+            analysis = self._cached(self._cache_key(resume_text, jd_text, tier, prompt_template))
+            if analysis is not None:
+                results[idx] = report(dict(analysis, jd_index=idx))
+            else:
+                candidates.append(idx)
+        
+        groups = []
+        for positions in self.llm_service.plan_jd_batches(
+            resume_text,
+            [jd_texts[idx] for idx in candidates],
+            prompt_template,
+            COMPARE_JDS_BATCH_TOKEN_BUDGET,
+            COMPARE_JDS_MAX_BATCH_SIZE
+        ):
+            group = [candidates[position] for position in positions]
+            if len(group) > 1:
+                groups.append(group)
+            else:
+                single.extend(group)
+        
+        async def analyze_group(group: List[int]):
+            group_timeout = timeout * len(group)
+            async with semaphore:
+                try:
+                    analyses = await asyncio.wait_for(
+                        self.llm_service.analyze_jd_batch_async(
+                            resume_text,
+                            [jd_texts[idx] for idx in group],
+                            prompt_template,
+                            tier,
+                            self.structured_output
+                        ),
+                        timeout=group_timeout
+                    )
+                except asyncio.TimeoutError:
+                    error = f"Timed out after {group_timeout:g} seconds"
+                except LLMAPIError as e:
+                    error = str(e)
+                except Exception:
+                    # Unusable response body or local failure: retry each JD on its own
+                    single.extend(group)
+                    return
+                else:
+                    for idx, analysis in zip(group, analyses):
+                        if analysis is None:
+                            single.append(idx)
+                            continue
+                        self._store(self._cache_key(resume_text, jd_texts[idx], tier, prompt_template), analysis)
+                        analysis["jd_index"] = idx
+                        results[idx] = report(analysis)
+                    return
+            
+            for idx in group:
+                results[idx] = report({
+                    "jd_index": idx,
+                    "status": "error",
+                    "error": error
+                })
+        
+        await asyncio.gather(*(analyze_group(group) for group in groups))
+        return results, sorted(single), len(groups)
+    
+    @staticmethod
+    def _prefilter(resume_text: str, jd_texts: list, top_k: Optional[int]) -> Tuple[List[int], list]:
+        """
+        Rank JDs by TF-IDF cosine similarity and keep the top_k for LLM
+        analysis. Returns (selected JD indices, entries for the rest).
+        top_k of 0 analyzes every JD.
+        """
+        top_k = COMPARE_JDS_PREFILTER_TOP_K if top_k is None else top_k
+        if top_k <= 0 or len(jd_texts) <= top_k:
+            return list(range(len(jd_texts))), []
+        
+        scores = rank_jds_by_similarity(resume_text, jd_texts)
+        order = scores.argsort()[::-1]
+        
+        prefiltered = [
+            {
+                "jd_index": int(idx),
+                "status": "prefiltered",
+                "similarity_score": round(float(scores[idx]) * 100, 2)
+            }
+            for idx in order[top_k:]
+        ]
+        return sorted(int(idx) for idx in order[:top_k]), prefiltered
+    
+    @staticmethod
+    def _rank_results(jd_texts: list, results: list, prefiltered: Optional[list] = None) -> dict:
+        """Sort successful analyses by score and collect the failures."""
         # Sort by match score (highest first)
         valid_results = [r for r in results if "overall_match_score" in r]
         valid_results.sort(
             key=lambda x: x.get("overall_match_score", 0),
             reverse=True
         )
+        errors = [r for r in results if "overall_match_score" not in r]
         
         return {
             "total_jds": len(jd_texts),
             "results": valid_results,
-            "best_match_index": results[0]["jd_index"] if results else None
+            "errors": errors,
+            "prefiltered": prefiltered or [],
+            "best_match_index": valid_results[0]["jd_index"] if valid_results else None
         }
\ No newline at end of file
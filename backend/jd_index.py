@@ -0,0 +1,340 @@
+# jd_index.py
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import JD_INDEX_DIR, JD_INDEX_MAX_DELTA
+from similarity import TfidfVectorizer, tokenize
+
+
+class JDIndex:
+    """
+    Persistent job-description corpus with a TF-IDF inverted index.
+
+    Postings live in SQLite. The index is stored term-major (for each term,
+    the JDs containing it and their normalized TF-IDF weight), which makes it
+    both the inverted index and the transposed vector index. Index arrays are
+    saved as .npy files and memory-mapped on load, so startup and queries do
+    not read the whole corpus into memory.
+
+    Postings added or replaced since the last build are vectorized (with
+    the built IDF weights) into a small in-memory delta that is searched
+    alongside the index; replaced and deleted postings are masked out of the
+    index with tombstones. Once JD_INDEX_MAX_DELTA postings have changed,
+    the index is rebuilt in a background thread and the delta merged into it.
+    """
+
+    def __init__(self, directory: str = JD_INDEX_DIR, max_delta: int = JD_INDEX_MAX_DELTA):
+        self.directory = directory
+        self.max_delta = max_delta
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # Serializes rebuilds; held while tokenizing, so never with _lock
+        self._build_lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "jds.sqlite3"), check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jds ("
+            "id TEXT PRIMARY KEY, title TEXT NOT NULL, text TEXT NOT NULL, "
+            "metadata TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._vocabulary: Dict[str, int] = {}
+        self._idf = None
+        self._doc_ids: List[str] = []
+        self._doc_index: Dict[str, int] = {}
+        self._live = None  # 1.0 per indexed posting, 0.0 once tombstoned
+        self._built_at = None
+        self._indptr = None
+        self._docs = None
+        self._weights = None
+
+        # Changes since the index was built
+        self._seq = 0
+        self._changed: Dict[str, int] = {}  # jd_id -> sequence number of its last change
+        self._delta: Dict[str, Dict[str, float]] = {}  # jd_id -> {term: weight}
+        self._delta_postings: Dict[str, Dict[str, float]] = {}  # term -> {jd_id: weight}
+        self._merging = False
+
+        if self._load_index():
+            self._load_changes()
+
+    # Corpus management
+
+    def upsert(self, text: str, title: str = "", metadata: Optional[dict] = None,
+               jd_id: Optional[str] = None) -> str:
+        """Add or replace a posting. Returns its ID."""
+        return self.upsert_many([{"text": text, "title": title, "metadata": metadata, "id": jd_id}])[0]
+
+    def upsert_many(self, postings: List[dict]) -> List[str]:
+        """
+        Add or replace postings (dicts with "text" and optional "title",
+        "metadata" and "id") in one transaction. Returns their IDs.
+        """
+        now = time.time()
+        rows = [
+            (posting.get("id") or uuid.uuid4().hex, posting.get("title") or "", posting["text"],
+             json.dumps(posting.get("metadata") or {}), now)
+            for posting in postings
+        ]
+        tokens = [tokenize(f"{title}\n{text}") for _, title, text, _, _ in rows]
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO jds (id, title, text, metadata, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+            for row, doc_tokens in zip(rows, tokens):
+                self._record_change(row[0], doc_tokens)
+        self._maybe_merge()
+        return [row[0] for row in rows]
+
+    def delete(self, jd_id: str) -> bool:
+        """Remove a posting. Returns False if it did not exist."""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM jds WHERE id = ?", (jd_id,)
+            ).rowcount
+            self._conn.commit()
+            if deleted:
+                self._record_change(jd_id, None)
+        if deleted:
+            self._maybe_merge()
+        return bool(deleted)
+
+    def get(self, jd_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, title, text, metadata, updated_at FROM jds WHERE id = ?",
+                (jd_id,)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jds").fetchone()[0]
+
+    @staticmethod
+    def _row_to_dict(row) -> dict:
+        jd_id, title, text, metadata, updated_at = row
+        return {
+            "id": jd_id,
+            "title": title,
+            "text": text,
+            "metadata": json.loads(metadata),
+            "updated_at": updated_at
+        }
+
+    # Index build and load
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load_index(self) -> bool:
+        """Memory-map a previously built index. Returns False if none exists."""
+        try:
+            with open(self._path("index_meta.json")) as f:
+                meta = json.load(f)
+            built_at = meta["built_at"]
+            self._indptr = np.load(self._path("postings_indptr.npy"), mmap_mode="r")
+            self._docs = np.load(self._path("postings_docs.npy"), mmap_mode="r")
+            self._weights = np.load(self._path("postings_weights.npy"), mmap_mode="r")
+            self._idf = np.load(self._path("idf.npy"), mmap_mode="r")
+        except (OSError, ValueError, KeyError):
+            return False
+
+        self._vocabulary = {term: idx for idx, term in enumerate(meta["terms"])}
+        self._doc_ids = meta["doc_ids"]
+        self._doc_index = {jd_id: idx for idx, jd_id in enumerate(self._doc_ids)}
+        self._live = np.ones(len(self._doc_ids), dtype=np.float32)
+        self._built_at = built_at
+        return True
+
+    def _load_changes(self):
+        """Catch up with postings changed in SQLite after the index was built."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, title, text FROM jds WHERE updated_at >= ?", (self._built_at,)
+            ).fetchall()
+            existing = {row[0] for row in self._conn.execute("SELECT id FROM jds")}
+            for jd_id, title, text in rows:
+                self._record_change(jd_id, tokenize(f"{title}\n{text}"))
+            for jd_id in self._doc_ids:
+                if jd_id not in existing:
+                    self._record_change(jd_id, None)
+        self._maybe_merge()
+
+    def _save_array(self, name: str, array: np.ndarray):
+        # Write then rename so readers never see a partial file
+        tmp_path = self._path(name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, self._path(name))
+
+    def rebuild(self):
+        """
+        Re-tokenize the corpus and rewrite the index files. Searches keep
+        using the current index (and delta) until the new one is swapped in.
+        """
+        with self._build_lock:
+            self._rebuild()
+
+    def _rebuild(self):
+        with self._lock:
+            seq = self._seq
+            built_at = time.time()
+            rows = self._conn.execute("SELECT id, title, text FROM jds ORDER BY id").fetchall()
+
+        doc_ids = [row[0] for row in rows]
+        tokens = [tokenize(f"{row[1]}\n{row[2]}") for row in rows]
+        vectorizer = TfidfVectorizer().fit(tokens)
+        postings = vectorizer.transform(tokens).tocsc()
+        postings.sort_indices()
+
+        self._save_array("postings_indptr.npy", postings.indptr.astype(np.int64))
+        self._save_array("postings_docs.npy", postings.indices.astype(np.int32))
+        self._save_array("postings_weights.npy", postings.data.astype(np.float32))
+        self._save_array("idf.npy", vectorizer.idf)
+
+        terms = sorted(vectorizer.vocabulary, key=vectorizer.vocabulary.get)
+        tmp_path = self._path("index_meta.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"terms": terms, "doc_ids": doc_ids, "built_at": built_at}, f)
+        os.replace(tmp_path, self._path("index_meta.json"))
+
+        with self._lock:
+            self._load_index()
+            # Changes made while building are not in the new index: keep
+            # them in the delta and mask their old versions
+            self._changed = {jd_id: change for jd_id, change in self._changed.items() if change > seq}
+            for jd_id in list(self._delta):
+                if jd_id not in self._changed:
+                    self._remove_from_delta(jd_id)
+            for jd_id in self._changed:
+                if jd_id in self._doc_index:
+                    self._live[self._doc_index[jd_id]] = 0.0
+
+    def _maybe_merge(self):
+        """Start a background rebuild once the delta has grown past max_delta."""
+        with self._lock:
+            if self._merging or self._idf is None or len(self._changed) < self.max_delta:
+                return
+            self._merging = True
+        threading.Thread(target=self._merge, name="jd-index-merge", daemon=True).start()
+
+    def _merge(self):
+        try:
+            self.rebuild()
+        finally:
+            with self._lock:
+                self._merging = False
+
+    # Delta segment (callers hold _lock)
+
+    def _term_idf(self, term: str) -> float:
+        idx = self._vocabulary.get(term)
+        if idx is not None:
+            return float(self._idf[idx])
+        # Smoothed IDF of a term no indexed posting contains
+        return math.log(1 + len(self._doc_ids)) + 1
+
+    def _record_change(self, jd_id: str, tokens: Optional[List[str]]):
+        """Tombstone the indexed version of a posting; index `tokens` (None for a delete) in the delta."""
+        self._seq += 1
+        self._changed[jd_id] = self._seq
+        if jd_id in self._doc_index:
+            self._live[self._doc_index[jd_id]] = 0.0
+        self._remove_from_delta(jd_id)
+        if tokens is None or self._idf is None:
+            return  # Without a built index the next search rebuilds from SQLite
+
+        weights = {
+            term: (1 + math.log(count)) * self._term_idf(term)
+            for term, count in Counter(tokens).items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1
+        vector = {term: weight / norm for term, weight in weights.items()}
+        self._delta[jd_id] = vector
+        for term, weight in vector.items():
+            self._delta_postings.setdefault(term, {})[jd_id] = weight
+
+    def _remove_from_delta(self, jd_id: str):
+        for term in self._delta.pop(jd_id, {}):
+            postings = self._delta_postings[term]
+            del postings[jd_id]
+            if not postings:
+                del self._delta_postings[term]
+
+    # Queries
+
+    def _query_vector(self, tokens: List[str]) -> Dict[str, float]:
+        counts = Counter(
+            token for token in tokens
+            if token in self._vocabulary or token in self._delta_postings
+        )
+        weights = {
+            term: (1 + math.log(count)) * self._term_idf(term)
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def search(self, resume_text: str, top_n: int = 10) -> List[dict]:
+        """
+        Return the top_n postings by cosine similarity to the resume.
+        Only postings sharing at least one term with the resume are touched.
+        """
+        if self._idf is None:
+            with self._build_lock:
+                # Another search may have built it while we waited
+                if self._idf is None:
+                    self._rebuild()
+
+        tokens = tokenize(resume_text)
+        with self._lock:
+            matches = []
+            query = self._query_vector(tokens)
+
+            if self._doc_ids:
+                scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+                for term, query_weight in query.items():
+                    idx = self._vocabulary.get(term)
+                    if idx is None:
+                        continue
+                    start, end = self._indptr[idx], self._indptr[idx + 1]
+                    # Each document appears at most once per term's postings list
+                    scores[self._docs[start:end]] += self._weights[start:end] * query_weight
+                scores *= self._live
+
+                count = min(top_n, len(scores))
+                top = np.argpartition(-scores, count - 1)[:count]
+                matches = [(self._doc_ids[idx], float(scores[idx])) for idx in top if scores[idx] > 0]
+
+            delta_scores = Counter()
+            for term, query_weight in query.items():
+                for jd_id, weight in self._delta_postings.get(term, {}).items():
+                    delta_scores[jd_id] += weight * query_weight
+            matches += delta_scores.most_common(top_n)
+
+        matches = sorted(matches, key=lambda match: -match[1])[:top_n]
+        results = []
+        for jd_id, score in matches:
+            posting = self.get(jd_id)
+            if posting is None:  # deleted since the search ran
+                continue
+            posting["similarity_score"] = round(score * 100, 2)
+            results.append(posting)
+        return results
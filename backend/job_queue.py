@@ -0,0 +1,539 @@
+# job_queue.py
+import asyncio
+import ipaddress
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import (
+    JOB_QUEUE_SQLITE_PATH, JOB_WORKERS, JOB_POLL_INTERVAL, JOB_MAX_PENDING,
+    JOB_RESULT_TTL_SECONDS, JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, JOB_WEBHOOK_TIMEOUT, JOB_WEBHOOK_ATTEMPTS,
+    JOB_WEBHOOK_ALLOWED_HOSTS, JOB_WEBHOOK_ALLOW_PRIVATE
+)
+from ats_analyzer import ATSAnalyzer
+from jd_analyzer import JDAnalyzer
+from extraction_executor import ExtractionExecutor
+from document_cache import DocumentCache
+from utils import validate_resume_content
+
+JOB_KINDS = ("ats_score", "jd_match", "compare_jds")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+
+class QueueFullError(ValueError):
+    """Raised when JOB_MAX_PENDING jobs are already waiting."""
+
+
+async def check_webhook_url(url: str):
+    """
+    Raise ValueError unless `url` is an http(s) URL on an allowed host that
+    resolves only to public addresses, so callers cannot make the server
+    POST job results to internal services.
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if parts.scheme not in ("http", "https") or not host:
+        raise ValueError("webhook_url must be an http(s) URL")
+    if JOB_WEBHOOK_ALLOWED_HOSTS and not any(
+        host == allowed or host.endswith("." + allowed) for allowed in JOB_WEBHOOK_ALLOWED_HOSTS
+    ):
+        raise ValueError(f"webhook host {host} is not allowed")
+    if JOB_WEBHOOK_ALLOW_PRIVATE:
+        return
+
+    try:
+        addresses = await asyncio.get_running_loop().getaddrinfo(host, parts.port)
+    except OSError:
+        raise ValueError(f"webhook host {host} does not resolve")
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split("%")[0])
+        if getattr(address, "ipv4_mapped", None):
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise ValueError(f"webhook host {host} resolves to a non-public address")
+
+
+def _timestamp(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat() if value else None
+
+
+def _loads(value: Optional[str]):
+    return json.loads(value) if value else None
+
+
+class JobStore:
+    """
+    SQLite-backed job table: the queue itself, status, partial and final
+    results. Claiming a job is a single write transaction that records the
+    claiming worker's owner ID and a lease, so several server processes on
+    one host can share the file. Owners renew their leases while jobs run;
+    a running job whose lease has expired (its process died) is queued
+    again, or failed once it has been claimed max_attempts times.
+    """
+
+    def __init__(self, path: str = JOB_QUEUE_SQLITE_PATH, result_ttl: float = JOB_RESULT_TTL_SECONDS):
+        self.result_ttl = result_ttl
+        self._lock = threading.Lock()
+        # Autocommit; claim() opens its own write transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "priority INTEGER NOT NULL, params TEXT NOT NULL, document BLOB, "
+            "partial TEXT, progress TEXT, result TEXT, error TEXT, "
+            "webhook_url TEXT, webhook_status TEXT, cancel_requested INTEGER NOT NULL DEFAULT 0, "
+            "owner TEXT, lease_expires REAL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        # Files created before attempts were tracked
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "attempts" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created_at)"
+        )
+
+    def submit(self, kind: str, params: dict, document: Optional[bytes] = None,
+               priority: int = 0, webhook_url: Optional[str] = None,
+               max_pending: int = JOB_MAX_PENDING) -> str:
+        """Queue a job and return its ID."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            # Finished jobs are kept for result_ttl so clients can still poll them
+            self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at < ?", (now - self.result_ttl,)
+            )
+            pending = self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = 'queued'"
+            ).fetchone()[0]
+            if pending >= max_pending:
+                raise QueueFullError(f"Job queue is full ({pending} jobs waiting)")
+
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, priority, params, document, webhook_url, created_at) "
+                "VALUES (?, ?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, kind, priority, json.dumps(params), document, webhook_url, now)
+            )
+        return job_id
+
+    def claim(self, owner: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[dict]:
+        """
+        Mark the highest-priority, oldest queued job as running under
+        `owner` and return it.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, kind, params, document FROM jobs WHERE status = 'queued' "
+                    "ORDER BY priority DESC, created_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, lease_expires = ?, started_at = ?, "
+                        "attempts = attempts + 1 WHERE id = ?",
+                        (owner, now + lease_seconds, now, row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if row is None:
+            return None
+        job_id, kind, params, document = row
+        return {"id": job_id, "kind": kind, "params": json.loads(params), "document": document}
+
+    def reclaim_expired(self, max_attempts: int = JOB_MAX_ATTEMPTS) -> List[str]:
+        """
+        Queue running jobs whose lease has expired again, failing those
+        already claimed max_attempts times (a job that keeps killing its
+        worker). Returns the IDs failed here.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                failed = [row[0] for row in self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = 'running' AND COALESCE(lease_expires, 0) < ? "
+                    "AND attempts >= ?",
+                    (now, max_attempts)
+                ).fetchall()]
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, document = NULL "
+                    "WHERE status = 'running' AND COALESCE(lease_expires, 0) < ? AND attempts >= ?",
+                    (f"Job abandoned after {max_attempts} attempts (worker lease expired)", now, now, max_attempts)
+                )
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', owner = NULL, started_at = NULL "
+                    "WHERE status = 'running' AND COALESCE(lease_expires, 0) < ?",
+                    (now,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return failed
+
+    def renew(self, owner: str, job_ids: List[str], lease_seconds: float = JOB_LEASE_SECONDS) -> List[str]:
+        """
+        Extend the leases `owner` holds on running jobs. Returns the IDs
+        among them with a cancellation requested (possibly by another process).
+        """
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" * len(job_ids))
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET lease_expires = ? WHERE owner = ? AND status = 'running' "
+                f"AND id IN ({placeholders})",
+                (time.time() + lease_seconds, owner, *job_ids)
+            )
+            rows = self._conn.execute(
+                f"SELECT id FROM jobs WHERE cancel_requested = 1 AND owner = ? AND status = 'running' "
+                f"AND id IN ({placeholders})",
+                (owner, *job_ids)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def release(self, owner: str) -> int:
+        """
+        Queue `owner`'s running jobs again (on shutdown) without waiting for
+        their leases. An interrupted run does not count as an attempt.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, started_at = NULL, attempts = attempts - 1 "
+                "WHERE status = 'running' AND owner = ?",
+                (owner,)
+            ).rowcount
+
+    def update_partial(self, job_id: str, owner: str, partial: List[dict], progress: dict) -> bool:
+        """Store partial results; returns True if cancellation was requested."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET partial = ?, progress = ? WHERE id = ? AND owner = ?",
+                (json.dumps(partial), json.dumps(progress), job_id, owner)
+            )
+            row = self._conn.execute(
+                "SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return bool(row and row[0])
+
+    def finish(self, job_id: str, owner: str, status: str, result: Optional[dict] = None,
+               error: Optional[str] = None) -> bool:
+        """Record a job's outcome; False if `owner` no longer holds the job."""
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, document = NULL "
+                "WHERE id = ? AND owner = ? AND status = 'running'",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id, owner)
+            ).rowcount == 1
+
+    def request_cancel(self, job_id: str) -> Optional[str]:
+        """
+        Cancel a queued job outright, or flag a running one for its worker.
+        Returns the job's status before the request, or None for an unknown job.
+        """
+        with self._lock:
+            if self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, document = NULL "
+                "WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            ).rowcount:
+                return "queued"
+            self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = 'running'", (job_id,)
+            )
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_webhook_status(self, job_id: str, webhook_status: str):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET webhook_status = ? WHERE id = ?", (webhook_status, job_id)
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Public view of a job (without its input)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, status, priority, progress, partial, result, error, webhook_url, "
+                "webhook_status, cancel_requested, attempts, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        (job_id, kind, status, priority, progress, partial, result, error,
+         webhook_url, webhook_status, cancel_requested, attempts, created_at, started_at, finished_at) = row
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": status,
+            "priority": priority,
+            "progress": _loads(progress),
+            "partial_results": _loads(partial),
+            "result": _loads(result),
+            "error": error,
+            "cancel_requested": bool(cancel_requested),
+            "attempts": attempts,
+            "created_at": _timestamp(created_at),
+            "started_at": _timestamp(started_at),
+            "finished_at": _timestamp(finished_at)
+        }
+        if webhook_url:
+            job["webhook"] = {"url": webhook_url, "status": webhook_status}
+        return job
+
+    def webhook_url(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT webhook_url FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+
+class JobQueue:
+    """
+    Run ATS and JD analyses submitted through /api/jobs in the background.
+
+    Jobs persist in a JobStore; `workers` asyncio tasks claim them in
+    priority order, so submission returns immediately and throughput is
+    bounded by worker capacity rather than by how long clients wait.
+    Extraction of uploaded files also happens here, not in the request.
+    """
+
+    def __init__(
+        self,
+        ats_analyzer: ATSAnalyzer,
+        jd_analyzer: JDAnalyzer,
+        extraction_executor: ExtractionExecutor,
+        document_cache: DocumentCache,
+        store: Optional[JobStore] = None,
+        workers: int = JOB_WORKERS
+    ):
+        self.ats_analyzer = ats_analyzer
+        self.jd_analyzer = jd_analyzer
+        self.extraction_executor = extraction_executor
+        self.document_cache = document_cache
+        self.store = store or JobStore()
+        self.workers = workers
+        # Identifies this process's claims in the shared store
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._tasks = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelled = set()  # Running jobs cancelled by a client, not by shutdown
+        self._wake = None
+
+    def start(self):
+        """Start the workers and lease heartbeat (from within the event loop); idempotent."""
+        if self._tasks:
+            return
+        self._wake = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._heartbeat()))
+
+    async def stop(self):
+        """
+        Stop the workers. Jobs they interrupted go back to the queue for
+        the next start() or another process.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self.store.release, self.owner)
+
+    async def submit(self, kind: str, params: dict, document: Optional[bytes] = None,
+                     priority: int = 0, webhook_url: Optional[str] = None) -> dict:
+        """Queue a job; raises QueueFullError when the backlog is at its limit."""
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = await asyncio.to_thread(self.store.submit, kind, params, document, priority, webhook_url)
+        self.start()
+        self._wake.set()
+        return await self.get(job_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[dict]:
+        """Cancel a queued or running job. Returns the job, or None if unknown."""
+        previous = await asyncio.to_thread(self.store.request_cancel, job_id)
+        if previous is None:
+            return None
+
+        if previous == "queued":
+            # Only the call that cancelled the job reports it
+            asyncio.create_task(self._notify(job_id))
+        elif previous == "running" and job_id in self._running:
+            self._cancel_running(job_id)
+        return await self.get(job_id)
+
+    def _cancel_running(self, job_id: str):
+        """Cancel a job this process is running (its _execute task and everything under it)."""
+        if job_id in self._cancelled:
+            return
+        self._cancelled.add(job_id)
+        self._running[job_id].cancel()
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers if self._tasks else 0,
+            "running_here": len(self._running),
+            "jobs": self.store.counts()
+        }
+
+    async def _worker(self):
+        while True:
+            job = await asyncio.to_thread(self.store.claim, self.owner)
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                continue
+
+            task = asyncio.create_task(self._execute(job))
+            self._running[job["id"]] = task
+            try:
+                await task
+            except asyncio.CancelledError:
+                # Shutdown: stop the job too; stop() requeues it
+                task.cancel()
+                raise
+            finally:
+                self._running.pop(job["id"], None)
+                self._cancelled.discard(job["id"])
+
+    async def _heartbeat(self):
+        """
+        Renew leases on running jobs, apply cancellations made elsewhere and
+        reclaim jobs whose owner stopped renewing.
+        """
+        while True:
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            for job_id in await asyncio.to_thread(self.store.renew, self.owner, list(self._running)):
+                if job_id in self._running:
+                    self._cancel_running(job_id)
+            for job_id in await asyncio.to_thread(self.store.reclaim_expired):
+                asyncio.create_task(self._notify(job_id))
+
+    async def _execute(self, job: dict):
+        job_id = job["id"]
+        try:
+            result = await self._run(job)
+        except asyncio.CancelledError:
+            if job_id not in self._cancelled:
+                raise
+            finished = await asyncio.to_thread(self.store.finish, job_id, self.owner, "cancelled")
+        except Exception as e:
+            finished = await asyncio.to_thread(self.store.finish, job_id, self.owner, "failed", error=str(e))
+        else:
+            finished = await asyncio.to_thread(self.store.finish, job_id, self.owner, "succeeded", result=result)
+
+        # Not finished here if the lease lapsed and another worker took over
+        if finished:
+            await self._notify(job_id)
+
+    async def _run(self, job: dict) -> dict:
+        params = job["params"]
+        resume_id, resume_text = await self._resume(job)
+        tier = params.get("tier")
+
+        if job["kind"] == "ats_score":
+            result = await self.ats_analyzer.analyze_async(resume_text, params.get("mode"), tier)
+        elif job["kind"] == "jd_match":
+            result = await self.jd_analyzer.analyze_async(resume_text, params["jd_text"], tier)
+        else:
+            partial, writes = [], []
+            write_lock = asyncio.Lock()  # FIFO, so snapshots are stored in order
+
+            async def save_partial(snapshot: List[dict], progress: dict):
+                async with write_lock:
+                    if await asyncio.to_thread(self.store.update_partial, job["id"], self.owner, snapshot, progress):
+                        # Cancelled through another process sharing the store
+                        self._cancel_running(job["id"])
+
+            def on_result(entry: dict, total: int):
+                # Runs inside the per-JD tasks, so cancel the whole job, not the caller
+                if job["id"] in self._cancelled:
+                    return
+                partial.append(entry)
+                progress = {"completed": len(partial), "total": total}
+                writes.append(asyncio.create_task(save_partial(list(partial), progress)))
+
+            result = await self.jd_analyzer.compare_multiple_jds_async(
+                resume_text, params["jd_texts"], top_k=params.get("top_k"), tier=tier,
+                on_result=on_result
+            )
+            await asyncio.gather(*writes)
+
+        if resume_id:
+            result["resume_id"] = resume_id
+        return result
+
+    async def _resume(self, job: dict) -> tuple:
+        """Return (resume_id or None, validated resume text) for a job."""
+        params = job["params"]
+        resume_id = params.get("resume_id")
+        if job["document"] is not None:
+            resume_id, resume_text = await self.extraction_executor.extract_document(
+                job["document"], params["file_extension"]
+            )
+        elif resume_id:
+            document = self.document_cache.get(resume_id)
+            if document is None:
+                raise ValueError("Unknown or expired resume_id; upload the file again")
+            resume_text = document["text"]
+        else:
+            resume_text = params["resume_text"]
+
+        if not validate_resume_content(resume_text):
+            raise ValueError("Resume is too short or missing key sections")
+        return resume_id, resume_text
+
+    async def _notify(self, job_id: str):
+        """POST the finished job to its webhook, if any, with a few retries."""
+        url = await asyncio.to_thread(self.store.webhook_url, job_id)
+        if not url:
+            return
+
+        # Checked again at delivery, in case the host now resolves elsewhere
+        try:
+            await check_webhook_url(url)
+        except ValueError as e:
+            await asyncio.to_thread(self.store.set_webhook_status, job_id, f"rejected: {e}")
+            return
+
+        job = await self.get(job_id)
+        webhook_status = "failed"
+        async with httpx.AsyncClient(timeout=JOB_WEBHOOK_TIMEOUT) as client:
+            for attempt in range(JOB_WEBHOOK_ATTEMPTS):
+                if attempt:
+                    await asyncio.sleep(2 ** (attempt - 1))
+                try:
+                    response = await client.post(url, json=job)
+                    response.raise_for_status()
+                    webhook_status = "delivered"
+                    break
+                except httpx.HTTPError as e:
+                    webhook_status = f"failed: {str(e) or type(e).__name__}"
+        await asyncio.to_thread(self.store.set_webhook_status, job_id, webhook_status)
@@ -0,0 +1,131 @@
+# keyword_matcher.py
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Iterable, Tuple, Union
+
+from resume_parser import ParsedResume
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """
+    Compile words into a trie-shaped regex, e.g. ["aws", "aws certified", "azure"]
+    becomes "a(?:ws(?:\\ certified)?|zure)". Matching cost depends on the
+    keyword length, not on how many keywords there are.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node: dict) -> str:
+        is_end = "" in node
+        branches = [
+            re.escape(char) + build(child)
+            for char, child in sorted(node.items())
+            if char != ""
+        ]
+        if not branches:
+            return ""
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+
+        body = "(?:" + "|".join(branches) + ")"
+        # Greedy optional: prefer the longest keyword, fall back to the prefix
+        return body + "?" if is_end else body
+
+    return build(trie)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordScan:
+    """Result of a single scan: per-keyword counts plus per-group views."""
+
+    def __init__(self, groups: Dict[str, List[str]], counts: Counter, word_count: int):
+        self.groups = groups
+        self.counts = counts
+        self.word_count = word_count
+
+    def found(self, group: str) -> list:
+        """Keywords of `group` present in the text, in configured order."""
+        return [
+            keyword for keyword in dict.fromkeys(self.groups[group])
+            if self.counts[keyword.lower()]
+        ]
+
+    def count(self, group: str) -> int:
+        """Total keyword occurrences for `group`."""
+        return sum(self.counts[keyword.lower()] for keyword in self.groups[group])
+
+    def density(self, groups: Iterable[str]) -> float:
+        """Keyword occurrences across `groups` per 100 words."""
+        if self.word_count == 0:
+            return 0
+        keyword_count = sum(self.count(group) for group in groups)
+        return (keyword_count / self.word_count) * 100
+
+
+class KeywordMatcher:
+    """
+    Single-pass keyword engine.
+
+    All keywords are compiled once into one trie-shaped regex wrapped in a
+    lookahead, so a single scan over the lowercased text reports every
+    occurrence, including keywords that overlap (e.g. "aws" inside
+    "aws certified"). Keywords must not be preceded or followed by a word
+    character, which also lets symbols like "c++" match at a word end.
+    """
+
+    def __init__(self, keyword_groups: Dict[str, List[str]]):
+        self.groups = {name: list(keywords) for name, keywords in keyword_groups.items()}
+
+        keywords = {
+            keyword.lower()
+            for group in self.groups.values()
+            for keyword in group
+        }
+        self._pattern = re.compile(
+            r"(?=(?<!\w)(" + _trie_pattern(keywords) + r")(?!\w))"
+        )
+
+        # The regex reports the longest keyword per start offset; also credit
+        # shorter keywords that are whole-word prefixes of it.
+        self._implied = {
+            keyword: [
+                prefix for prefix in keywords
+                if len(prefix) < len(keyword)
+                and keyword.startswith(prefix)
+                and not _is_word_char(keyword[len(prefix)])
+            ]
+            for keyword in keywords
+        }
+
+    def scan(self, text: Union[str, ParsedResume]) -> KeywordScan:
+        """
+        Count every keyword occurrence in one pass over `text`. A
+        ParsedResume supplies its already lowercased text and word count.
+        """
+        if isinstance(text, ParsedResume):
+            lowered, word_count = text.lower, text.word_count
+        else:
+            lowered, word_count = text.lower(), len(text.split())
+
+        counts = Counter()
+        for match in self._pattern.finditer(lowered):
+            keyword = match.group(1)
+            counts[keyword] += 1
+            for prefix in self._implied[keyword]:
+                counts[prefix] += 1
+
+        return KeywordScan(self.groups, counts, word_count)
+
+
+@lru_cache(maxsize=32)
+def get_keyword_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    """Return a cached matcher for a flat keyword list."""
+    return KeywordMatcher({"keywords": list(keywords)})
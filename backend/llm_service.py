@@ -1,8 +1,81 @@
 # llm_service.py
+import asyncio
+import time
 import requests
+import httpx
 import json
-from config import OPENROUTER_API_KEY, OPENROUTER_BASE_URL, LLM_MODEL
+from typing import AsyncIterator, Tuple, Any, Optional, List, Union
+from pydantic import ValidationError
+from urllib.parse import urlparse
+from config import (
+    OPENROUTER_API_KEY, OPENROUTER_BASE_URL, LLM_MODEL,
+    LLM_REQUEST_TIMEOUT, LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_MAX_CONCURRENCY_PER_HOST, LLM_RATE_LIMIT_PER_SECOND, LLM_RATE_LIMIT_BURST,
+    PROMPT_COMPACTION_ENABLED, RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET,
+    LLM_TEMPERATURE, STRUCTURED_OUTPUT_TEMPERATURE, STRUCTURED_OUTPUT_RETRIES,
+    ATS_MAX_TOKENS, JD_MATCH_MAX_TOKENS
+)
 from utils import extract_json_from_text
+from prompt_compactor import compact_resume, compact_jd, estimate_tokens
+from prompt_builder import Prompt, as_messages, prompt_layout, resume_prompt
+from streaming_json import IncrementalJSONParser
+from schemas import (
+    ATSScoreResult, JDMatchResult, JDBatchMatchItem,
+    ATS_RESPONSE_FORMAT, JD_MATCH_RESPONSE_FORMAT, JD_BATCH_MATCH_RESPONSE_FORMAT
+)
+from resilience import (
+    LLMAPIError, CircuitOpenError, ResilientCaller, parse_retry_after, settle_permanent_error
+)
+from model_router import ModelRouter
+from metrics import LLM_IN_FLIGHT, stage_timer
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+def _api_error(error: httpx.HTTPError) -> LLMAPIError:
+    """Classify an httpx failure as a retryable or permanent LLMAPIError."""
+    message = f"Error calling LLM API: {str(error)}"
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return LLMAPIError(
+            message,
+            status_code=status,
+            retryable=status in RETRYABLE_STATUS_CODES,
+            retry_after=parse_retry_after(error.response.headers.get("Retry-After"))
+        )
+    # Timeouts and connection failures are transient
+    return LLMAPIError(message, retryable=isinstance(error, httpx.TransportError))
+
+
+class AsyncRateLimiter:
+    """Token-bucket limiter shared by every async LLM call."""
+    
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a request token is available."""
+        if self.rate <= 0:
+            return
+        
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                
+                await asyncio.sleep((1 - self._tokens) / self.rate)
 
 
 class LLMService:
@@ -15,71 +88,569 @@ class LLMService:
         
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable not set")
+        
+        # Keep-alive pools: one for the blocking path, one for the async path.
+        # The async client is created lazily so it binds to the running loop.
+        self._session = requests.Session()
+        self._async_client = None
+        self._host_semaphores = {}
+        self.rate_limiter = AsyncRateLimiter(LLM_RATE_LIMIT_PER_SECOND, LLM_RATE_LIMIT_BURST)
+        self.structured_stats = {"calls": 0, "invalid_responses": 0, "retries": 0}
+        self.router = ModelRouter()
+        # One breaker/latency tracker per model so a degraded model fails
+        # fast and its fallback takes over
+        self._resilience = {}
     
-    def call_llm(self, prompt: str, max_tokens: int = 2000) -> str:
-        """
-        Make a call to the OpenRouter LLM API.
-        """
-        headers = {
+    def _headers(self) -> dict:
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
-        
+    
+    def _build_payload(self, prompt: Union[str, Prompt], max_tokens: int,
+                       response_format: Optional[dict] = None, model: Optional[str] = None) -> dict:
+        model = model or self.model
         payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
+            "model": model,
+            "messages": as_messages(prompt, model),
             "max_tokens": max_tokens,
-            "temperature": 0.7
+            "temperature": STRUCTURED_OUTPUT_TEMPERATURE if response_format else LLM_TEMPERATURE
         }
+        if response_format:
+            payload["response_format"] = response_format
+        return payload
+    
+    @staticmethod
+    def _parse_completion(result: dict) -> str:
+        if "choices" in result and len(result["choices"]) > 0:
+            return result["choices"][0]["message"]["content"]
+        raise ValueError("Unexpected API response format")
+    
+    def _resilience_for(self, model: str) -> ResilientCaller:
+        caller = self._resilience.get(model)
+        if caller is None:
+            caller = self._resilience[model] = ResilientCaller()
+        return caller
+    
+    def resilience_stats(self) -> dict:
+        return {model: caller.stats() for model, caller in self._resilience.items()}
+    
+    def call_llm(self, prompt: Union[str, Prompt], max_tokens: int = 2000, response_format: Optional[dict] = None,
+                 analysis: str = "", tier: Optional[str] = None, fallback: Optional[dict] = None) -> str:
+        """
+        Make a call to the OpenRouter LLM API, falling back along the
+        routed model chain when a model fails. If a fallback model answers,
+        `fallback` (when given) receives {"fallback_model": model}.
+        """
+        error = None
+        for position, model in enumerate(self.router.route(analysis, estimate_tokens(str(prompt)), tier)):
+            started = time.monotonic()
+            try:
+                response = self._session.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self._headers(),
+                    json=self._build_payload(prompt, max_tokens, response_format, model),
+                    timeout=LLM_REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
+                result = response.json()
+            
+            except requests.exceptions.RequestException as e:
+                self.router.record(model, 0, failed=True)
+                error = ValueError(f"Error calling LLM API: {str(e)}")
+                continue
+            except json.JSONDecodeError:
+                raise ValueError("Invalid JSON response from API")
+            
+            self.router.record(model, time.monotonic() - started, result.get("usage"),
+                               layout=prompt_layout(prompt, analysis))
+            self._note_fallback(fallback, position, model)
+            return self._parse_completion(result)
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=30
+        raise error
+    
+    @staticmethod
+    def _note_fallback(fallback: Optional[dict], position: int, model: str):
+        if fallback is not None and position:
+            fallback["fallback_model"] = model
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS
+                ),
+                timeout=LLM_REQUEST_TIMEOUT
             )
+        return self._async_client
+    
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        """Return the concurrency limiter for the host serving `url`."""
+        host = urlparse(url).netloc
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY_PER_HOST)
+            self._host_semaphores[host] = semaphore
+        return semaphore
+    
+    async def call_llm_async(self, prompt: Union[str, Prompt], max_tokens: int = 2000, response_format: Optional[dict] = None,
+                             analysis: str = "", tier: Optional[str] = None, fallback: Optional[dict] = None) -> str:
+        """
+        Make a non-blocking call to the OpenRouter LLM API.
+        Connections are reused from a shared keep-alive pool; transient
+        failures are retried, slow calls hedged and a failing model
+        short-circuited (see resilience.py) before falling back to the next
+        model in the routed chain (see model_router.py); `fallback` is
+        filled as in call_llm.
+        """
+        with stage_timer("llm_call"):
+            error = None
+            for position, model in enumerate(self.router.route(analysis, estimate_tokens(str(prompt)), tier)):
+                payload = self._build_payload(prompt, max_tokens, response_format, model)
+                started = time.monotonic()
+                try:
+                    result = await self._resilience_for(model).call(lambda: self._post_async(payload))
+                except LLMAPIError as e:
+                    self.router.record(model, 0, failed=True)
+                    error = e
+                    continue
+                
+                self.router.record(model, time.monotonic() - started, result.get("usage"),
+                                   layout=prompt_layout(prompt, analysis))
+                self._note_fallback(fallback, position, model)
+                return self._parse_completion(result)
+            
+            raise error
+    
+    async def _post_async(self, payload: dict) -> dict:
+        """Single upstream attempt; returns the decoded response body."""
+        url = f"{self.base_url}/chat/completions"
+        client = self._get_async_client()
+        
+        await self.rate_limiter.acquire()
+        
+        try:
+            async with self._host_semaphore(url):
+                with LLM_IN_FLIGHT.track_in_progress():
+                    response = await client.post(url, headers=self._headers(), json=payload)
             response.raise_for_status()
             
-            result = response.json()
+            return response.json()
+        
+        except httpx.HTTPError as e:
+            raise _api_error(e)
+        except json.JSONDecodeError:
+            raise ValueError("Invalid JSON response from API")
+    
+    async def stream_llm_async(self, prompt: Union[str, Prompt], max_tokens: int = 2000,
+                               analysis: str = "", tier: Optional[str] = None,
+                               fallback: Optional[dict] = None) -> AsyncIterator[str]:
+        """
+        Stream a completion from the OpenRouter LLM API, yielding content
+        deltas as they arrive (server-sent events). The next model in the
+        chain is tried only if a model fails before sending any content;
+        `fallback` is filled as in call_llm.
+        """
+        error = None
+        for position, model in enumerate(self.router.route(analysis, estimate_tokens(str(prompt)), tier)):
+            started = time.monotonic()
+            streamed = False
+            usage = {}
+            try:
+                async for content in self._stream_model(prompt, max_tokens, model, usage):
+                    streamed = True
+                    yield content
+            except LLMAPIError as e:
+                self.router.record(model, 0, failed=True)
+                if streamed:
+                    raise
+                error = e
+                continue
             
-            if "choices" in result and len(result["choices"]) > 0:
-                message = result["choices"][0]["message"]["content"]
-                return message
-            else:
-                raise ValueError("Unexpected API response format")
+            self.router.record(model, time.monotonic() - started, usage, layout=prompt_layout(prompt, analysis))
+            self._note_fallback(fallback, position, model)
+            return
+        
+        raise error
+    
+    async def _stream_model(self, prompt: Union[str, Prompt], max_tokens: int, model: str,
+                            usage: Optional[dict] = None) -> AsyncIterator[str]:
+        url = f"{self.base_url}/chat/completions"
+        client = self._get_async_client()
+        payload = self._build_payload(prompt, max_tokens, model=model)
+        payload["stream"] = True
+        # The final chunk then carries token usage (including cached tokens)
+        payload["stream_options"] = {"include_usage": True}
         
-        except requests.exceptions.RequestException as e:
-            raise ValueError(f"Error calling LLM API: {str(e)}")
+        # Streams are not retried or hedged (fields may already have been
+        # forwarded), but they respect and feed the circuit breaker
+        breaker = self._resilience_for(model).breaker
+        if not breaker.allow():
+            raise CircuitOpenError("LLM API temporarily unavailable (circuit open)")
+        
+        settled = False
+        try:
+            await self.rate_limiter.acquire()
+            
+            async with self._host_semaphore(url):
+                async with client.stream("POST", url, headers=self._headers(), json=payload) as response:
+                    response.raise_for_status()
+                    
+                    async for line in response.aiter_lines():
+                        # Skip keep-alive comments such as ": OPENROUTER PROCESSING"
+                        if not line.startswith("data:"):
+                            continue
+                        
+                        data = line[len("data:"):].strip()
+                        if data == "[DONE]":
+                            break
+                        
+                        chunk = json.loads(data)
+                        if "error" in chunk:
+                            breaker.record_failure()
+                            settled = True
+                            raise LLMAPIError(f"Error calling LLM API: {chunk['error']}")
+                        if chunk.get("usage") and usage is not None:
+                            usage.update(chunk["usage"])
+                        for choice in chunk.get("choices", []):
+                            content = choice.get("delta", {}).get("content")
+                            if content:
+                                yield content
+            breaker.record_success()
+            settled = True
+        
+        except httpx.HTTPError as e:
+            error = _api_error(e)
+            if error.retryable:
+                breaker.record_failure()
+                settled = True
+            else:
+                settled = settle_permanent_error(breaker, error)
+            raise error
         except json.JSONDecodeError:
             raise ValueError("Invalid JSON response from API")
+        finally:
+            if not settled:
+                # Client disconnected, cancelled or malformed stream
+                breaker.release()
+    
+    async def _stream_fields(self, prompt: Prompt, stats, analysis: str,
+                             tier: Optional[str]) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield top-level result fields as soon as each one is complete."""
+        parser = IncrementalJSONParser()
+        chunks = []
+        emitted = set()
+        malformed = False
+        fallback = {}
+        
+        async for delta in self.stream_llm_async(prompt, analysis=analysis, tier=tier, fallback=fallback):
+            chunks.append(delta)
+            if malformed:
+                continue
+            try:
+                fields = parser.feed(delta)
+            except json.JSONDecodeError:
+                # Recover from the full text once the stream ends
+                malformed = True
+                continue
+            for key, value in fields:
+                emitted.add(key)
+                yield key, value
+        
+        if malformed or not parser.complete:
+            for key, value in extract_json_from_text("".join(chunks)).items():
+                if key not in emitted:
+                    yield key, value
+        
+        if stats:
+            yield "prompt_compaction", stats
+        for key, value in fallback.items():
+            yield key, value
     
-    def analyze_ats_score(self, resume_text: str, prompt_template: str) -> dict:
+    def stream_ats_score_async(self, resume_text: str, prompt_template: str,
+                               tier: Optional[str] = None) -> AsyncIterator[Tuple[str, Any]]:
         """
-        Analyze resume for ATS score using LLM.
+        Streaming variant of analyze_ats_score yielding (field, value) pairs.
+        """
+        prompt, stats = self._ats_prompt(resume_text, prompt_template)
+        return self._stream_fields(prompt, stats, "ats", tier)
+    
+    def stream_jd_match_async(self, resume_text: str, jd_text: str, prompt_template: str,
+                              tier: Optional[str] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of analyze_jd_match yielding (field, value) pairs.
+        """
+        prompt, stats = self._jd_prompt(resume_text, jd_text, prompt_template)
+        return self._stream_fields(prompt, stats, "jd_match", tier)
+    
+    async def aclose(self):
+        """Close pooled connections."""
+        self._session.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+    
+    @staticmethod
+    def _ats_prompt(resume_text: str, prompt_template: str) -> tuple:
+        """Build the ATS prompt; returns (prompt, compaction stats or None)."""
+        stats = None
+        if PROMPT_COMPACTION_ENABLED:
+            resume_text, stats = compact_resume(resume_text, RESUME_TOKEN_BUDGET)
+        
+        return resume_prompt(prompt_template, resume_text), stats
+    
+    @staticmethod
+    def _jd_prompt(resume_text: str, jd_text: str, prompt_template: str) -> tuple:
+        """Build the JD-match prompt; returns (prompt, compaction stats or None)."""
+        stats = None
+        if PROMPT_COMPACTION_ENABLED:
+            resume_text, resume_stats = compact_resume(resume_text, RESUME_TOKEN_BUDGET)
+            jd_text, jd_stats = compact_jd(jd_text, JD_TOKEN_BUDGET)
+            stats = {
+                key: resume_stats[key] + jd_stats[key]
+                for key in ("original_tokens", "compacted_tokens", "tokens_saved",
+                            "duplicate_lines_removed")
+            }
+            stats["truncated"] = resume_stats["truncated"] or jd_stats["truncated"]
+        
+        return resume_prompt(prompt_template, resume_text, [jd_text]), stats
+    
+    @staticmethod
+    def _jd_batch_prompt(resume_text: str, jd_texts: List[str], prompt_template: str) -> Prompt:
+        """Build a multi-JD prompt with numbered job descriptions."""
+        if PROMPT_COMPACTION_ENABLED:
+            resume_text, _ = compact_resume(resume_text, RESUME_TOKEN_BUDGET)
+            jd_texts = [compact_jd(jd_text, JD_TOKEN_BUDGET)[0] for jd_text in jd_texts]
+        
+        return resume_prompt(prompt_template, resume_text, jd_texts, numbered=True)
+    
+    @staticmethod
+    def plan_jd_batches(resume_text: str, jd_texts: List[str], prompt_template: str,
+                        token_budget: int, max_batch_size: int) -> List[List[int]]:
         """
-        prompt = f"{prompt_template}\n\nResume:\n{resume_text}"
+        Group JDs (by position in jd_texts) so that each batch prompt stays
+        within token_budget, counting the template and resume once, and
+        holds at most max_batch_size JDs. Sizes are estimated before
+        compaction, capped at the compaction budgets, so they never
+        undercount. A JD too large to share a prompt gets a group of its own.
+        """
+        def tokens(text: str, budget: int) -> int:
+            estimate = estimate_tokens(text)
+            return min(estimate, budget) if PROMPT_COMPACTION_ENABLED else estimate
         
-        response = self.call_llm(prompt)
-        result = extract_json_from_text(response)
+        available = token_budget - estimate_tokens(prompt_template) - tokens(resume_text, RESUME_TOKEN_BUDGET)
+        groups, group, used = [], [], 0
+        for position, jd_text in enumerate(jd_texts):
+            size = tokens(jd_text, JD_TOKEN_BUDGET)
+            if group and (used + size > available or len(group) >= max_batch_size):
+                groups.append(group)
+                group, used = [], 0
+            group.append(position)
+            used += size
+        if group:
+            groups.append(group)
+        return groups
+    
+    def _parse_batch(self, response: str, count: int, structured: bool) -> List[Optional[dict]]:
+        """
+        Split a multi-JD response into per-JD results, in prompt order.
+        Entries are validated one by one; a JD whose entry is missing or
+        malformed gets None so the caller can retry it on its own.
+        """
+        results = [None] * count
+        with stage_timer("json_parse"):
+            try:
+                items = extract_json_from_text(response).get("r" if structured else "results")
+            except ValueError:
+                items = None
+            if not isinstance(items, list):
+                items = []
+            
+            for item in items:
+                if structured:
+                    try:
+                        result = JDBatchMatchItem.model_validate(item).model_dump()
+                    except ValidationError:
+                        continue
+                    number = result.pop("jd_number")
+                elif isinstance(item, dict) and "overall_match_score" in item:
+                    result = dict(item)
+                    try:
+                        number = int(result.pop("jd", 0))
+                    except (TypeError, ValueError):
+                        continue
+                else:
+                    continue
+                
+                if 1 <= number <= count and results[number - 1] is None:
+                    results[number - 1] = result
         
+        if structured:
+            self.structured_stats["calls"] += 1
+            if None in results:
+                self.structured_stats["invalid_responses"] += 1
+        return results
+    
+    async def analyze_jd_batch_async(self, resume_text: str, jd_texts: List[str], prompt_template: str,
+                                     tier: Optional[str] = None, structured: bool = False) -> List[Optional[dict]]:
+        """
+        Analyze one resume against several JDs in a single LLM call, so the
+        resume tokens are paid once. Returns one result per JD in order;
+        None marks a JD the response did not cover or got wrong.
+        """
+        prompt = self._jd_batch_prompt(resume_text, jd_texts, prompt_template)
+        fallback = {}
+        
+        if structured:
+            response = await self.call_llm_async(
+                prompt, JD_MATCH_MAX_TOKENS * len(jd_texts), JD_BATCH_MATCH_RESPONSE_FORMAT, "jd_match", tier,
+                fallback
+            )
+        else:
+            response = await self.call_llm_async(
+                prompt, 2000 * len(jd_texts), analysis="jd_match", tier=tier, fallback=fallback
+            )
+        return [
+            self._with_stats(result, None, fallback) if result is not None else None
+            for result in self._parse_batch(response, len(jd_texts), structured)
+        ]
+    
+    @staticmethod
+    def _with_stats(result: dict, stats, fallback: Optional[dict] = None) -> dict:
+        if stats:
+            result["prompt_compaction"] = stats
+        if fallback:
+            result.update(fallback)
         return result
     
-    def analyze_jd_match(self, resume_text: str, jd_text: str, prompt_template: str) -> dict:
+    def _finish(self, response: str, stats, fallback: Optional[dict] = None) -> dict:
+        with stage_timer("json_parse"):
+            return self._with_stats(extract_json_from_text(response), stats, fallback)
+    
+    def analyze_ats_score(self, resume_text: str, prompt_template: str, tier: Optional[str] = None) -> dict:
+        """
+        Analyze resume for ATS score using LLM.
+        """
+        prompt, stats = self._ats_prompt(resume_text, prompt_template)
+        
+        fallback = {}
+        response = self.call_llm(prompt, analysis="ats", tier=tier, fallback=fallback)
+        return self._finish(response, stats, fallback)
+    
+    def analyze_jd_match(self, resume_text: str, jd_text: str, prompt_template: str,
+                         tier: Optional[str] = None) -> dict:
         """
         Analyze resume against job description using LLM.
         """
-        prompt = prompt_template.format(
-            resume_content=resume_text,
-            jd_content=jd_text
-        )
+        prompt, stats = self._jd_prompt(resume_text, jd_text, prompt_template)
+        
+        fallback = {}
+        response = self.call_llm(prompt, analysis="jd_match", tier=tier, fallback=fallback)
+        return self._finish(response, stats, fallback)
+    
+    async def analyze_ats_score_async(self, resume_text: str, prompt_template: str, tier: Optional[str] = None) -> dict:
+        """
+        Awaitable variant of analyze_ats_score.
+        """
+        prompt, stats = self._ats_prompt(resume_text, prompt_template)
+        
+        fallback = {}
+        response = await self.call_llm_async(prompt, analysis="ats", tier=tier, fallback=fallback)
+        return self._finish(response, stats, fallback)
+    
+    async def analyze_jd_match_async(self, resume_text: str, jd_text: str, prompt_template: str,
+                                     tier: Optional[str] = None) -> dict:
+        """
+        Awaitable variant of analyze_jd_match.
+        """
+        prompt, stats = self._jd_prompt(resume_text, jd_text, prompt_template)
+        
+        fallback = {}
+        response = await self.call_llm_async(prompt, analysis="jd_match", tier=tier, fallback=fallback)
+        return self._finish(response, stats, fallback)
+    
+    def _parse_structured(self, response: str, model: type) -> Optional[dict]:
+        """Validate a structured response; returns None if it does not conform."""
+        with stage_timer("json_parse"):
+            try:
+                return model.model_validate_json(response).model_dump()
+            except ValidationError:
+                pass
+            
+            # Providers without schema support may still wrap the JSON in prose
+            try:
+                return model.model_validate(extract_json_from_text(response)).model_dump()
+            except (ValueError, ValidationError):
+                self.structured_stats["invalid_responses"] += 1
+                return None
+    
+    def _structured_attempts(self):
+        self.structured_stats["calls"] += 1
+        for attempt in range(STRUCTURED_OUTPUT_RETRIES + 1):
+            if attempt:
+                self.structured_stats["retries"] += 1
+            yield attempt
+    
+    def analyze_ats_score_structured(self, resume_text: str, prompt_template: str, tier: Optional[str] = None) -> dict:
+        """
+        Schema-constrained variant of analyze_ats_score: compact keys, a
+        smaller max_tokens budget and a validated, typed result.
+        """
+        prompt, stats = self._ats_prompt(resume_text, prompt_template)
+        
+        for _ in self._structured_attempts():
+            fallback = {}
+            response = self.call_llm(prompt, ATS_MAX_TOKENS, ATS_RESPONSE_FORMAT, "ats", tier, fallback)
+            result = self._parse_structured(response, ATSScoreResult)
+            if result is not None:
+                return self._with_stats(result, stats, fallback)
+        
+        raise ValueError("LLM returned an invalid structured response")
+    
+    def analyze_jd_match_structured(self, resume_text: str, jd_text: str, prompt_template: str,
+                                    tier: Optional[str] = None) -> dict:
+        """
+        Schema-constrained variant of analyze_jd_match.
+        """
+        prompt, stats = self._jd_prompt(resume_text, jd_text, prompt_template)
+        
+        for _ in self._structured_attempts():
+            fallback = {}
+            response = self.call_llm(prompt, JD_MATCH_MAX_TOKENS, JD_MATCH_RESPONSE_FORMAT, "jd_match", tier, fallback)
+            result = self._parse_structured(response, JDMatchResult)
+            if result is not None:
+                return self._with_stats(result, stats, fallback)
+        
+        raise ValueError("LLM returned an invalid structured response")
+    
+    async def analyze_ats_score_structured_async(self, resume_text: str, prompt_template: str, tier: Optional[str] = None) -> dict:
+        """
+        Awaitable variant of analyze_ats_score_structured.
+        """
+        prompt, stats = self._ats_prompt(resume_text, prompt_template)
+        
+        for _ in self._structured_attempts():
+            fallback = {}
+            response = await self.call_llm_async(prompt, ATS_MAX_TOKENS, ATS_RESPONSE_FORMAT, "ats", tier, fallback)
+            result = self._parse_structured(response, ATSScoreResult)
+            if result is not None:
+                return self._with_stats(result, stats, fallback)
+        
+        raise ValueError("LLM returned an invalid structured response")
+    
+    async def analyze_jd_match_structured_async(self, resume_text: str, jd_text: str, prompt_template: str,
+                                                tier: Optional[str] = None) -> dict:
+        """
+        Awaitable variant of analyze_jd_match_structured.
+        """
+        prompt, stats = self._jd_prompt(resume_text, jd_text, prompt_template)
         
-        response = self.call_llm(prompt)
-        result = extract_json_from_text(response)
+        for _ in self._structured_attempts():
+            fallback = {}
+            response = await self.call_llm_async(prompt, JD_MATCH_MAX_TOKENS, JD_MATCH_RESPONSE_FORMAT, "jd_match", tier, fallback)
+            result = self._parse_structured(response, JDMatchResult)
+            if result is not None:
+                return self._with_stats(result, stats, fallback)
         
-        return result
\ No newline at end of file
+        raise ValueError("LLM returned an invalid structured response")
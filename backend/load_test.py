@@ -0,0 +1,227 @@
+# load_test.py
+"""
+End-to-end load test for the analysis endpoints.
+
+Start the API against the mock LLM, then drive it at a fixed request rate:
+
+    python mock_openrouter.py --port 8001 --latency-ms 800 &
+    OPENROUTER_BASE_URL=http://localhost:8001/api/v1 OPENROUTER_API_KEY=mock python main.py &
+    python load_test.py --rps 20 --duration 60 --mix ats=0.5,jd=0.3,compare=0.2
+
+Requests are sent open-loop (on schedule, whether or not earlier ones have
+finished), and latency is measured from the scheduled send time, so a
+saturated server shows up as growing latency instead of a lower send rate.
+Resumes are synthetic PDF/DOCX files (see synthetic_corpus.py). Use
+RESULT_CACHE_BACKEND=none on the server or --unique here to keep the
+result cache from answering repeats.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from synthetic_corpus import make_document, make_jd_text
+
+ENDPOINTS = {
+    "ats": "/api/ats-score",
+    "jd": "/api/jd-match",
+    "compare": "/api/compare-jds"
+}
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse "ats=0.5,jd=0.3,compare=0.2" into normalized weights."""
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint {name!r}; use {', '.join(ENDPOINTS)}")
+        weights[name] = float(weight or 1)
+    total = sum(weights.values())
+    if total <= 0:
+        raise argparse.ArgumentTypeError("Endpoint weights must be positive")
+    return {name: weight / total for name, weight in weights.items()}
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of sorted values."""
+    if not values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class Corpus:
+    """Pre-generated documents and JDs; --unique makes a fresh file per request."""
+
+    def __init__(self, size: int, formats: List[str], jd_count: int, unique: bool, seed: int):
+        self.rng = random.Random(seed)
+        self.formats = formats
+        self.unique = unique
+        self.documents = [
+            make_document(self.rng, formats[i % len(formats)]) for i in range(size)
+        ]
+        self.jds = [make_jd_text(self.rng) for _ in range(jd_count)]
+
+    def document(self) -> tuple:
+        if self.unique:
+            return make_document(self.rng, self.rng.choice(self.formats))
+        return self.rng.choice(self.documents)
+
+    def sample_jds(self, count: int) -> List[str]:
+        return self.rng.sample(self.jds, min(count, len(self.jds)))
+
+
+def build_request(endpoint: str, corpus: Corpus, jds_per_compare: int) -> dict:
+    filename, data, _ = corpus.document()
+    content_type = "application/pdf" if filename.endswith(".pdf") else (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
+    form = {}
+    if endpoint == "jd":
+        form["jd_text"] = corpus.sample_jds(1)[0]
+    elif endpoint == "compare":
+        form["jd_texts"] = corpus.sample_jds(jds_per_compare)
+    return {"files": {"file": (filename, data, content_type)}, "data": form}
+
+
+async def send(client: httpx.AsyncClient, endpoint: str, request: dict, scheduled: float) -> dict:
+    try:
+        response = await client.post(ENDPOINTS[endpoint], **request)
+        outcome = str(response.status_code)
+        if response.status_code == 200:
+            body = response.json()
+            # Handlers that catch an exception return (body, 500) as a list
+            if isinstance(body, list) or body.get("status") != "success":
+                outcome = "app_error"
+            else:
+                outcome = "ok"
+    except httpx.TimeoutException:
+        outcome = "timeout"
+    except httpx.HTTPError as e:
+        outcome = type(e).__name__
+    return {"endpoint": endpoint, "outcome": outcome, "latency": time.perf_counter() - scheduled}
+
+
+def summarize(samples: List[dict], elapsed: float) -> dict:
+    latencies = sorted(sample["latency"] for sample in samples)
+    ok = sum(1 for sample in samples if sample["outcome"] == "ok")
+    outcomes = {}
+    for sample in samples:
+        outcomes[sample["outcome"]] = outcomes.get(sample["outcome"], 0) + 1
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "requests": len(samples),
+        "ok": ok,
+        "error_rate": round(1 - ok / len(samples), 4) if samples else None,
+        "throughput_rps": round(ok / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(latencies[-1] if latencies else None),
+            "mean": ms(sum(latencies) / len(latencies) if latencies else None)
+        },
+        "outcomes": outcomes
+    }
+
+
+async def run(args) -> dict:
+    corpus = Corpus(args.corpus_size, args.formats, args.jd_pool, args.unique, args.seed)
+    rng = random.Random(args.seed + 1)
+    names, weights = zip(*args.mix.items())
+    limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        tasks = []
+        started = time.perf_counter()
+        next_send = started
+        while next_send - started < args.duration:
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = rng.choices(names, weights)[0]
+            request = build_request(endpoint, corpus, args.jds_per_compare)
+            tasks.append(asyncio.create_task(send(client, endpoint, request, next_send)))
+            interval = 1 / args.rps
+            next_send += rng.expovariate(1 / interval) if args.poisson else interval
+
+        samples = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    report = {
+        "config": {
+            "base_url": args.base_url, "rps": args.rps, "duration": args.duration,
+            "mix": args.mix, "formats": args.formats, "unique": args.unique
+        },
+        "elapsed_seconds": round(elapsed, 2),
+        "overall": summarize(samples, elapsed),
+        "endpoints": {
+            name: summarize([sample for sample in samples if sample["endpoint"] == name], elapsed)
+            for name in names
+        }
+    }
+    return report
+
+
+def print_report(report: dict):
+    header = f"{'endpoint':<10}{'requests':>9}{'ok':>7}{'err %':>8}{'rps':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(report["endpoints"].items()) + [("overall", report["overall"])]
+    for name, summary in rows:
+        latency = summary["latency_ms"]
+        print(
+            f"{name:<10}{summary['requests']:>9}{summary['ok']:>7}"
+            f"{(summary['error_rate'] or 0) * 100:>8.2f}{summary['throughput_rps'] or 0:>8.2f}"
+            f"{latency['p50'] or 0:>9.1f}{latency['p95'] or 0:>9.1f}{latency['p99'] or 0:>9.1f}"
+        )
+    failures = {k: v for k, v in report["overall"]["outcomes"].items() if k != "ok"}
+    if failures:
+        print(f"failures: {failures}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the resume analyzer API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rps", type=float, default=5.0, help="target request rate")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to keep sending")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("ats=0.5,jd=0.3,compare=0.2"))
+    parser.add_argument("--formats", type=lambda v: v.split(","), default=["pdf", "docx"])
+    parser.add_argument("--corpus-size", type=int, default=50, help="distinct resumes to cycle through")
+    parser.add_argument("--unique", action="store_true", help="generate a new resume for every request")
+    parser.add_argument("--jd-pool", type=int, default=20, help="distinct job descriptions")
+    parser.add_argument("--jds-per-compare", type=int, default=5)
+    parser.add_argument("--poisson", action="store_true", help="exponential inter-arrival times")
+    parser.add_argument("--max-in-flight", type=int, default=200, help="client connection cap")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="also write the report here")
+    parser.add_argument("--max-error-rate", type=float, help="exit non-zero above this error rate")
+    args = parser.parse_args()
+    if args.rps <= 0:
+        parser.error("--rps must be positive")
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    error_rate = report["overall"]["error_rate"] or 0
+    if args.max_error_rate is not None and error_rate > args.max_error_rate:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
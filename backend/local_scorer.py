@@ -0,0 +1,106 @@
+# local_scorer.py
+from typing import Union
+
+from keyword_matcher import KeywordScan
+from resume_parser import ParsedResume, parse_resume
+
+
+class LocalATSScorer:
+    """
+    Deterministic ATS scorer built on keyword and section heuristics.
+
+    Produces the same shape as the LLM result (ats_score, score_breakdown,
+    strengths, weaknesses, suggestions) without a network call.
+    """
+
+    def score(self, resume: Union[str, ParsedResume], scan: KeywordScan) -> dict:
+        """Score a parsed resume using a keyword scan already computed for it."""
+        parsed = resume if isinstance(resume, ParsedResume) else parse_resume(resume)
+        sections = parsed.section_names
+        has_email = bool(parsed.emails)
+        has_phone = bool(parsed.phones)
+        has_profile = bool(parsed.profiles)
+        date_count = len(parsed.dates)
+        bullet_count = len(parsed.bullets)
+
+        line_count = len(parsed.lines)
+        word_count = scan.word_count
+        technical = len(scan.found("technical_skills"))
+        soft = len(scan.found("soft_skills"))
+        certifications = len(scan.found("certifications"))
+
+        strengths, weaknesses, suggestions = [], [], []
+
+        # Format and structure (0-25)
+        core = sections & {"experience", "education", "skills"}
+        format_structure = 5 * len(core)
+        format_structure += 4 if "summary" in sections else 0
+        format_structure += 3 * len(sections & {"projects", "certifications"})
+        format_structure = min(25, format_structure)
+        if len(core) == 3:
+            strengths.append("Includes standard Experience, Education and Skills sections")
+        else:
+            missing = ", ".join(sorted({"experience", "education", "skills"} - core))
+            weaknesses.append(f"Missing standard section headings: {missing}")
+            suggestions.append("Add clearly labelled sections using standard headings")
+        if "summary" not in sections:
+            suggestions.append("Add a short professional summary at the top")
+
+        # Keyword optimization (0-25)
+        keyword_optimization = round(
+            15 * min(technical, 10) / 10 +
+            6 * min(soft, 5) / 5 +
+            4 * min(certifications, 2) / 2
+        )
+        if technical >= 8:
+            strengths.append(f"Strong technical keyword coverage ({technical} skills found)")
+        elif technical < 4:
+            weaknesses.append("Few recognizable technical skill keywords")
+            suggestions.append("List relevant tools and technologies explicitly in a Skills section")
+
+        # Parseability (0-20): penalize garbled or non-text content
+        noise_ratio = parsed.noise_chars / max(len(parsed.text), 1)
+        parseability = max(0, round(20 - noise_ratio * 200 - parsed.long_lines * 2))
+        if parseability >= 16:
+            strengths.append("Text extracts cleanly for ATS parsing")
+        else:
+            weaknesses.append("Extracted text contains unusual characters or unbroken blocks")
+            suggestions.append("Avoid tables, text boxes, images and decorative symbols")
+
+        # Clarity (0-15): concise lines, bullets and dated entries
+        avg_words_per_line = word_count / max(line_count, 1)
+        clarity = 5 if avg_words_per_line <= 20 else 2
+        clarity += min(5, bullet_count // 2)
+        clarity += min(5, date_count)
+        if bullet_count < 4:
+            suggestions.append("Use bullet points to describe responsibilities and achievements")
+
+        # Completeness (0-15): contact details, dates and reasonable length
+        completeness = (
+            (4 if has_email else 0) +
+            (4 if has_phone else 0) +
+            (2 if has_profile else 0) +
+            (3 if date_count >= 2 else 0) +
+            (2 if 300 <= word_count <= 1200 else 0)
+        )
+        if not (has_email and has_phone):
+            weaknesses.append("Contact information is incomplete")
+            suggestions.append("Include an email address and phone number in the header")
+        if date_count < 2:
+            suggestions.append("Add start and end dates for each role and degree")
+
+        score_breakdown = {
+            "format_structure": format_structure,
+            "keyword_optimization": keyword_optimization,
+            "parseability": parseability,
+            "clarity": clarity,
+            "completeness": completeness
+        }
+
+        return {
+            "ats_score": sum(score_breakdown.values()),
+            "score_breakdown": score_breakdown,
+            "strengths": strengths,
+            "weaknesses": weaknesses,
+            "suggestions": suggestions
+        }
@@ -1,20 +1,52 @@
 # main.py
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response
+import io
+import json
 import os
-import tempfile
-from typing import Optional, List
+import time
+import asyncio
+import zipfile
+from typing import Optional, List, Dict, Any, Tuple
+from pydantic import BaseModel, Field
 
+from llm_service import LLMService
+from cache import create_result_cache
+from document_cache import create_document_cache
 from resume_extractor import ResumeExtractor
-from ats_analyzer import ATSAnalyzer
+from extraction_executor import ExtractionExecutor
+from batch_processor import BatchProcessor, documents_from_zip
+from jd_index import JDIndex
+from ats_analyzer import ATSAnalyzer, SCORING_MODES
 from jd_analyzer import JDAnalyzer
+from job_queue import JobQueue, QueueFullError, JOB_KINDS, FINISHED_STATUSES, check_webhook_url
+from resilience import CircuitOpenError
+from model_router import MODEL_TIERS
+from metrics import (
+    HTTP_IN_PROGRESS, HTTP_REQUESTS, HTTP_REQUEST_SECONDS, CACHE_LOOKUPS, CACHE_ENTRIES,
+    CACHE_EVICTIONS, SINGLEFLIGHT_IN_FLIGHT, SINGLEFLIGHT_COALESCED, CIRCUIT_OPEN, JOBS,
+    REGISTRY, render_latest, route_label, stage_timer
+)
 from utils import format_response, validate_resume_content
+from config import (
+    MAX_FILE_SIZE, ALLOWED_EXTENSIONS, UPLOAD_CHUNK_SIZE, BATCH_MAX_ARCHIVE_SIZE,
+    JD_SEARCH_MAX_RERANK
+)
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records serialization time as the response_format stage."""
+    
+    def render(self, content) -> bytes:
+        with stage_timer("response_format"):
+            return super().render(content)
+
 
 app = FastAPI(
     title="AI Resume Analyzer",
     description="Analyze resumes for ATS compatibility and JD matching",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=TimedJSONResponse
 )
 origins = [
     "https://resume-analyser-frontend-8doz.onrender.com",
@@ -30,10 +62,238 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize analyzers
-ats_analyzer = ATSAnalyzer()
-jd_analyzer = JDAnalyzer()
+# Initialize analyzers (sharing one LLM connection pool and result cache)
+llm_service = LLMService()
+result_cache = create_result_cache()
+ats_analyzer = ATSAnalyzer(llm_service, result_cache)
+jd_analyzer = JDAnalyzer(llm_service, result_cache)
 resume_extractor = ResumeExtractor()
+document_cache = create_document_cache()
+extraction_executor = ExtractionExecutor(document_cache=document_cache)
+batch_processor = BatchProcessor(ats_analyzer, extraction_executor)
+jd_index = JDIndex()
+job_queue = JobQueue(ats_analyzer, jd_analyzer, extraction_executor, document_cache)
+
+
+class JDPosting(BaseModel):
+    """A job posting stored in the server-side JD index."""
+    id: Optional[str] = None
+    title: str = ""
+    text: str = Field(..., min_length=200)
+    metadata: Dict[str, Any] = {}
+
+
+class JDPostingBatch(BaseModel):
+    jds: List[JDPosting]
+
+
+# Allowance for the non-file form fields sent alongside an upload
+FORM_FIELDS_ALLOWANCE = 1024 * 1024
+
+
+def _too_large_detail(max_size: int) -> str:
+    return f"File too large. Maximum size is {max_size // (1024 * 1024)}MB"
+
+
+@app.middleware("http")
+async def reject_oversized_uploads(request, call_next):
+    """
+    Reject multipart requests whose declared Content-Length is over the upload
+    limit before the form is parsed (and spooled to disk).
+    """
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        max_size = BATCH_MAX_ARCHIVE_SIZE if request.url.path == "/api/batch/ats-score" else MAX_FILE_SIZE
+        try:
+            declared = int(request.headers.get("content-length", ""))
+        except ValueError:
+            declared = None  # chunked; read_upload still enforces the limit
+        if declared is not None and declared > max_size + FORM_FIELDS_ALLOWANCE:
+            return JSONResponse(
+                status_code=413,
+                content=format_response("error", error=_too_large_detail(max_size))
+            )
+    return await call_next(request)
+
+
+async def read_upload(file: UploadFile, max_size: int = MAX_FILE_SIZE) -> bytearray:
+    """
+    Read an upload in chunks, stopping once it exceeds max_size.
+    Returns the buffer itself (not a bytes copy); callers only hash or wrap it.
+    """
+    too_large = HTTPException(status_code=413, detail=_too_large_detail(max_size))
+    if file.size is not None and file.size > max_size:
+        raise too_large
+    
+    buffer = bytearray()
+    with stage_timer("upload_read"):
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            
+            if len(buffer) + len(chunk) > max_size:
+                raise too_large
+            buffer.extend(chunk)
+    
+    return buffer
+
+
+async def extract_resume_from_upload(file: UploadFile) -> Tuple[str, str]:
+    """
+    Validate an uploaded resume and extract its text in memory.
+    Returns (resume_id, text); repeat uploads are served from the document cache.
+    """
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail="Unsupported file format. Supported: PDF, DOCX, DOC"
+        )
+    
+    content = await read_upload(file)
+    return await extraction_executor.extract_document(content, file_extension)
+
+
+async def resolve_resume_text(
+    file: Optional[UploadFile],
+    resume_text: Optional[str],
+    resume_id: Optional[str] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Return (validated resume text, resume_id) from an upload, a resume_id
+    handle from an earlier upload, or the submitted text.
+    """
+    if not file and not resume_text and not resume_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Either 'file', 'resume_id' or 'resume_text' must be provided"
+        )
+    
+    if file:
+        resume_id, resume_text = await extract_resume_from_upload(file)
+    elif resume_id:
+        document = document_cache.get(resume_id)
+        if document is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Unknown or expired resume_id; upload the file again"
+            )
+        resume_text = document["text"]
+    
+    with stage_timer("validation"):
+        is_valid = validate_resume_content(resume_text)
+    if not is_valid:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume is too short or missing key sections. Minimum 500 characters required."
+        )
+    
+    return resume_text, resume_id
+
+
+def with_resume_id(result: dict, resume_id: Optional[str]) -> dict:
+    """Attach the document handle so clients can skip re-uploading."""
+    if resume_id:
+        result["resume_id"] = resume_id
+    return result
+
+
+def sse_response(events, resume_id: Optional[str] = None) -> StreamingResponse:
+    """
+    Serve analyzer events as Server-Sent Events. Field events are pushed as
+    soon as they complete; the final event carries the formatted response.
+    """
+    async def stream():
+        try:
+            async for event, data in events:
+                if event == "result":
+                    data = format_response("success", with_resume_id(data, resume_id))
+                yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+        except Exception as e:
+            data = format_response("error", error=str(e))
+            yield f"event: error\ndata: {json.dumps(data)}\n\n"
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def validate_scoring_mode(mode: Optional[str]):
+    """Reject unknown ATS scoring modes with a 400."""
+    if mode is not None and mode not in SCORING_MODES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid mode. Supported: {', '.join(SCORING_MODES)}"
+        )
+
+
+def validate_model_tier(tier: Optional[str]):
+    """Reject unknown model tiers with a 400."""
+    if tier is not None and tier not in MODEL_TIERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid tier. Supported: {', '.join(MODEL_TIERS)}"
+        )
+
+
+def collect_metrics():
+    """Mirror cache, single-flight, breaker and job queue state into /metrics at scrape time."""
+    caches = {"document": document_cache.stats()}
+    if result_cache:
+        caches["result"] = result_cache.stats()
+    for name, stats in caches.items():
+        CACHE_LOOKUPS.set(stats["hits"], cache=name, result="hit")
+        CACHE_LOOKUPS.set(stats["misses"], cache=name, result="miss")
+        CACHE_ENTRIES.set(stats["entries"], cache=name)
+        CACHE_EVICTIONS.set(stats["evictions"], cache=name)
+    
+    for name, analyzer in (("ats", ats_analyzer), ("jd_match", jd_analyzer)):
+        stats = analyzer.in_flight.stats()
+        SINGLEFLIGHT_IN_FLIGHT.set(stats["in_flight"], analysis=name)
+        SINGLEFLIGHT_COALESCED.set(stats["coalesced"], analysis=name)
+    
+    for model, stats in llm_service.resilience_stats().items():
+        CIRCUIT_OPEN.set(0 if stats["circuit_state"] == "closed" else 1, model=model)
+    
+    counts = job_queue.store.counts()
+    for status in ("queued", "running") + FINISHED_STATUSES:
+        JOBS.set(counts.get(status, 0), status=status)
+
+
+REGISTRY.on_collect(collect_metrics)
+
+
+@app.middleware("http")
+async def record_request_metrics(request, call_next):
+    """Count requests and time them per route template."""
+    started = time.perf_counter()
+    status = 500
+    with HTTP_IN_PROGRESS.track_in_progress():
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            route = route_label(request.scope)
+            HTTP_REQUESTS.inc(method=request.method, route=route, status=str(status))
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route=route)
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    """Start the background job workers (and requeue jobs interrupted by a restart)."""
+    job_queue.start()
+
+
+@app.on_event("shutdown")
+async def release_resources():
+    """Stop job workers, then release pooled LLM connections and extraction workers."""
+    await job_queue.stop()
+    await llm_service.aclose()
+    extraction_executor.shutdown()
 
 
 @app.get("/")
@@ -44,91 +304,126 @@ def read_root():
         "version": "1.0.0",
         "endpoints": {
             "ats_score": "/api/ats-score",
+            "ats_score_stream": "/api/ats-score/stream",
             "jd_match": "/api/jd-match",
+            "jd_match_stream": "/api/jd-match/stream",
             "compare_jds": "/api/compare-jds",
-            "health": "/health"
+            "batch_ats_score": "/api/batch/ats-score",
+            "jds": "/api/jds",
+            "jd_search": "/api/jds/search",
+            "jobs": "/api/jobs",
+            "health": "/health",
+            "metrics": "/metrics"
         }
     }
 
 
+@app.get("/metrics")
+def metrics():
+    """Prometheus metrics: stage latencies, LLM tokens/cost, caches and concurrency."""
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/health")
 def health_check():
     """Health check endpoint."""
-    return format_response("success", {"status": "healthy"})
+    data = {
+        "status": "healthy",
+        "in_flight": {
+            "ats": ats_analyzer.in_flight.stats(),
+            "jd_match": jd_analyzer.in_flight.stats()
+        }
+    }
+    if result_cache:
+        data["result_cache"] = result_cache.stats()
+    data["document_cache"] = document_cache.stats()
+    data["extraction"] = extraction_executor.stats()
+    data["structured_output"] = llm_service.structured_stats
+    data["llm_resilience"] = llm_service.resilience_stats()
+    data["llm_models"] = llm_service.router.stats_dict()
+    data["jobs"] = job_queue.stats()
+    return format_response("success", data)
 
 
 @app.post("/api/ats-score")
 async def analyze_ats_score(
     file: Optional[UploadFile] = File(None),
-    resume_text: Optional[str] = Form(None)
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    mode: Optional[str] = Form(None),
+    tier: Optional[str] = Form(None)
 ):
     """
     Analyze resume for ATS compatibility.
     
-    Either upload a file (PDF, DOCX) or provide resume text.
+    Either upload a file (PDF, DOCX), pass the resume_id returned for an
+    earlier upload, or provide resume text.
+    Optional mode: "llm", "fast" (local score only) or "hybrid".
+    Optional tier: "fast", "balanced" or "accurate" model tier.
     Returns ATS score, breakdown, strengths, weaknesses, and suggestions.
     """
     try:
-        # Validate input
-        if not file and not resume_text:
-            raise HTTPException(
-                status_code=400,
-                detail="Either 'file' or 'resume_text' must be provided"
-            )
+        validate_scoring_mode(mode)
+        validate_model_tier(tier)
         
-        # Extract resume text
-        if file:
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            
-            if file_extension not in [".pdf", ".docx", ".doc"]:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unsupported file format. Supported: PDF, DOCX, DOC"
-                )
-            
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-                content = await file.read()
-                tmp_file.write(content)
-                tmp_path = tmp_file.name
-            
-            try:
-                resume_text = resume_extractor.extract_from_file(tmp_path)
-            finally:
-                os.unlink(tmp_path)
-        
-        # Validate resume content
-        if not validate_resume_content(resume_text):
-            raise HTTPException(
-                status_code=400,
-                detail="Resume is too short or missing key sections. Minimum 500 characters required."
-            )
+        # Extract and validate resume text
+        resume_text, resume_id = await resolve_resume_text(file, resume_text, resume_id)
         
         # Analyze ATS score
-        result = ats_analyzer.analyze(resume_text)
+        result = await ats_analyzer.analyze_async(resume_text, mode, tier)
         
-        return format_response("success", result)
+        return format_response("success", with_resume_id(result, resume_id))
     
     except HTTPException:
         raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         return format_response("error", error=str(e)), 500
 
 
+@app.post("/api/ats-score/stream")
+async def analyze_ats_score_stream(
+    file: Optional[UploadFile] = File(None),
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    mode: Optional[str] = Form(None),
+    tier: Optional[str] = Form(None)
+):
+    """
+    Server-Sent-Events variant of /api/ats-score.
+    
+    Emits a "field" event ({"key", "value"}) as each part of the analysis
+    completes, then a "result" event with the full response.
+    """
+    validate_scoring_mode(mode)
+    validate_model_tier(tier)
+    resume_text, resume_id = await resolve_resume_text(file, resume_text, resume_id)
+    
+    return sse_response(ats_analyzer.analyze_stream(resume_text, mode, tier), resume_id)
+
+
 @app.post("/api/jd-match")
 async def analyze_jd_match(
     jd_text: str = Form(...),
     file: Optional[UploadFile] = File(None),
-    resume_text: Optional[str] = Form(None)
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    tier: Optional[str] = Form(None)
 ):
     """
     Analyze resume against job description.
     
-    Either upload a resume file (PDF, DOCX) or provide resume text.
+    Either upload a resume file (PDF, DOCX), pass the resume_id returned
+    for an earlier upload, or provide resume text.
     Provide job description as text.
+    Optional tier: "fast", "balanced" or "accurate" model tier.
     Returns match score, gaps, recommendations, and detailed analysis.
     """
     try:
+        validate_model_tier(tier)
+        
         # Validate JD input
         if not jd_text or len(jd_text.strip()) < 200:
             raise HTTPException(
@@ -136,65 +431,68 @@ async def analyze_jd_match(
                 detail="Job description must be at least 200 characters"
             )
         
-        # Validate resume input
-        if not file and not resume_text:
-            raise HTTPException(
-                status_code=400,
-                detail="Either 'file' or 'resume_text' must be provided"
-            )
-        
-        # Extract resume text
-        if file:
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            
-            if file_extension not in [".pdf", ".docx", ".doc"]:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Unsupported file format. Supported: PDF, DOCX, DOC"
-                )
-            
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-                content = await file.read()
-                tmp_file.write(content)
-                tmp_path = tmp_file.name
-            
-            try:
-                resume_text = resume_extractor.extract_from_file(tmp_path)
-            finally:
-                os.unlink(tmp_path)
-        
-        # Validate resume content
-        if not validate_resume_content(resume_text):
-            raise HTTPException(
-                status_code=400,
-                detail="Resume is too short or missing key sections. Minimum 500 characters required."
-            )
+        # Extract and validate resume text
+        resume_text, resume_id = await resolve_resume_text(file, resume_text, resume_id)
         
         # Analyze JD match
-        result = jd_analyzer.analyze(resume_text, jd_text)
+        result = await jd_analyzer.analyze_async(resume_text, jd_text, tier)
         
-        return format_response("success", result)
+        return format_response("success", with_resume_id(result, resume_id))
     
     except HTTPException:
         raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         return format_response("error", error=str(e)), 500
 
 
+@app.post("/api/jd-match/stream")
+async def analyze_jd_match_stream(
+    jd_text: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    tier: Optional[str] = Form(None)
+):
+    """
+    Server-Sent-Events variant of /api/jd-match.
+    
+    Emits a "field" event ({"key", "value"}) as each part of the analysis
+    completes, then a "result" event with the full response.
+    """
+    validate_model_tier(tier)
+    if not jd_text or len(jd_text.strip()) < 200:
+        raise HTTPException(
+            status_code=400,
+            detail="Job description must be at least 200 characters"
+        )
+    resume_text, resume_id = await resolve_resume_text(file, resume_text, resume_id)
+    
+    return sse_response(jd_analyzer.analyze_stream(resume_text, jd_text, tier), resume_id)
+
+
 @app.post("/api/compare-jds")
 async def compare_multiple_jds(
     file: Optional[UploadFile] = File(None),
     resume_text: Optional[str] = Form(None),
-    jd_texts: Optional[List[str]] = Form(None)
+    resume_id: Optional[str] = Form(None),
+    jd_texts: List[str] = Form(None),
+    top_k: Optional[int] = Form(None),
+    tier: Optional[str] = Form(None)
 ):
     """
     Compare resume against multiple job descriptions.
     
     Provide list of job descriptions to find the best match.
+    Optional top_k sends only the k most similar JDs to the LLM; the rest
+    are returned under "prefiltered" with their similarity score.
+    Optional tier: "fast", "balanced" or "accurate" model tier.
     Returns all matches sorted by score.
     """
     try:
+        validate_model_tier(tier)
+        
         # Validate input
         if not jd_texts or len(jd_texts) == 0:
             raise HTTPException(
@@ -202,39 +500,8 @@ async def compare_multiple_jds(
                 detail="At least one job description is required"
             )
         
-        if not file and not resume_text:
-            raise HTTPException(
-                status_code=400,
-                detail="Either 'file' or 'resume_text' must be provided"
-            )
-        
-        # Extract resume text
-        if file:
-            file_extension = os.path.splitext(file.filename)[1].lower()
-            
-            if file_extension not in [".pdf", ".docx", ".doc"]:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Unsupported file format. Supported: PDF, DOCX, DOC"
-                )
-            
-            # Save uploaded file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-                content = await file.read()
-                tmp_file.write(content)
-                tmp_path = tmp_file.name
-            
-            try:
-                resume_text = resume_extractor.extract_from_file(tmp_path)
-            finally:
-                os.unlink(tmp_path)
-        
-        # Validate resume content
-        if not validate_resume_content(resume_text):
-            raise HTTPException(
-                status_code=400,
-                detail="Resume is too short or missing key sections. Minimum 500 characters required."
-            )
+        # Extract and validate resume text
+        resume_text, resume_id = await resolve_resume_text(file, resume_text, resume_id)
         
         # Validate all JDs
         for jd in jd_texts:
@@ -245,16 +512,264 @@ async def compare_multiple_jds(
                 )
         
         # Analyze multiple JDs
-        result = jd_analyzer.compare_multiple_jds(resume_text, jd_texts)
+        result = await jd_analyzer.compare_multiple_jds_async(
+            resume_text, jd_texts, top_k=top_k, tier=tier
+        )
         
-        return format_response("success", result)
+        return format_response("success", with_resume_id(result, resume_id))
     
     except HTTPException:
         raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         return format_response("error", error=str(e)), 500
 
 
+@app.get("/api/resumes/{resume_id}")
+async def get_resume(resume_id: str):
+    """Return the extracted text and sections cached for a resume_id."""
+    document = document_cache.get(resume_id)
+    if document is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired resume_id")
+    return format_response("success", with_resume_id(document, resume_id))
+
+
+@app.post("/api/batch/ats-score")
+async def batch_ats_score(
+    file: UploadFile = File(...),
+    mode: Optional[str] = Form(None)
+):
+    """
+    Score every PDF/DOCX resume in an uploaded zip archive.
+    Optional mode: "llm", "fast" (local score only) or "hybrid".
+    
+    Streams NDJSON: one line per resume as it finishes (with progress and
+    per-file errors), then a final summary line.
+    """
+    validate_scoring_mode(mode)
+    if os.path.splitext(file.filename)[1].lower() != ".zip":
+        raise HTTPException(
+            status_code=400,
+            detail="Upload a .zip archive of PDF/DOCX resumes"
+        )
+    
+    content = await read_upload(file, max_size=BATCH_MAX_ARCHIVE_SIZE)
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(content))
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Invalid zip archive")
+    
+    documents = documents_from_zip(archive)
+    if not documents:
+        archive.close()
+        raise HTTPException(
+            status_code=400,
+            detail="Archive contains no PDF, DOCX or DOC files"
+        )
+    
+    async def stream_results():
+        try:
+            async for item in batch_processor.process(documents, mode):
+                yield json.dumps(item) + "\n"
+        finally:
+            archive.close()
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.post("/api/jobs", status_code=202)
+async def submit_job(
+    kind: str = Form(...),
+    file: Optional[UploadFile] = File(None),
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    jd_text: Optional[str] = Form(None),
+    jd_texts: List[str] = Form(None),
+    mode: Optional[str] = Form(None),
+    tier: Optional[str] = Form(None),
+    top_k: Optional[int] = Form(None),
+    priority: int = Form(0),
+    webhook_url: Optional[str] = Form(None)
+):
+    """
+    Queue an analysis and return its job_id immediately.
+    
+    kind: "ats_score", "jd_match" (needs jd_text) or "compare_jds" (needs
+    jd_texts, optional top_k); the resume and mode/tier are given as for
+    the synchronous endpoints. Higher priority jobs run first. Poll
+    GET /api/jobs/{job_id}; compare_jds jobs report partial results as
+    each JD finishes. If webhook_url is set, the finished job is POSTed there.
+    """
+    if kind not in JOB_KINDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid kind. Supported: {', '.join(JOB_KINDS)}"
+        )
+    validate_scoring_mode(mode)
+    validate_model_tier(tier)
+    if webhook_url:
+        try:
+            await check_webhook_url(webhook_url)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    params = {"tier": tier}
+    if kind == "ats_score":
+        params["mode"] = mode
+    elif kind == "jd_match":
+        if not jd_text or len(jd_text.strip()) < 200:
+            raise HTTPException(
+                status_code=400,
+                detail="Job description must be at least 200 characters"
+            )
+        params["jd_text"] = jd_text
+    else:
+        if not jd_texts:
+            raise HTTPException(
+                status_code=400,
+                detail="At least one job description is required"
+            )
+        if any(len(jd.strip()) < 200 for jd in jd_texts):
+            raise HTTPException(
+                status_code=400,
+                detail="All job descriptions must be at least 200 characters"
+            )
+        params.update(jd_texts=jd_texts, top_k=top_k)
+    
+    # Only cheap checks here; extraction and validation run in the worker
+    document = None
+    if file:
+        file_extension = os.path.splitext(file.filename)[1].lower()
+        if file_extension not in ALLOWED_EXTENSIONS:
+            raise HTTPException(
+                status_code=400,
+                detail="Unsupported file format. Supported: PDF, DOCX, DOC"
+            )
+        document = await read_upload(file)
+        params["file_extension"] = file_extension
+    elif resume_id:
+        if document_cache.get(resume_id) is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Unknown or expired resume_id; upload the file again"
+            )
+        params["resume_id"] = resume_id
+    elif resume_text:
+        params["resume_text"] = resume_text
+    else:
+        raise HTTPException(
+            status_code=400,
+            detail="Either 'file', 'resume_id' or 'resume_text' must be provided"
+        )
+    
+    try:
+        job = await job_queue.submit(kind, params, document, priority, webhook_url)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return format_response("success", job)
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Job status, progress, partial results and (once finished) the result."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return format_response("success", job)
+
+
+@app.delete("/api/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already {job['status']}")
+    return format_response("success", await job_queue.cancel(job_id))
+
+
+@app.post("/api/jds")
+async def add_jds(batch: JDPostingBatch):
+    """Add (or replace, when an id is given) postings in the JD index."""
+    # One transaction for the whole batch, off the event loop
+    ids = await asyncio.to_thread(jd_index.upsert_many, [jd.model_dump() for jd in batch.jds])
+    return format_response("success", {"ids": ids, "total_jds": jd_index.count()})
+
+
+@app.get("/api/jds/{jd_id}")
+async def get_jd(jd_id: str):
+    """Fetch a stored posting."""
+    posting = jd_index.get(jd_id)
+    if posting is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return format_response("success", posting)
+
+
+@app.put("/api/jds/{jd_id}")
+async def update_jd(jd_id: str, jd: JDPosting):
+    """Replace a stored posting."""
+    if jd_index.get(jd_id) is None:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    await asyncio.to_thread(jd_index.upsert, jd.text, jd.title, jd.metadata, jd_id)
+    return format_response("success", {"id": jd_id})
+
+
+@app.delete("/api/jds/{jd_id}")
+async def delete_jd(jd_id: str):
+    """Remove a stored posting."""
+    if not await asyncio.to_thread(jd_index.delete, jd_id):
+        raise HTTPException(status_code=404, detail="Job description not found")
+    return format_response("success", {"id": jd_id})
+
+
+@app.post("/api/jds/search")
+async def search_jds(
+    file: Optional[UploadFile] = File(None),
+    resume_text: Optional[str] = Form(None),
+    resume_id: Optional[str] = Form(None),
+    top_n: int = Form(10),
+    rerank: int = Form(0)
+):
+    """
+    Find the stored postings that best match a resume.
+    
+    Either upload a file (PDF, DOCX), pass a resume_id or provide resume text.
+    Results are ranked by TF-IDF similarity; the first `rerank` of them
+    (at most JD_SEARCH_MAX_RERANK) also get a full LLM match analysis.
+    """
+    try:
+        resume_text, resume_id = await resolve_resume_text(file, resume_text, resume_id)
+        
+        # Index rebuilds and scoring run off the event loop
+        matches = await asyncio.to_thread(jd_index.search, resume_text, max(1, top_n))
+        
+        rerank = min(max(rerank, 0), JD_SEARCH_MAX_RERANK, len(matches))
+        if rerank:
+            analyses = await asyncio.gather(
+                *(jd_analyzer.analyze_async(resume_text, match["text"]) for match in matches[:rerank]),
+                return_exceptions=True
+            )
+            for match, analysis in zip(matches, analyses):
+                match["analysis"] = (
+                    {"status": "error", "error": str(analysis)}
+                    if isinstance(analysis, Exception) else analysis
+                )
+        
+        return format_response("success", with_resume_id({
+            "total_indexed": jd_index.count(),
+            "matches": matches
+        }, resume_id))
+    
+    except HTTPException:
+        raise
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions."""
@@ -0,0 +1,271 @@
+# metrics.py
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Minimal Prometheus text-format registry (exposition format 0.0.4), so
+# /metrics needs no client library.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CONTENT_TYPE = "text/plain; version=0.0.4"  # Starlette appends the charset
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic total."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set(self, value: float, **labels):
+        """Mirror a total tracked elsewhere (used by scrape-time collectors)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_in_progress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations with _sum and _count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][index] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and renders them; collectors refresh mirrored values per scrape."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def on_collect(self, collector: Callable[[], None]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter(name, documentation, labelnames))
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge(name, documentation, labelnames))
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram(name, documentation, labelnames, buckets))
+
+
+# Process-wide metrics. Stages: upload_read, extraction, validation,
+# keyword_scan, llm_call, json_parse, response_format.
+STAGE_SECONDS = histogram(
+    "resume_analyzer_stage_seconds", "Time spent per processing stage", ("stage",)
+)
+HTTP_REQUESTS = counter(
+    "resume_analyzer_http_requests_total", "HTTP requests by route and status",
+    ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = histogram(
+    "resume_analyzer_http_request_seconds", "HTTP request latency (until response headers)",
+    ("route",)
+)
+HTTP_IN_PROGRESS = gauge(
+    "resume_analyzer_http_requests_in_progress", "HTTP requests currently being handled"
+)
+LLM_REQUESTS = counter(
+    "resume_analyzer_llm_requests_total", "LLM calls per model and outcome", ("model", "outcome")
+)
+LLM_REQUEST_SECONDS = histogram(
+    "resume_analyzer_llm_request_seconds", "LLM call latency per model, including retries",
+    ("model",)
+)
+LLM_IN_FLIGHT = gauge(
+    "resume_analyzer_llm_requests_in_flight", "Upstream LLM HTTP requests currently open"
+)
+LLM_TOKENS = counter(
+    "resume_analyzer_llm_tokens_total",
+    "LLM tokens reported by the API (kind: prompt_uncached, prompt_cached, completion)",
+    ("model", "kind")
+)
+LLM_PROMPT_CACHE_RATIO = histogram(
+    "resume_analyzer_llm_prompt_cache_ratio", "Share of each call's prompt tokens read from the provider cache",
+    ("model", "layout"), buckets=(0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0)
+)
+LLM_PROMPT_CACHED_TOKENS = histogram(
+    "resume_analyzer_llm_prompt_cached_tokens", "Prompt tokens each call read from the provider cache",
+    ("model", "layout"), buckets=(0, 256, 512, 1024, 2048, 4096, 8192, 16384)
+)
+LLM_COST = counter(
+    "resume_analyzer_llm_cost_usd_total", "Estimated LLM spend in USD", ("model",)
+)
+CACHE_LOOKUPS = counter(
+    "resume_analyzer_cache_lookups_total", "Cache lookups by cache and result", ("cache", "result")
+)
+CACHE_ENTRIES = gauge(
+    "resume_analyzer_cache_entries", "Entries currently held per cache", ("cache",)
+)
+CACHE_EVICTIONS = counter(
+    "resume_analyzer_cache_evictions_total", "Cache evictions per cache", ("cache",)
+)
+SINGLEFLIGHT_IN_FLIGHT = gauge(
+    "resume_analyzer_singleflight_in_flight", "Distinct analyses currently running", ("analysis",)
+)
+SINGLEFLIGHT_COALESCED = counter(
+    "resume_analyzer_singleflight_coalesced_total", "Requests that joined an identical running analysis",
+    ("analysis",)
+)
+CIRCUIT_OPEN = gauge(
+    "resume_analyzer_llm_circuit_open", "1 while the model's circuit breaker is not closed", ("model",)
+)
+JOBS = gauge(
+    "resume_analyzer_jobs", "Jobs in the background queue by status", ("status",)
+)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Record the duration of a processing stage."""
+    with STAGE_SECONDS.time(stage=stage):
+        yield
+
+
+def record_stage(stage: str, seconds: float):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
+
+def render_latest() -> Tuple[str, str]:
+    """Return (body, content type) for a /metrics response."""
+    return REGISTRY.render(), CONTENT_TYPE
+
+
+def route_label(scope: dict, fallback: Optional[str] = None) -> str:
+    """Route template (e.g. /api/jds/{jd_id}) so labels stay low-cardinality."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or fallback or "unmatched"
@@ -0,0 +1,345 @@
+# mock_openrouter.py
+"""
+Local stand-in for the OpenRouter chat-completions API, for offline
+development and load tests.
+
+    python mock_openrouter.py --port 8001 --latency-ms 800 --error-rate 0.02
+    OPENROUTER_BASE_URL=http://localhost:8001/api/v1 OPENROUTER_API_KEY=mock python main.py
+
+Responses are schema-valid for every prompt the service sends (ATS score,
+JD match and batched JD match, in both free-form and structured modes),
+with simulated latency, errors, streaming and provider prompt caching.
+--record proxies to a real upstream and appends each exchange to a JSONL
+file; --replay serves those recorded responses again.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from prompt_compactor import estimate_tokens
+from schemas import ATSScoreResult, JDMatchResult
+
+LATENCY_DISTRIBUTIONS = ("none", "fixed", "uniform", "lognormal")
+ERROR_STATUS_CODES = (500, 502, 503)
+CACHE_MIN_PREFIX_TOKENS = 1024  # OpenAI-style: cached in 128-token steps above this
+CACHE_MAX_PREFIXES = 10000
+
+
+class MockSettings:
+    """Behaviour knobs; see the command-line flags for their meaning."""
+
+    def __init__(
+        self,
+        latency_distribution: str = "lognormal",
+        latency_ms: float = 800.0,
+        latency_sigma: float = 0.5,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        stream_chunk_chars: int = 24,
+        stream_chunk_delay_ms: float = 15.0,
+        replay_path: Optional[str] = None,
+        record_path: Optional[str] = None,
+        upstream_url: str = "https://openrouter.ai/api/v1",
+        seed: Optional[int] = None
+    ):
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency_distribution must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+        self.latency_distribution = latency_distribution
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.stream_chunk_chars = stream_chunk_chars
+        self.stream_chunk_delay_ms = stream_chunk_delay_ms
+        self.replay_path = replay_path
+        self.record_path = record_path
+        self.upstream_url = upstream_url.rstrip("/")
+        self.seed = seed
+
+
+def request_key(body: dict) -> str:
+    """Identify a request by model, messages and response format."""
+    material = json.dumps(
+        [body.get("model"), body.get("messages"), body.get("response_format")],
+        sort_keys=True
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _text(content) -> str:
+    """Flatten string or content-part message content."""
+    if isinstance(content, str):
+        return content
+    return "".join(part.get("text", "") for part in content or [])
+
+
+class MockCompletions:
+    """Generates (or replays) completions and simulates latency, failures and caching."""
+
+    def __init__(self, settings: MockSettings):
+        self.settings = settings
+        self.rng = random.Random(settings.seed)
+        self.replay = self._load_replay(settings.replay_path)
+        self._prefixes = OrderedDict()
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "streams": 0, "replayed": 0}
+
+    @staticmethod
+    def _load_replay(path: Optional[str]) -> dict:
+        replay = {}
+        if path:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        replay[record["key"]] = record["response"]
+        return replay
+
+    def latency(self) -> float:
+        settings = self.settings
+        median = settings.latency_ms / 1000
+        if settings.latency_distribution == "none":
+            return 0.0
+        if settings.latency_distribution == "fixed":
+            return median
+        if settings.latency_distribution == "uniform":
+            return self.rng.uniform(0, 2 * median)
+        # Log-normal with the given median: the long tail that hedging targets
+        return self.rng.lognormvariate(0, settings.latency_sigma) * median
+
+    def failure(self) -> Optional[JSONResponse]:
+        """Return an injected error response, or None to serve normally."""
+        roll = self.rng.random()
+        if roll < self.settings.rate_limit_rate:
+            self.stats["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"code": 429, "message": "Rate limit exceeded (mock)"}},
+                status_code=429,
+                headers={"Retry-After": f"{self.settings.retry_after:g}"}
+            )
+        if roll < self.settings.rate_limit_rate + self.settings.error_rate:
+            self.stats["errors"] += 1
+            status = self.rng.choice(ERROR_STATUS_CODES)
+            return JSONResponse(
+                {"error": {"code": status, "message": "Upstream error (mock)"}},
+                status_code=status
+            )
+        return None
+
+    def _cached_tokens(self, messages: List[dict]) -> int:
+        """
+        Simulate provider prompt caching: the prefix up to the first job
+        description (instructions + resume) is cached after its first use.
+        """
+        prefix = "".join(_text(message.get("content")) for message in messages)
+        prefix = prefix.split("Job Description", 1)[0]
+        tokens = estimate_tokens(prefix)
+        if tokens < CACHE_MIN_PREFIX_TOKENS:
+            return 0
+
+        key = hashlib.sha256(prefix.encode("utf-8")).hexdigest()
+        if key in self._prefixes:
+            self._prefixes.move_to_end(key)
+            return tokens // 128 * 128
+        self._prefixes[key] = True
+        if len(self._prefixes) > CACHE_MAX_PREFIXES:
+            self._prefixes.popitem(last=False)
+        return 0
+
+    def _scores(self, seed_text: str) -> random.Random:
+        # Same prompt -> same scores, so repeated runs are comparable
+        return random.Random(hashlib.sha256(seed_text.encode("utf-8")).digest())
+
+    @staticmethod
+    def _ats_compact(rng: random.Random) -> dict:
+        breakdown = {
+            "fs": rng.randint(10, 25), "ko": rng.randint(8, 25), "pa": rng.randint(10, 20),
+            "cl": rng.randint(6, 15), "co": rng.randint(6, 15)
+        }
+        return {
+            "s": sum(breakdown.values()),
+            "b": breakdown,
+            "st": ["Clear section headings", "Quantified achievements"],
+            "wk": ["Few industry keywords"],
+            "sg": ["Add a skills summary", "Use consistent date formats"]
+        }
+
+    @staticmethod
+    def _jd_compact(rng: random.Random) -> dict:
+        breakdown = {
+            "sk": rng.randint(5, 30), "ex": rng.randint(5, 25),
+            "qu": rng.randint(5, 20), "re": rng.randint(5, 25)
+        }
+        return {
+            "s": sum(breakdown.values()),
+            "b": breakdown,
+            "ms": ["python", "sql"],
+            "xs": ["kubernetes"],
+            "mr": ["Service design"],
+            "xr": ["On-call ownership"],
+            "st": ["Relevant backend experience"],
+            "gp": ["Limited cloud exposure"],
+            "rc": ["Highlight infrastructure work"],
+            "fa": "A reasonable fit with some gaps in the required tooling."
+        }
+
+    def content(self, body: dict) -> str:
+        """A response body that parses for the kind of prompt received."""
+        messages = body.get("messages", [])
+        system = _text(messages[0].get("content")) if messages else ""
+        prompt = "".join(_text(message.get("content")) for message in messages)
+        response_format = body.get("response_format") or {}
+        schema_name = response_format.get("json_schema", {}).get("name")
+        structured = schema_name is not None
+        rng = self._scores(prompt)
+
+        jd_count = len(re.findall(r"Job Description \d+:", prompt))
+        if schema_name == "jd_batch_match" or "numbered job descriptions" in system:
+            items = []
+            for number in range(1, jd_count + 1):
+                item = self._jd_compact(rng)
+                if structured:
+                    items.append(dict(item, j=number))
+                else:
+                    items.append(dict(JDMatchResult.model_validate(item).model_dump(), jd=number))
+            return json.dumps({"r": items} if structured else {"results": items})
+
+        if schema_name == "jd_match" or "Job Description" in prompt:
+            result = self._jd_compact(rng)
+            model = JDMatchResult
+        else:
+            result = self._ats_compact(rng)
+            model = ATSScoreResult
+        if structured:
+            return json.dumps(result)
+        # Free-form prompts ask for full key names, often fenced like real models do
+        return "```json\n" + json.dumps(model.model_validate(result).model_dump(), indent=2) + "\n```"
+
+    def completion(self, body: dict, content: str) -> dict:
+        messages = body.get("messages", [])
+        prompt_tokens = estimate_tokens("".join(_text(message.get("content")) for message in messages))
+        return {
+            "id": f"gen-mock-{self.rng.getrandbits(48):012x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content}
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": estimate_tokens(content),
+                "total_tokens": prompt_tokens + estimate_tokens(content),
+                "prompt_tokens_details": {"cached_tokens": self._cached_tokens(messages)}
+            }
+        }
+
+    async def stream(self, completion: dict):
+        """Server-sent events in OpenRouter's format."""
+        yield ": OPENROUTER PROCESSING\n\n"
+        content = completion["choices"][0]["message"]["content"]
+        size = max(1, self.settings.stream_chunk_chars)
+        for start in range(0, len(content), size):
+            chunk = {
+                "id": completion["id"],
+                "model": completion["model"],
+                "choices": [{"index": 0, "delta": {"content": content[start:start + size]}}]
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            if self.settings.stream_chunk_delay_ms:
+                await asyncio.sleep(self.settings.stream_chunk_delay_ms / 1000)
+        yield f"data: {json.dumps({'id': completion['id'], 'choices': [], 'usage': completion['usage']})}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+def create_app(settings: Optional[MockSettings] = None) -> FastAPI:
+    settings = settings or MockSettings()
+    mock = MockCompletions(settings)
+    app = FastAPI(title="Mock OpenRouter")
+    app.state.mock = mock
+
+    async def upstream_completion(request: Request, body: dict) -> dict:
+        """Forward to the real API (record mode); streaming is recorded unstreamed."""
+        import httpx
+
+        async with httpx.AsyncClient(timeout=120) as client:
+            response = await client.post(
+                f"{settings.upstream_url}/chat/completions",
+                headers={"Authorization": request.headers.get("Authorization", "")},
+                json=dict(body, stream=False)
+            )
+        response.raise_for_status()
+        return response.json()
+
+    @app.post("/api/v1/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        mock.stats["requests"] += 1
+
+        key = request_key(body)
+        if settings.record_path:
+            completion = await upstream_completion(request, body)
+            with open(settings.record_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "response": completion}) + "\n")
+        else:
+            await asyncio.sleep(mock.latency())
+            failure = mock.failure()
+            if failure is not None:
+                return failure
+
+            completion = mock.replay.get(key)
+            if completion is not None:
+                mock.stats["replayed"] += 1
+            else:
+                completion = mock.completion(body, mock.content(body))
+
+        if body.get("stream"):
+            mock.stats["streams"] += 1
+            return StreamingResponse(mock.stream(completion), media_type="text/event-stream")
+        return completion
+
+    @app.get("/stats")
+    async def stats():
+        return mock.stats
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the OpenRouter chat-completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="median response latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="log-normal spread (tail weight)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of 5xx responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--stream-chunk-chars", type=int, default=24)
+    parser.add_argument("--stream-chunk-delay-ms", type=float, default=15.0)
+    parser.add_argument("--replay", dest="replay_path", help="JSONL file of recorded responses to serve")
+    parser.add_argument("--record", dest="record_path", help="proxy to --upstream and append responses here")
+    parser.add_argument("--upstream", dest="upstream_url", default="https://openrouter.ai/api/v1")
+    parser.add_argument("--seed", type=int)
+    args = vars(parser.parse_args())
+
+    import uvicorn
+    host, port = args.pop("host"), args.pop("port")
+    uvicorn.run(create_app(MockSettings(**args)), host=host, port=port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# model_router.py
+from typing import Dict, List, Optional
+
+from metrics import (
+    LLM_COST, LLM_PROMPT_CACHE_RATIO, LLM_PROMPT_CACHED_TOKENS, LLM_REQUEST_SECONDS, LLM_REQUESTS, LLM_TOKENS
+)
+from config import (
+    LLM_MODEL_TIERS, LLM_DEFAULT_TIERS, LLM_TIER_ESCALATION_TOKENS, LLM_MODEL_PRICING
+)
+
+MODEL_TIERS = ("fast", "balanced", "accurate")
+
+
+class ModelStats:
+    """Running latency, token and cost totals for one model."""
+
+    __slots__ = ("calls", "failures", "latency_total", "prompt_tokens",
+                 "cached_prompt_tokens", "completion_tokens", "cost_usd")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.latency_total = 0.0
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+
+    def as_dict(self) -> dict:
+        succeeded = self.calls - self.failures
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "avg_latency_seconds": round(self.latency_total / succeeded, 3) if succeeded else None,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "prompt_cache_hit_ratio": (
+                round(self.cached_prompt_tokens / self.prompt_tokens, 3) if self.prompt_tokens else None
+            ),
+            "completion_tokens": self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 6)
+        }
+
+
+class ModelRouter:
+    """
+    Pick an ordered chain of models (primary first, then fallbacks) for
+    each LLM call.
+
+    The tier is the caller's choice, else the default for the analysis type
+    (bulk ATS screening runs on "fast", JD matches on "balanced"). Prompts
+    larger than LLM_TIER_ESCALATION_TOKENS are moved up one tier, since the
+    small models lose accuracy on long inputs.
+    """
+
+    def __init__(self):
+        self.tiers = LLM_MODEL_TIERS
+        self.stats: Dict[str, ModelStats] = {}
+
+    def resolve_tier(self, analysis: str, tier: Optional[str] = None) -> str:
+        tier = tier or LLM_DEFAULT_TIERS.get(analysis, "balanced")
+        if tier not in MODEL_TIERS:
+            raise ValueError(f"Unknown model tier: {tier}")
+        return tier
+
+    def route(self, analysis: str, prompt_tokens: int, tier: Optional[str] = None) -> List[str]:
+        """Return the model chain to try, in order."""
+        tier = self.resolve_tier(analysis, tier)
+        if prompt_tokens > LLM_TIER_ESCALATION_TOKENS and tier != MODEL_TIERS[-1]:
+            tier = MODEL_TIERS[MODEL_TIERS.index(tier) + 1]
+        return list(self.tiers[tier])
+
+    def cache_scope(self, analysis: str, tier: Optional[str] = None) -> str:
+        """Identify a tier's model chain, for cache keys (only its first model's answers are cached)."""
+        tier = self.resolve_tier(analysis, tier)
+        return f"{tier}:{','.join(self.tiers[tier])}"
+
+    def record(self, model: str, latency: float, usage: Optional[dict] = None, failed: bool = False,
+               layout: str = "other"):
+        """
+        Update a model's totals and metrics for one call. `layout` (see
+        prompt_builder.prompt_layout) labels the per-call prompt-cache
+        metrics, so cache hit rates can be compared across prompt layouts.
+        """
+        stats = self.stats.get(model)
+        if stats is None:
+            stats = self.stats[model] = ModelStats()
+
+        stats.calls += 1
+        LLM_REQUESTS.inc(model=model, outcome="error" if failed else "success")
+        if failed:
+            stats.failures += 1
+            return
+
+        stats.latency_total += latency
+        LLM_REQUEST_SECONDS.observe(latency, model=model)
+        if usage:
+            prompt_tokens = usage.get("prompt_tokens", 0)
+            completion_tokens = usage.get("completion_tokens", 0)
+            # Prompt tokens served from the provider's prompt cache
+            cached_tokens = min((usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0,
+                                prompt_tokens)
+            input_price, output_price, cached_price = LLM_MODEL_PRICING.get(model, (0.0, 0.0, 0.0))
+            # Prices are USD per million tokens
+            cost = (
+                (prompt_tokens - cached_tokens) * input_price
+                + cached_tokens * cached_price
+                + completion_tokens * output_price
+            ) / 1e6
+            stats.prompt_tokens += prompt_tokens
+            stats.cached_prompt_tokens += cached_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost_usd += cost
+            LLM_TOKENS.inc(prompt_tokens - cached_tokens, model=model, kind="prompt_uncached")
+            LLM_TOKENS.inc(cached_tokens, model=model, kind="prompt_cached")
+            LLM_TOKENS.inc(completion_tokens, model=model, kind="completion")
+            LLM_COST.inc(cost, model=model)
+            if prompt_tokens:
+                LLM_PROMPT_CACHED_TOKENS.observe(cached_tokens, model=model, layout=layout)
+                LLM_PROMPT_CACHE_RATIO.observe(cached_tokens / prompt_tokens, model=model, layout=layout)
+
+    def stats_dict(self) -> dict:
+        return {model: stats.as_dict() for model, stats in self.stats.items()}
@@ -0,0 +1,81 @@
+# prompt_builder.py
+from typing import List, Sequence, Union
+
+from config import LLM_CACHE_CONTROL_MODELS
+
+# Prompts are laid out most-stable first so providers can reuse the prefill
+# of earlier calls: the static instructions (system message), then the
+# resume, then the per-call job description(s). Repeated analyses of one
+# resume share everything up to the first job description.
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+
+def supports_cache_control(model: str) -> bool:
+    """Whether the provider needs explicit cache_control breakpoints."""
+    return model.startswith(LLM_CACHE_CONTROL_MODELS)
+
+
+class Prompt:
+    """
+    System instructions plus ordered user-message blocks. The first
+    `shared_blocks` blocks (the resume) are the same across calls for one
+    document and end the cacheable prefix.
+    """
+
+    __slots__ = ("system", "blocks", "shared_blocks")
+
+    def __init__(self, system: str, blocks: Sequence[str], shared_blocks: int = 1):
+        self.system = system.strip()
+        self.blocks = list(blocks)
+        self.shared_blocks = shared_blocks
+
+    def __str__(self) -> str:
+        return "\n\n".join([self.system] + self.blocks)
+
+    def messages(self, model: str) -> List[dict]:
+        if not supports_cache_control(model):
+            return [
+                {"role": "system", "content": self.system},
+                {"role": "user", "content": "\n\n".join(self.blocks)}
+            ]
+
+        # Breakpoints after the instructions and after the shared blocks
+        parts = []
+        for index, block in enumerate(self.blocks):
+            last = index == len(self.blocks) - 1
+            part = {"type": "text", "text": block if last else block + "\n\n"}
+            if index == self.shared_blocks - 1:
+                part["cache_control"] = CACHE_CONTROL
+            parts.append(part)
+
+        return [
+            {
+                "role": "system",
+                "content": [{"type": "text", "text": self.system, "cache_control": CACHE_CONTROL}]
+            },
+            {"role": "user", "content": parts}
+        ]
+
+
+def resume_prompt(instructions: str, resume_text: str, job_descriptions: Sequence[str] = (),
+                  numbered: bool = False) -> Prompt:
+    """Instructions, then the resume, then each job description in turn."""
+    blocks = [f"Resume:\n{resume_text}"]
+    for number, jd_text in enumerate(job_descriptions, 1):
+        blocks.append(f"Job Description {number}:\n{jd_text}" if numbered else f"Job Description:\n{jd_text}")
+    return Prompt(instructions, blocks)
+
+
+def prompt_layout(prompt: Union[str, Prompt], analysis: str) -> str:
+    """Label a call's prompt layout for per-layout prompt-cache metrics."""
+    if isinstance(prompt, Prompt) and len(prompt.blocks) - prompt.shared_blocks > 1:
+        return f"{analysis}_batch"
+    return analysis or "other"
+
+
+def as_messages(prompt: Union[str, Prompt], model: str) -> List[dict]:
+    """Chat messages for `model`; a plain string is sent as one user message."""
+    if isinstance(prompt, Prompt):
+        return prompt.messages(model)
+    return [{"role": "user", "content": prompt}]
@@ -0,0 +1,121 @@
+# prompt_compactor.py
+from typing import Iterable, List, Optional, Tuple, Union
+
+from utils import clean_text
+from resume_parser import (
+    ParsedResume, HEADER_PRIORITY, make_heading_matcher, match_resume_heading, parse_resume
+)
+
+# Resume section priorities live with the parser (resume_parser.RESUME_SECTIONS).
+# Lower number = kept longer when trimming to the token budget.
+JD_SECTIONS = {
+    "requirements": (r"requirements|qualifications|skills|what you.ll need|must have", 1),
+    "responsibilities": (r"responsibilities|duties|what you.ll do|role", 1),
+    "preferred": (r"nice to have|preferred|bonus", 2),
+    "company": (r"about (?:us|the company)|who we are|company", 4),
+    "benefits": (r"benefits|perks|compensation|salary|equal opportunity|eeo", 5)
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+_JD_HEADING = make_heading_matcher(JD_SECTIONS)
+
+
+def _matched_lines(text: str, heading_matcher) -> Iterable[Tuple[str, Optional[int]]]:
+    for line in text.splitlines():
+        heading = heading_matcher(line.strip())
+        yield line, heading[1] if heading else None
+
+
+def compact_text(text: str, token_budget: int, heading_matcher=match_resume_heading) -> Tuple[str, dict]:
+    """
+    Shrink document text before it is pasted into a prompt.
+
+    Each line is normalized with clean_text, blank and repeated lines are
+    dropped (PDF headers/footers repeat per page), and if the result is
+    still over `token_budget` the lowest-priority sections are trimmed
+    from their ends first. Returns (compacted text, stats).
+    """
+    return _compact_lines(_matched_lines(text, heading_matcher), estimate_tokens(text), token_budget)
+
+
+def _compact_lines(lines: Iterable[Tuple[str, Optional[int]]], original_tokens: int,
+                   token_budget: int) -> Tuple[str, dict]:
+    """Compact (line, heading priority or None) pairs; see compact_text."""
+    # sections: [priority, [lines]] in document order
+    sections: List[list] = [[HEADER_PRIORITY, []]]
+    seen = set()
+    duplicates = 0
+
+    for raw_line, priority in lines:
+        line = clean_text(raw_line)
+        if not line:
+            continue
+
+        key = line.lower()
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+
+        if priority is not None:
+            sections.append([priority, [line]])
+        else:
+            sections[-1][1].append(line)
+
+    total_tokens = sum(estimate_tokens(line) + 1 for _, lines in sections for line in lines)
+    truncated = total_tokens > token_budget
+
+    if truncated:
+        # Lowest priority first; among equals, later sections first
+        trim_order = sorted(
+            range(len(sections)),
+            key=lambda idx: (sections[idx][0], idx),
+            reverse=True
+        )
+        for idx in trim_order:
+            lines = sections[idx][1]
+            while lines and total_tokens > token_budget:
+                excess = total_tokens - token_budget
+                line_tokens = estimate_tokens(lines[-1]) + 1
+                is_heading = idx > 0 and len(lines) == 1
+
+                if line_tokens > excess + 1 and not is_heading:
+                    # Cut a long line (e.g. a one-paragraph JD) at a word boundary
+                    keep_chars = (line_tokens - 1 - excess) * 4
+                    lines[-1] = lines[-1][:keep_chars].rsplit(" ", 1)[0]
+                    total_tokens -= line_tokens - (estimate_tokens(lines[-1]) + 1)
+                    break
+
+                lines.pop()
+                total_tokens -= line_tokens
+            if idx > 0 and len(lines) == 1:
+                # Do not leave a heading with nothing under it
+                total_tokens -= estimate_tokens(lines.pop()) + 1
+            if total_tokens <= token_budget:
+                break
+
+    compacted = "\n".join(line for _, lines in sections for line in lines)
+    compacted_tokens = estimate_tokens(compacted)
+
+    return compacted, {
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "tokens_saved": max(0, original_tokens - compacted_tokens),
+        "duplicate_lines_removed": duplicates,
+        "truncated": truncated
+    }
+
+
+def compact_resume(resume: Union[str, ParsedResume], token_budget: int) -> Tuple[str, dict]:
+    """Compact a resume using the headings its parse already found."""
+    parsed = resume if isinstance(resume, ParsedResume) else parse_resume(resume)
+    return _compact_lines(parsed.iter_lines(), estimate_tokens(parsed.text), token_budget)
+
+
+def compact_jd(text: str, token_budget: int) -> Tuple[str, dict]:
+    return compact_text(text, token_budget, _JD_HEADING)
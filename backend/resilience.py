@@ -0,0 +1,218 @@
+# resilience.py
+import asyncio
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional
+
+from config import (
+    LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY,
+    LLM_HEDGE_ENABLED, LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_SAMPLES,
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_TIMEOUT
+)
+
+
+class LLMAPIError(ValueError):
+    """An LLM API call failed; `retryable` marks transient failures."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retryable: bool = False, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(LLMAPIError):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def settle_permanent_error(breaker: "CircuitBreaker", error: LLMAPIError) -> bool:
+    """
+    Record a non-retryable error against the breaker. An HTTP status means
+    the upstream answered (the request itself was rejected, e.g. 400/401),
+    which counts as healthy. Returns True if an outcome was recorded.
+    """
+    if error.status_code is None:
+        return False
+    breaker.record_success()
+    return True
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies."""
+
+    def __init__(self, window: int = 200):
+        self._samples = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if len(self._samples) < LLM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class CircuitBreaker:
+    """
+    Classic three-state breaker. After `failure_threshold` consecutive
+    upstream failures it opens and rejects calls for `reset_timeout`
+    seconds, then lets a single probe through (half-open). Every allowed
+    call must end in record_success, record_failure or release, or a
+    half-open breaker would wait for its probe forever.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 reset_timeout: float = CIRCUIT_RESET_TIMEOUT):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            self.state = "half_open"
+            return True
+        # While half-open, only the probe that moved us there gets through
+        return self.state == "closed"
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+
+    def release(self):
+        """
+        An allowed call ended without a verdict on upstream health (it was
+        cancelled, say). A half-open breaker reopens with its original
+        opened_at, so the next caller becomes the probe straight away.
+        """
+        if self.state == "half_open":
+            self.state = "open"
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class ResilientCaller:
+    """
+    Wraps a single upstream attempt with:
+      - exponential-backoff retries (full jitter) that honour Retry-After,
+      - a hedged duplicate request once the primary exceeds the p95 latency,
+      - a circuit breaker that fails fast while the upstream is degraded.
+    """
+
+    def __init__(self):
+        self.breaker = CircuitBreaker()
+        self.latency = LatencyTracker()
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return retry_after  # call() gives up on waits beyond LLM_RETRY_MAX_DELAY
+        ceiling = min(LLM_RETRY_MAX_DELAY, LLM_RETRY_BASE_DELAY * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+    async def call(self, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM API temporarily unavailable (circuit open)")
+
+        settled = False
+        try:
+            for retry in range(LLM_MAX_RETRIES + 1):
+                try:
+                    result = await self._hedged(attempt)
+                except LLMAPIError as e:
+                    if not e.retryable:
+                        settled = settle_permanent_error(self.breaker, e)
+                        raise
+                    self.breaker.record_failure()
+                    # Retrying before a longer Retry-After would only be refused again
+                    if (retry == LLM_MAX_RETRIES or self.breaker.state == "open"
+                            or (e.retry_after or 0) > LLM_RETRY_MAX_DELAY):
+                        settled = True
+                        raise
+                    self.retries += 1
+                    await asyncio.sleep(self._backoff(retry, e.retry_after))
+                    continue
+
+                self.breaker.record_success()
+                settled = True
+                return result
+        finally:
+            if not settled:
+                # Cancelled (e.g. a caller's wait_for timed out) or failed locally
+                self.breaker.release()
+
+    async def _timed(self, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.monotonic()
+        result = await attempt()
+        self.latency.record(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        threshold = self.latency.percentile(LLM_HEDGE_PERCENTILE) if LLM_HEDGE_ENABLED else None
+        if threshold is None:
+            return await self._timed(attempt)
+
+        primary = asyncio.ensure_future(self._timed(attempt))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=threshold)
+            if not done:
+                # Primary is slower than p95: race a duplicate against it
+                self.hedges += 1
+                pending.add(asyncio.ensure_future(self._timed(attempt)))
+
+            error = None
+            while pending or done:
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "circuit_state": self.breaker.state,
+            "circuit_opened": self.breaker.times_opened,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "p95_latency_seconds": self.latency.percentile(95)
+        }
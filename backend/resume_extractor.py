@@ -1,8 +1,8 @@
 # resume_extractor.py
-import os
-import tempfile
+import io
+import time
 from pathlib import Path
-from typing import Tuple
+from typing import List, Tuple, Union, BinaryIO, Optional
 import requests
 from pypdf import PdfReader
 from docx import Document
@@ -12,36 +12,97 @@ class ResumeExtractor:
     """Extract text from various resume formats."""
     
     @staticmethod
-    def extract_from_pdf(file_path: str) -> str:
-        """Extract text from PDF file."""
+    def extract_pdf_pages(
+        source: Union[str, BinaryIO],
+        start: int = 0,
+        stop: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        timings: Optional[dict] = None
+    ) -> Tuple[List[str], int]:
+        """
+        Extract the text of pages [start, stop), stopping early once
+        `max_chars` characters have been collected.
+        Returns (page texts, total page count). Documents longer than
+        `max_pages` are rejected before any page is parsed.
+        """
+        timings = {} if timings is None else timings
+        started = time.perf_counter()
+        pdf_reader = PdfReader(source)
+        total_pages = len(pdf_reader.pages)
+        timings["open"] = timings.get("open", 0.0) + time.perf_counter() - started
+        
+        if max_pages is not None and total_pages > max_pages:
+            raise ValueError(f"PDF has {total_pages} pages (maximum {max_pages})")
+        
+        started = time.perf_counter()
+        pages = []
+        chars = 0
+        for page in pdf_reader.pages[start:stop]:
+            page_text = page.extract_text() or ""
+            pages.append(page_text)
+            chars += len(page_text)
+            if max_chars and chars >= max_chars:
+                break
+        timings["extract"] = timings.get("extract", 0.0) + time.perf_counter() - started
+        timings["pages_read"] = timings.get("pages_read", 0) + len(pages)
+        timings["pages_total"] = total_pages
+        
+        return pages, total_pages
+    
+    @staticmethod
+    def assemble_pdf_text(pages: List[str], max_chars: Optional[int] = None,
+                          timings: Optional[dict] = None) -> str:
+        """Join page texts once, cutting at a line boundary past `max_chars`."""
+        started = time.perf_counter()
+        text = "\n".join(pages).strip()
+        truncated = bool(max_chars) and len(text) > max_chars
+        if truncated:
+            text = text[:max_chars].rsplit("\n", 1)[0]
+        
+        if timings is not None:
+            timings["assemble"] = time.perf_counter() - started
+            timings["truncated"] = truncated or timings.get("pages_read", 0) < timings.get("pages_total", 0)
+        return text
+    
+    @staticmethod
+    def extract_from_pdf(
+        source: Union[str, BinaryIO],
+        max_pages: Optional[int] = None,
+        page_limit: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        timings: Optional[dict] = None
+    ) -> str:
+        """
+        Extract text from a PDF file path or binary file-like object.
+        Documents longer than `max_pages` are rejected before any page is parsed.
+        Only the first `page_limit` pages are read, and reading stops once
+        `max_chars` characters are collected, so the cost follows the text
+        actually used rather than the document size. Stage timings are
+        recorded into `timings` when given.
+        """
         try:
-            pdf_reader = PdfReader(file_path)
-            text = ""
-            
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            
-            return text.strip()
+            pages, _ = ResumeExtractor.extract_pdf_pages(
+                source, 0, page_limit or None, max_chars, max_pages, timings
+            )
+            return ResumeExtractor.assemble_pdf_text(pages, max_chars, timings)
         except Exception as e:
             raise ValueError(f"Error extracting PDF: {str(e)}")
     
     @staticmethod
-    def extract_from_docx(file_path: str) -> str:
-        """Extract text from DOCX file."""
+    def extract_from_docx(source: Union[str, BinaryIO]) -> str:
+        """Extract text from a DOCX file path or binary file-like object."""
         try:
-            doc = Document(file_path)
-            text = ""
-            
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
+            doc = Document(source)
+            parts = [paragraph.text + "\n" for paragraph in doc.paragraphs]
             
             # Extract text from tables if any
             for table in doc.tables:
                 for row in table.rows:
                     for cell in row.cells:
-                        text += cell.text + " "
+                        parts.append(cell.text + " ")
             
-            return text.strip()
+            return "".join(parts).strip()
         except Exception as e:
             raise ValueError(f"Error extracting DOCX: {str(e)}")
     
@@ -62,18 +123,8 @@ class ResumeExtractor:
                 response = requests.get(pdf_url, timeout=10)
                 response.raise_for_status()
                 
-                # Save to temporary file
-                with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp_file:
-                    tmp_file.write(response.content)
-                    tmp_path = tmp_file.name
-                
-                # Extract text from PDF
-                text = ResumeExtractor.extract_from_pdf(tmp_path)
-                
-                # Clean up
-                os.unlink(tmp_path)
-                
-                return text
+                # Extract text from the downloaded PDF in memory
+                return ResumeExtractor.extract_from_pdf(io.BytesIO(response.content))
             else:
                 raise ValueError("Invalid Google Docs URL")
         except Exception as e:
@@ -93,6 +144,30 @@ class ResumeExtractor:
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
+    @staticmethod
+    def extract_from_bytes(
+        data: bytes,
+        file_extension: str,
+        max_pages: Optional[int] = None,
+        page_limit: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        timings: Optional[dict] = None
+    ) -> str:
+        """
+        Extract text from in-memory file content.
+        Parsers read from a BytesIO, so no temporary file is written.
+        """
+        file_extension = file_extension.lower()
+        
+        if file_extension == ".pdf":
+            return ResumeExtractor.extract_from_pdf(
+                io.BytesIO(data), max_pages, page_limit, max_chars, timings
+            )
+        elif file_extension in [".docx", ".doc"]:
+            return ResumeExtractor.extract_from_docx(io.BytesIO(data))
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+    
     @staticmethod
     def extract_from_url(url: str) -> Tuple[str, str]:
         """
@@ -107,13 +182,8 @@ class ResumeExtractor:
                 response = requests.get(url, timeout=10)
                 response.raise_for_status()
                 
-                # Save to temporary file
-                with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-                    tmp_file.write(response.content)
-                    tmp_path = tmp_file.name
-                
-                text = ResumeExtractor.extract_from_file(tmp_path)
-                os.unlink(tmp_path)
+                file_extension = Path(url).suffix
+                text = ResumeExtractor.extract_from_bytes(response.content, file_extension)
                 
                 return text, "file_url"
             except Exception as e:
@@ -0,0 +1,177 @@
+# resume_parser.py
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Known section headings: name -> (heading pattern, compaction priority).
+# Lower priority = kept longer when a prompt is trimmed to its token budget.
+RESUME_SECTIONS = {
+    "summary": (r"summary|profile|objective|about me", 1),
+    "experience": (r"experience|employment|work history", 1),
+    "skills": (r"skills|technical skills|competencies", 1),
+    "education": (r"education|academic", 2),
+    "certifications": (r"certifications?|licenses", 2),
+    "projects": (r"projects", 3),
+    "achievements": (r"publications|awards|achievements|volunteer", 4),
+    "personal": (r"interests|hobbies|references|personal details", 5)
+}
+HEADER_PRIORITY = 0  # Lines before the first heading (name, contact details)
+DEFAULT_PRIORITY = 3  # Unrecognized headings
+MAX_HEADING_LENGTH = 40
+
+# Terms whose presence anywhere marks text as plausibly a resume
+CORE_TERMS = ("experience", "education", "skills")
+MIN_RESUME_LENGTH = 500
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+_PHONE_RE = re.compile(r"(?:\+?\d[\s().-]?){9,14}\d")
+_PROFILE_RE = re.compile(r"linkedin\.com|github\.com", re.IGNORECASE)
+_DATE_RE = re.compile(
+    r"\b(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?\s+)?"
+    r"(?:19|20)\d{2}\b",
+    re.IGNORECASE
+)
+_BULLET_RE = re.compile(r"[ \t]*(?:[•\-*▪◦●]|\d+[.)])\s+")
+_NOISE_RE = re.compile(r"[^\w\s.,;:\-()/@+&%'\"•|]")
+_LINE_RE = re.compile(r"[^\n]+")
+
+Span = Tuple[int, int]
+HeadingMatcher = Callable[[str], Optional[Tuple[str, int]]]
+
+
+def make_heading_matcher(sections: Dict[str, Tuple[str, int]]) -> HeadingMatcher:
+    """
+    Build a matcher that maps a stripped line to (section name, priority)
+    when it looks like a heading: a short line starting with a known
+    section name, or a short all-caps line ("other").
+    """
+    patterns = [
+        (name, re.compile(rf"^(?:{pattern})\b", re.IGNORECASE), priority)
+        for name, (pattern, priority) in sections.items()
+    ]
+
+    def match(line: str) -> Optional[Tuple[str, int]]:
+        line = line.rstrip(":")
+        if len(line) > MAX_HEADING_LENGTH:
+            return None
+        for name, pattern, priority in patterns:
+            if pattern.match(line):
+                return name, priority
+        return ("other", DEFAULT_PRIORITY) if line.isupper() and len(line) > 3 else None
+
+    return match
+
+
+match_resume_heading = make_heading_matcher(RESUME_SECTIONS)
+
+
+class Section:
+    """A headed block of the resume; `end` is where the next section starts."""
+
+    __slots__ = ("name", "heading", "priority", "start", "end")
+
+    def __init__(self, name: str, heading: str, priority: int, start: int, end: int):
+        self.name = name
+        self.heading = heading
+        self.priority = priority
+        self.start = start
+        self.end = end
+
+    def as_dict(self) -> dict:
+        return {"section": self.name, "heading": self.heading, "offset": self.start, "end": self.end}
+
+
+class ParsedResume:
+    """
+    Section-structured view of extracted resume text, built in one pass
+    over its lines. Validation, keyword matching, local scoring and prompt
+    compaction all read from it instead of re-scanning the raw string.
+    Spans are (start, end) character offsets into `text`.
+    """
+
+    __slots__ = (
+        "text", "lower", "lines", "headings", "sections", "emails", "phones",
+        "profiles", "dates", "bullets", "word_count", "noise_chars",
+        "long_lines", "core_terms"
+    )
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lower = text.lower()
+        self.lines: List[Span] = []
+        self.headings: Dict[int, Section] = {}  # line index -> section it opens
+        self.sections: List[Section] = []
+        self.emails: List[Span] = []
+        self.phones: List[Span] = []
+        self.profiles: List[Span] = []
+        self.dates: List[Span] = []
+        self.bullets: List[Span] = []
+        self.word_count = len(text.split())
+        self.noise_chars = 0
+        self.long_lines = 0
+        self.core_terms = set()
+        self._parse()
+
+    def _parse(self):
+        text = self.text
+        for line_match in _LINE_RE.finditer(text):
+            line = line_match.group()
+            stripped = line.strip()
+            if not stripped:
+                continue
+
+            start, end = line_match.span()
+            line_index = len(self.lines)
+            self.lines.append((start, end))
+
+            heading = match_resume_heading(stripped)
+            if heading is not None:
+                if self.sections:
+                    self.sections[-1].end = start
+                section = Section(heading[0], stripped, heading[1], start, len(text))
+                self.sections.append(section)
+                self.headings[line_index] = section
+
+            if _BULLET_RE.match(line):
+                self.bullets.append((start, end))
+
+            for spans, pattern in (
+                (self.dates, _DATE_RE),
+                (self.emails, _EMAIL_RE),
+                (self.phones, _PHONE_RE),
+                (self.profiles, _PROFILE_RE)
+            ):
+                spans.extend((start + m.start(), start + m.end()) for m in pattern.finditer(line))
+
+            self.noise_chars += len(_NOISE_RE.findall(line))
+            if len(line) > 300:
+                self.long_lines += 1
+
+            line_lower = self.lower[start:end]
+            for term in CORE_TERMS:
+                if term in line_lower:
+                    self.core_terms.add(term)
+
+    @property
+    def section_names(self) -> set:
+        """Names of the recognised sections (unknown headings excluded)."""
+        return {section.name for section in self.sections if section.name != "other"}
+
+    def iter_lines(self):
+        """Yield (line text, heading priority or None) for each non-blank line."""
+        for index, (start, end) in enumerate(self.lines):
+            section = self.headings.get(index)
+            yield self.text[start:end], section.priority if section else None
+
+    def is_valid(self) -> bool:
+        """Enough text and at least one core resume term."""
+        return len(self.text.strip()) >= MIN_RESUME_LENGTH and bool(self.core_terms)
+
+
+@lru_cache(maxsize=256)
+def parse_resume(text: str) -> ParsedResume:
+    """
+    Parse resume text. Results are memoized, so the ATS, JD-match and
+    compare endpoints share one parse per document; treat them as read-only.
+    """
+    return ParsedResume(text)
@@ -0,0 +1,105 @@
+# schemas.py
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Response models for structured-output mode. The LLM is asked for short
+# keys (the aliases) to save output tokens; model_dump() expands them back
+# to the field names the API has always returned.
+
+
+class CompactModel(BaseModel):
+    model_config = ConfigDict(populate_by_name=True)
+
+
+class ATSScoreBreakdown(CompactModel):
+    format_structure: int = Field(..., alias="fs", ge=0, le=25)
+    keyword_optimization: int = Field(..., alias="ko", ge=0, le=25)
+    parseability: int = Field(..., alias="pa", ge=0, le=20)
+    clarity: int = Field(..., alias="cl", ge=0, le=15)
+    completeness: int = Field(..., alias="co", ge=0, le=15)
+
+
+class ATSScoreResult(CompactModel):
+    ats_score: int = Field(..., alias="s", ge=0, le=100)
+    score_breakdown: ATSScoreBreakdown = Field(..., alias="b")
+    strengths: List[str] = Field(..., alias="st")
+    weaknesses: List[str] = Field(..., alias="wk")
+    suggestions: List[str] = Field(..., alias="sg")
+
+
+class JDMatchBreakdown(CompactModel):
+    skills_match: int = Field(..., alias="sk", ge=0, le=30)
+    experience_match: int = Field(..., alias="ex", ge=0, le=25)
+    qualification_match: int = Field(..., alias="qu", ge=0, le=20)
+    responsibility_alignment: int = Field(..., alias="re", ge=0, le=25)
+
+
+class JDMatchResult(CompactModel):
+    overall_match_score: int = Field(..., alias="s", ge=0, le=100)
+    match_breakdown: JDMatchBreakdown = Field(..., alias="b")
+    matched_skills: List[str] = Field(..., alias="ms")
+    missing_skills: List[str] = Field(..., alias="xs")
+    matched_responsibilities: List[str] = Field(..., alias="mr")
+    missing_responsibilities: List[str] = Field(..., alias="xr")
+    strengths: List[str] = Field(..., alias="st")
+    gaps: List[str] = Field(..., alias="gp")
+    recommendations: List[str] = Field(..., alias="rc")
+    final_assessment: str = Field(..., alias="fa")
+
+
+class JDBatchMatchItem(JDMatchResult):
+    jd_number: int = Field(..., alias="j", ge=1)
+
+
+class JDBatchMatchResult(CompactModel):
+    # Items are validated one by one (see LLMService), so this model only
+    # describes the response schema
+    results: List[JDBatchMatchItem] = Field(..., alias="r")
+
+
+def _strict_schema(schema: dict, definitions: dict) -> dict:
+    """
+    Inline $refs and drop keywords strict JSON-schema mode rejects; every
+    object gets additionalProperties: false and all properties required.
+    """
+    if "$ref" in schema:
+        return _strict_schema(definitions[schema["$ref"].split("/")[-1]], definitions)
+
+    result = {
+        key: value for key, value in schema.items()
+        if key not in ("title", "minimum", "maximum", "$defs")
+    }
+    if result.get("type") == "object":
+        result["properties"] = {
+            name: _strict_schema(prop, definitions)
+            for name, prop in result["properties"].items()
+        }
+        result["required"] = list(result["properties"])
+        result["additionalProperties"] = False
+    elif result.get("type") == "array":
+        result["items"] = _strict_schema(result["items"], definitions)
+    return result
+
+
+def response_format(model: type, name: str) -> dict:
+    """OpenAI-style response_format requesting JSON matching `model`."""
+    schema = model.model_json_schema(by_alias=True)
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": name,
+            "strict": True,
+            "schema": _strict_schema(schema, schema.get("$defs", {}))
+        }
+    }
+
+
+def missing_fields(model: type, result: dict) -> List[str]:
+    """Top-level fields of `model` absent from a free-form (full-key) result."""
+    return [name for name in model.model_fields if name not in result]
+
+
+ATS_RESPONSE_FORMAT = response_format(ATSScoreResult, "ats_score")
+JD_MATCH_RESPONSE_FORMAT = response_format(JDMatchResult, "jd_match")
+JD_BATCH_MATCH_RESPONSE_FORMAT = response_format(JDBatchMatchResult, "jd_batch_match")
@@ -0,0 +1,90 @@
+# similarity.py
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+from scipy.sparse import csr_matrix, diags
+
+# Keeps tech tokens such as "c++", "c#", "node.js" intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the
+their this to we will with you your who what which when where how all any can
+also into more not other such than then them they were was us use using
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stop words removed."""
+    return [
+        token for token in _TOKEN_RE.findall(text.lower())
+        if token not in STOP_WORDS
+    ]
+
+
+class TfidfVectorizer:
+    """Minimal TF-IDF model producing L2-normalized sparse row vectors."""
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+
+    def fit(self, documents: List[List[str]]) -> "TfidfVectorizer":
+        """Learn vocabulary and smoothed IDF weights from tokenized documents."""
+        document_frequency = Counter()
+        for tokens in documents:
+            document_frequency.update(set(tokens))
+
+        self.vocabulary = {
+            term: idx for idx, term in enumerate(sorted(document_frequency))
+        }
+        n_documents = len(documents)
+        self.idf = np.array([
+            math.log((1 + n_documents) / (1 + document_frequency[term])) + 1
+            for term in sorted(document_frequency)
+        ], dtype=np.float32)
+        return self
+
+    def transform(self, documents: List[List[str]]) -> csr_matrix:
+        """Vectorize tokenized documents; unknown terms are ignored."""
+        rows, cols, values = [], [], []
+        for row, tokens in enumerate(documents):
+            counts = Counter(
+                self.vocabulary[token] for token in tokens if token in self.vocabulary
+            )
+            for col, count in counts.items():
+                rows.append(row)
+                cols.append(col)
+                # Sublinear TF dampens repeated boilerplate terms
+                values.append((1 + math.log(count)) * self.idf[col])
+
+        matrix = csr_matrix(
+            (np.array(values, dtype=np.float32), (rows, cols)),
+            shape=(len(documents), len(self.vocabulary))
+        )
+        return normalize_rows(matrix)
+
+
+def normalize_rows(matrix: csr_matrix) -> csr_matrix:
+    """Scale each row to unit L2 norm (empty rows stay zero)."""
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return diags(1 / norms) @ matrix
+
+
+def rank_jds_by_similarity(resume_text: str, jd_texts: List[str]) -> np.ndarray:
+    """
+    Cosine similarity of the resume against every JD, computed as one
+    sparse matrix-vector product. Returns one score in [0, 1] per JD.
+    """
+    jd_tokens = [tokenize(jd_text) for jd_text in jd_texts]
+    resume_tokens = tokenize(resume_text)
+
+    vectorizer = TfidfVectorizer().fit(jd_tokens + [resume_tokens])
+    jd_matrix = vectorizer.transform(jd_tokens)
+    resume_vector = vectorizer.transform([resume_tokens])
+
+    return np.asarray((jd_matrix @ resume_vector.T).todense()).ravel()
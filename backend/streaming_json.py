@@ -0,0 +1,80 @@
+# streaming_json.py
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Text can arrive in arbitrary chunks (and may be wrapped in a markdown
+    code fence). feed() returns each top-level (key, value) pair as soon as
+    the value is complete, so scalars such as "ats_score" are available
+    long before the trailing lists finish streaming.
+    """
+
+    def __init__(self):
+        self.complete = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk; return the members completed by it."""
+        if self.complete:
+            return []
+
+        self._buffer += chunk
+        members = []
+
+        while self._pos < len(self._buffer):
+            char = self._buffer[self._pos]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                # Skip any preamble (e.g. "```json") until the object opens
+                if char == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._emit(members)
+                    self.complete = True
+                    break
+            elif char == "," and self._depth == 1:
+                self._emit(members)
+                self._member_start = self._pos + 1
+
+            self._pos += 1
+
+        self._compact()
+        return members
+
+    def _emit(self, members: list):
+        member = self._buffer[self._member_start:self._pos].strip()
+        if member:
+            members.extend(json.loads("{" + member + "}").items())
+
+    def _compact(self):
+        # Drop consumed text so the buffer holds at most one pending member
+        if self._member_start is None:
+            self._buffer = ""
+            self._pos = 0
+        elif self._member_start > 0:
+            self._buffer = self._buffer[self._member_start:]
+            self._pos -= self._member_start
+            self._member_start = 0
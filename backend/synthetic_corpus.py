@@ -0,0 +1,147 @@
+# synthetic_corpus.py
+import io
+import random
+from typing import List, Tuple
+
+from docx import Document
+
+from config import ATS_KEYWORDS
+
+# Generated resumes and job descriptions (as text, PDF or DOCX bytes) for
+# load tests and benchmarks, so no real candidate data is needed offline.
+
+FIRST_NAMES = ("Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn")
+LAST_NAMES = ("Smith", "Garcia", "Chen", "Patel", "Okafor", "Novak", "Silva", "Kim", "Berg", "Haddad")
+TITLES = ("Software Engineer", "Backend Developer", "Data Engineer", "DevOps Engineer",
+          "Full Stack Developer", "Machine Learning Engineer", "Platform Engineer")
+COMPANIES = ("Acme Corp", "Globex", "Initech", "Umbrella Labs", "Hooli", "Vandelay Industries",
+             "Stark Systems", "Wayne Analytics")
+VERBS = ("Built", "Designed", "Led", "Migrated", "Automated", "Optimized", "Maintained", "Launched")
+OUTCOMES = ("reducing latency by {n}%", "serving {n}k daily users", "cutting costs by {n}%",
+            "improving test coverage to {n}%", "across {n} teams", "with {n} engineers")
+DEGREES = ("B.Sc. Computer Science", "M.Sc. Software Engineering", "B.Eng. Electrical Engineering")
+
+LINES_PER_PDF_PAGE = 55
+
+
+def _bullet(rng: random.Random, skills: List[str]) -> str:
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(10, 90))
+    return f"- {rng.choice(VERBS)} {rng.choice(skills)} services using {rng.choice(skills)}, {outcome}"
+
+
+def make_resume_lines(rng: random.Random, jobs: int = 3, bullets_per_job: int = 4) -> List[str]:
+    """A plausible resume as a list of lines."""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(ATS_KEYWORDS["technical_skills"], 8)
+    soft = rng.sample(ATS_KEYWORDS["soft_skills"], 4)
+    year = 2024
+
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        f"linkedin.com/in/{name.lower().replace(' ', '')}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {jobs * 2 + rng.randint(0, 4)} years of experience in "
+        f"{', '.join(skills[:3])}. Known for {soft[0]} and {soft[1]}.",
+        "",
+        "EXPERIENCE"
+    ]
+    for _ in range(jobs):
+        start = year - rng.randint(1, 4)
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({start} - {year})")
+        lines.extend(_bullet(rng, skills) for _ in range(bullets_per_job))
+        year = start
+
+    lines += [
+        "",
+        "EDUCATION",
+        f"{rng.choice(DEGREES)}, State University ({year - 4} - {year})",
+        "",
+        "SKILLS",
+        ", ".join(skills + soft)
+    ]
+    if rng.random() < 0.5:
+        lines += ["", "CERTIFICATIONS", rng.choice(ATS_KEYWORDS["certifications"]).title()]
+    return lines
+
+
+def make_jd_text(rng: random.Random) -> str:
+    """A job description long enough to pass validation (>= 200 characters)."""
+    title = rng.choice(TITLES)
+    required = rng.sample(ATS_KEYWORDS["technical_skills"], 5)
+    preferred = rng.sample(ATS_KEYWORDS["technical_skills"], 3)
+    return "\n".join([
+        f"{title} at {rng.choice(COMPANIES)}",
+        "",
+        "Responsibilities",
+        f"- Design and operate services built with {required[0]} and {required[1]}",
+        f"- Work with product teams on {rng.choice(ATS_KEYWORDS['soft_skills'])} and delivery",
+        "- Review code and mentor other engineers",
+        "",
+        "Requirements",
+        f"- {rng.randint(2, 8)}+ years of professional experience as a {title}",
+        f"- Strong skills in {', '.join(required)}",
+        f"- {rng.choice(ATS_KEYWORDS['soft_skills']).title()} and clear written communication",
+        "",
+        "Nice to have",
+        f"- Experience with {', '.join(preferred)}"
+    ])
+
+
+def _pdf_string(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(lines: List[str]) -> bytes:
+    """
+    Minimal single-font PDF with one text object per page, written by
+    hand so no PDF library is needed. Only Latin-1 text is supported.
+    """
+    pages = [lines[i:i + LINES_PER_PDF_PAGE] for i in range(0, len(lines), LINES_PER_PDF_PAGE)] or [[]]
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    kids = []
+    for page in pages:
+        content = "BT /F1 10 Tf 50 780 Td 13 TL " + " ".join(f"({_pdf_string(line)}) '" for line in page) + " ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def docx_bytes(lines: List[str]) -> bytes:
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def make_document(rng: random.Random, file_format: str = "pdf", jobs: int = 3) -> Tuple[str, bytes, str]:
+    """Return (filename, file bytes, source text) for one synthetic resume."""
+    lines = make_resume_lines(rng, jobs=jobs)
+    stem = f"resume_{rng.getrandbits(32):08x}"
+    if file_format == "pdf":
+        return f"{stem}.pdf", pdf_bytes(lines), "\n".join(lines)
+    if file_format == "docx":
+        return f"{stem}.docx", docx_bytes(lines), "\n".join(lines)
+    raise ValueError(f"Unsupported format: {file_format}")
@@ -0,0 +1,55 @@
+# test_extraction_executor.py
+import asyncio
+import time
+
+import pytest
+
+import extraction_executor
+from extraction_executor import ExtractionExecutor
+
+
+def _extract_or_hang(data: bytes, file_extension: str, max_pages):
+    """Stand-in for _extract_in_worker; b"hang" never finishes."""
+    if data == b"hang":
+        while True:
+            time.sleep(1)
+    return data.decode(), {}
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(extraction_executor, "_extract_in_worker", _extract_or_hang)
+    executor = ExtractionExecutor(max_workers=1, timeout=1.5)
+    yield executor
+    executor.shutdown()
+
+
+def test_hanging_extraction_is_killed_without_failing_queued_work(executor):
+    async def run():
+        hang = asyncio.ensure_future(executor.extract(b"hang", ".docx"))
+        await asyncio.sleep(0.1)
+        stuck_pool = executor._pool
+        processes = list(stuck_pool._processes.values())
+        # Queued behind the hanging document on the only worker
+        normal = asyncio.ensure_future(executor.extract(b"resume text", ".docx"))
+
+        with pytest.raises(ValueError, match="timed out"):
+            await hang
+        assert await normal == "resume text"
+        return stuck_pool, processes
+
+    stuck_pool, processes = asyncio.run(run())
+
+    assert executor._pool is not stuck_pool
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+
+
+def test_new_work_after_timeout_uses_a_fresh_pool(executor):
+    async def run():
+        with pytest.raises(ValueError, match="timed out"):
+            await executor.extract(b"hang", ".docx")
+        return await executor.extract(b"next", ".docx")
+
+    assert asyncio.run(run()) == "next"
@@ -0,0 +1,86 @@
+# test_jd_index.py
+from jd_index import JDIndex
+
+POSTINGS = {
+    "backend": "Backend engineer building Python services with PostgreSQL, Redis and Kafka.",
+    "frontend": "Frontend developer shipping React and TypeScript interfaces with Storybook.",
+    "data": "Data engineer maintaining Spark pipelines, Airflow schedules and Snowflake warehouses.",
+}
+
+
+def _index(tmp_path, **kwargs) -> JDIndex:
+    index = JDIndex(str(tmp_path / "jd_index"), **kwargs)
+    index.upsert_many([{"id": jd_id, "text": text} for jd_id, text in POSTINGS.items()])
+    return index
+
+
+def _ids(index: JDIndex, query: str):
+    return [match["id"] for match in index.search(query, top_n=5)]
+
+
+def test_search_ranks_matching_posting_first(tmp_path):
+    index = _index(tmp_path)
+
+    assert _ids(index, "React TypeScript Storybook")[0] == "frontend"
+    assert _ids(index, "Spark Airflow")[0] == "data"
+    assert _ids(index, "Haskell") == []
+
+
+def test_add_after_build_is_searchable(tmp_path):
+    index = _index(tmp_path)
+    index.search("Python", top_n=1)  # builds the index
+
+    index.upsert("Mobile developer writing Kotlin and Swift apps.", jd_id="mobile")
+
+    assert _ids(index, "Kotlin Swift") == ["mobile"]
+    assert index.count() == 4
+
+
+def test_replace_drops_old_terms(tmp_path):
+    index = _index(tmp_path)
+    index.search("Python", top_n=1)
+
+    index.upsert("Security engineer running penetration tests and threat models.", jd_id="backend")
+
+    assert "backend" not in _ids(index, "PostgreSQL Redis Kafka")
+    assert _ids(index, "penetration threat") == ["backend"]
+    assert index.get("backend")["text"].startswith("Security engineer")
+
+
+def test_delete_removes_posting_from_results(tmp_path):
+    index = _index(tmp_path)
+    index.search("Python", top_n=1)
+
+    assert index.delete("data")
+    assert not index.delete("data")
+    assert _ids(index, "Spark Airflow Snowflake") == []
+    assert index.get("data") is None
+
+
+def test_reopen_from_disk_keeps_changes_made_after_build(tmp_path):
+    index = _index(tmp_path)
+    index.search("Python", top_n=1)
+    index.upsert("Mobile developer writing Kotlin and Swift apps.", jd_id="mobile")
+    index.upsert("Security engineer running penetration tests and threat models.", jd_id="backend")
+    index.delete("data")
+
+    reopened = JDIndex(str(tmp_path / "jd_index"))
+
+    assert _ids(reopened, "Kotlin Swift") == ["mobile"]
+    assert _ids(reopened, "penetration threat") == ["backend"]
+    assert "backend" not in _ids(reopened, "PostgreSQL Redis Kafka")
+    assert _ids(reopened, "Spark Airflow") == []
+    assert _ids(reopened, "React TypeScript")[0] == "frontend"
+
+
+def test_rebuild_merges_delta_without_changing_results(tmp_path):
+    index = _index(tmp_path)
+    index.search("Python", top_n=1)
+    index.upsert("Mobile developer writing Kotlin and Swift apps.", jd_id="mobile")
+    index.delete("data")
+
+    index.rebuild()
+
+    assert _ids(index, "Kotlin Swift") == ["mobile"]
+    assert _ids(index, "Spark Airflow") == []
+    assert _ids(JDIndex(str(tmp_path / "jd_index")), "Kotlin Swift") == ["mobile"]
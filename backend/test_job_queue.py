@@ -0,0 +1,140 @@
+# test_job_queue.py
+import asyncio
+import random
+
+import pytest
+
+from job_queue import JobQueue, JobStore, check_webhook_url
+from synthetic_corpus import make_resume_lines
+
+RESUME_TEXT = "\n".join(make_resume_lines(random.Random(1)))
+
+
+class StubJDAnalyzer:
+    """Answers jd_match jobs instantly, or hangs until cancelled for a 'hang' JD."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.cancelled = False
+
+    async def analyze_async(self, resume_text, jd_text, tier=None):
+        if jd_text != "hang":
+            return {"overall_match_score": 80}
+        self.started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+def _queue(tmp_path, jd_analyzer=None) -> JobQueue:
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    return JobQueue(None, jd_analyzer or StubJDAnalyzer(), None, None, store=store, workers=1)
+
+
+async def _wait_for_status(queue: JobQueue, job_id: str, status: str) -> dict:
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] == status:
+            return job
+        await asyncio.sleep(0.02)
+    raise AssertionError(f"job stayed {job['status']}, expected {status}")
+
+
+def test_claim_takes_highest_priority_then_oldest(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    low = store.submit("ats_score", {}, priority=0)
+    high = store.submit("ats_score", {}, priority=5)
+    high_later = store.submit("ats_score", {}, priority=5)
+
+    assert [store.claim("worker")["id"] for _ in range(3)] == [high, high_later, low]
+    assert store.claim("worker") is None
+
+
+def test_expired_lease_is_reclaimed_then_failed(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.submit("ats_score", {})
+
+    store.claim("dead-worker", lease_seconds=-1)
+    assert store.reclaim_expired(max_attempts=2) == []
+    assert store.get(job_id)["status"] == "queued"
+    # The original owner lost the job and cannot record an outcome
+    assert not store.finish(job_id, "dead-worker", "succeeded", result={})
+
+    assert store.claim("other-worker", lease_seconds=-1)["id"] == job_id
+    assert store.reclaim_expired(max_attempts=2) == [job_id]
+    job = store.get(job_id)
+    assert job["status"] == "failed" and job["attempts"] == 2
+    assert store.claim("other-worker") is None
+
+
+def test_released_jobs_do_not_use_up_attempts(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.submit("ats_score", {})
+
+    store.claim("worker")
+    assert store.release("worker") == 1
+    job = store.get(job_id)
+    assert job["status"] == "queued" and job["attempts"] == 0
+
+
+def test_cancel_queued_job_notifies_once(tmp_path):
+    queue = _queue(tmp_path)
+    notified = []
+
+    async def notify(job_id):
+        notified.append(job_id)
+
+    queue._notify = notify
+
+    async def run():
+        job_id = queue.store.submit("jd_match", {"resume_text": RESUME_TEXT, "jd_text": "x"})
+        first = await queue.cancel(job_id)
+        second = await queue.cancel(job_id)
+        await asyncio.sleep(0)
+        return job_id, first, second
+
+    job_id, first, second = asyncio.run(run())
+    assert first["status"] == second["status"] == "cancelled"
+    assert notified == [job_id]
+
+
+def test_cancel_running_job_stops_its_analysis(tmp_path):
+    analyzer = StubJDAnalyzer()
+    queue = _queue(tmp_path, analyzer)
+
+    async def run():
+        quick = await queue.submit("jd_match", {"resume_text": RESUME_TEXT, "jd_text": "quick"})
+        done = await _wait_for_status(queue, quick["job_id"], "succeeded")
+
+        job = await queue.submit("jd_match", {"resume_text": RESUME_TEXT, "jd_text": "hang"})
+        await asyncio.wait_for(analyzer.started.wait(), timeout=5)
+        assert (await queue.cancel(job["job_id"]))["cancel_requested"]
+        cancelled = await _wait_for_status(queue, job["job_id"], "cancelled")
+        await queue.stop()
+        return done, cancelled
+
+    done, cancelled = asyncio.run(run())
+    assert done["result"] == {"overall_match_score": 80}
+    assert cancelled["result"] is None
+    assert analyzer.cancelled
+
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/hook",
+    "http://[::1]/hook",
+    "http://10.1.2.3/hook",
+    "http://192.168.0.10:8080/hook",
+    "http://169.254.169.254/latest/meta-data",
+    "http://[::ffff:127.0.0.1]/hook",
+    "http://[::ffff:10.0.0.1]/hook",
+    "ftp://93.184.216.34/hook",
+])
+def test_webhook_url_rejects_non_public_targets(url):
+    with pytest.raises(ValueError):
+        asyncio.run(check_webhook_url(url))
+
+
+def test_webhook_url_accepts_public_address():
+    asyncio.run(check_webhook_url("https://93.184.216.34/hook"))
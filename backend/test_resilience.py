@@ -0,0 +1,132 @@
+# test_resilience.py
+import asyncio
+
+import httpx
+import pytest
+
+import llm_service
+from resilience import CircuitBreaker, CircuitOpenError, LLMAPIError, ResilientCaller
+
+
+def _caller() -> ResilientCaller:
+    caller = ResilientCaller()
+    # Open on the first failure and allow a probe immediately afterwards
+    caller.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    return caller
+
+
+def _failing(error: Exception):
+    async def attempt():
+        raise error
+    return attempt
+
+
+async def _ok():
+    return "ok"
+
+
+def _trip(caller: ResilientCaller):
+    with pytest.raises(LLMAPIError):
+        asyncio.run(caller.call(_failing(LLMAPIError("unavailable", status_code=503, retryable=True))))
+    assert caller.breaker.state == "open"
+
+
+def test_half_open_breaker_recovers_after_4xx_probe():
+    caller = _caller()
+    _trip(caller)
+
+    with pytest.raises(LLMAPIError):
+        asyncio.run(caller.call(_failing(LLMAPIError("bad request", status_code=400))))
+
+    assert caller.breaker.state == "closed"
+    assert asyncio.run(caller.call(_ok)) == "ok"
+
+
+def test_cancelled_probe_releases_half_open_breaker():
+    caller = _caller()
+    _trip(caller)
+
+    async def probe_then_timeout():
+        async def slow():
+            await asyncio.sleep(10)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(caller.call(slow), timeout=0.01)
+
+    asyncio.run(probe_then_timeout())
+    assert caller.breaker.state == "open"
+    assert asyncio.run(caller.call(_ok)) == "ok"
+    assert caller.breaker.state == "closed"
+
+
+def test_local_error_in_probe_releases_half_open_breaker():
+    caller = _caller()
+    _trip(caller)
+
+    with pytest.raises(ValueError):
+        asyncio.run(caller.call(_failing(ValueError("Invalid JSON response from API"))))
+
+    assert caller.breaker.state == "open"
+    assert asyncio.run(caller.call(_ok)) == "ok"
+
+
+def test_open_breaker_rejects_until_reset_timeout():
+    caller = ResilientCaller()
+    caller.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    _trip(caller)
+
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(caller.call(_ok))
+
+
+def test_stream_probe_rejected_with_4xx_closes_breaker(monkeypatch):
+    monkeypatch.setattr(llm_service, "OPENROUTER_API_KEY", "test")
+    service = llm_service.LLMService()
+    breaker = service._resilience_for("test/model").breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    async def stream():
+        service._async_client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(400, json={"error": "bad"}))
+        )
+        async for _ in service._stream_model("prompt", 10, "test/model"):
+            pass
+
+    with pytest.raises(LLMAPIError):
+        asyncio.run(stream())
+    assert breaker.state == "closed"
+
+
+def test_retry_after_beyond_budget_is_not_retried(monkeypatch):
+    caller = ResilientCaller()
+    attempts = []
+
+    async def rate_limited():
+        attempts.append(1)
+        raise LLMAPIError("rate limited", status_code=429, retryable=True, retry_after=60)
+
+    async def no_sleep(seconds):
+        raise AssertionError(f"slept {seconds}s before a refused retry")
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    with pytest.raises(LLMAPIError) as raised:
+        asyncio.run(caller.call(rate_limited))
+
+    assert raised.value.retryable and len(attempts) == 1
+
+
+def test_retry_after_within_budget_is_honoured(monkeypatch):
+    caller = ResilientCaller()
+    slept = []
+    responses = [LLMAPIError("rate limited", status_code=429, retryable=True, retry_after=0.5)]
+
+    async def attempt():
+        if responses:
+            raise responses.pop()
+        return "ok"
+
+    async def record_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+    assert asyncio.run(caller.call(attempt)) == "ok"
+    assert slept == [0.5]
@@ -3,6 +3,9 @@ import json
 import re
 from typing import Dict, Any
 
+from keyword_matcher import get_keyword_matcher
+from resume_parser import ParsedResume, parse_resume
+
 def extract_json_from_text(text: str) -> Dict[str, Any]:
     """
     Extract JSON from LLM response text.
@@ -14,65 +17,50 @@ def extract_json_from_text(text: str) -> Dict[str, Any]:
     except json.JSONDecodeError:
         pass
     
-    # Try extracting from markdown code blocks
-    json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', text, re.DOTALL)
-    if json_match:
-        try:
-            return json.loads(json_match.group(1))
-        except json.JSONDecodeError:
-            pass
-    
-    # Try finding JSON object directly
-    json_match = re.search(r'\{.*\}', text, re.DOTALL)
-    if json_match:
+    # Decode from each "{" in turn (covers code fences and surrounding prose).
+    # raw_decode stops at the end of the object, so this never backtracks
+    # over the whole response like a greedy \{.*\} regex does.
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
         try:
-            return json.loads(json_match.group(0))
+            result, _ = decoder.raw_decode(text, start)
+            if isinstance(result, dict):
+                return result
         except json.JSONDecodeError:
             pass
+        start = text.find("{", start + 1)
     
     raise ValueError("Could not extract valid JSON from response")
 
 
 def clean_text(text: str) -> str:
     """Clean and normalize text from documents."""
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
     # Remove special characters but keep alphanumeric, space, and common punctuation
-    text = re.sub(r'[^\w\s\-.,@:()]', '', text)
+    # (including the symbols in names like C++, C#, CI/CD and R&D)
+    text = re.sub(r'[^\w\s\-.,@:()+#/&%\']', '', text)
+    # Remove extra whitespace (after the removal above, which can leave gaps)
+    text = re.sub(r'\s+', ' ', text)
     return text.strip()
 
 
 def calculate_keyword_density(text: str, keywords: list) -> float:
     """Calculate keyword density in text."""
-    text_lower = text.lower()
-    keyword_count = 0
-    
-    for keyword in keywords:
-        # Use word boundaries for better matching
-        pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-        matches = len(re.findall(pattern, text_lower))
-        keyword_count += matches
-    
-    word_count = len(text_lower.split())
-    
-    if word_count == 0:
-        return 0
-    
-    return (keyword_count / word_count) * 100
+    # Single pass with a matcher compiled once per keyword list
+    scan = get_keyword_matcher(tuple(keywords)).scan(text)
+    return scan.density(["keywords"])
 
 
-def validate_resume_content(content: str) -> bool:
-    """Validate that resume has minimum required content."""
-    # Check minimum length (should be at least 500 characters)
-    if len(content.strip()) < 500:
+def validate_resume_content(content) -> bool:
+    """
+    Validate that resume has minimum required content: at least 500
+    characters and a mention of experience, education or skills.
+    Accepts raw text or a ParsedResume.
+    """
+    if not content:
         return False
-    
-    # Check for common resume sections
-    content_lower = content.lower()
-    common_sections = ["experience", "education", "skills"]
-    found_sections = sum(1 for section in common_sections if section in content_lower)
-    
-    return found_sections >= 1
+    parsed = content if isinstance(content, ParsedResume) else parse_resume(content)
+    return parsed.is_valid()
 
 
 def format_response(status: str, data: Dict = None, error: str = None, message: str = None):